@@ -29,6 +29,19 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave the full-text search index out of autogenerate.
+    
+    assets_fts and its shadow tables (assets_fts_data, _idx, _docsize,
+    _config) are created by migration SQL rather than the models, so
+    without this every autogenerated revision would drop them.
+    """
+    if type_ == "table" and name.startswith("assets_fts"):
+        return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -37,15 +50,15 @@ target_metadata = Base.metadata
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
-
+    
     This configures the context with just a URL
     and not an Engine, though an Engine is acceptable
     here as well.  By skipping the Engine creation
     we don't even need a DBAPI to be available.
-
+    
     Calls to context.execute() here emit the given string to the
     script output.
-
+    
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
@@ -53,30 +66,33 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
-
+    
     with context.begin_transaction():
         context.run_migrations()
 
 
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode.
-
+    
     In this scenario we need to create an Engine
     and associate a connection with the context.
-
+    
     """
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
-
+    
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
         )
-
+        
         with context.begin_transaction():
             context.run_migrations()
 
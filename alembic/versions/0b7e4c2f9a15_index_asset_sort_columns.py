@@ -0,0 +1,30 @@
+"""Index asset sort columns
+
+Revision ID: 0b7e4c2f9a15
+Revises: f1c6a8d4b392
+Create Date: 2026-10-17 22:37:14.520931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b7e4c2f9a15'
+down_revision = 'f1c6a8d4b392'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_computer_name', 'assets', ['computer_name'], unique=False)
+    op.create_index('idx_assigned_user_name', 'assets', ['assigned_user_name'], unique=False)
+    op.create_index('idx_device_type', 'assets', ['device_type'], unique=False)
+    op.create_index('idx_last_verified_at', 'assets', ['last_verified_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_last_verified_at', table_name='assets')
+    op.drop_index('idx_device_type', table_name='assets')
+    op.drop_index('idx_assigned_user_name', table_name='assets')
+    op.drop_index('idx_computer_name', table_name='assets')
@@ -0,0 +1,26 @@
+"""Add import job owner and heartbeat
+
+Revision ID: 4f8b2d6e1a93
+Revises: c3e8a1f5d729
+Create Date: 2026-10-17 19:42:13.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f8b2d6e1a93'
+down_revision = 'c3e8a1f5d729'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('import_jobs', sa.Column('worker_id', sa.String(length=100), nullable=True))
+    op.add_column('import_jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('import_jobs', 'heartbeat_at')
+    op.drop_column('import_jobs', 'worker_id')
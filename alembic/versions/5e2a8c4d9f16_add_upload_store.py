@@ -0,0 +1,55 @@
+"""Add content-addressed upload store
+
+Revision ID: 5e2a8c4d9f16
+Revises: 3b9e1f0c7d42
+Create Date: 2026-10-17 13:40:55.208163
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2a8c4d9f16'
+down_revision = '3b9e1f0c7d42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('upload_blobs',
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('suffix', sa.String(length=10), nullable=False),
+    sa.Column('file_info', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('content_hash')
+    )
+    op.create_table('upload_aliases',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('uploaded_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['content_hash'], ['upload_blobs.content_hash'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_upload_aliases_content_hash'), 'upload_aliases', ['content_hash'], unique=False)
+    op.create_index(op.f('ix_upload_aliases_filename'), 'upload_aliases', ['filename'], unique=True)
+    op.create_index(op.f('ix_upload_aliases_id'), 'upload_aliases', ['id'], unique=False)
+    
+    op.add_column('imports', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_imports_content_hash'), 'imports', ['content_hash'], unique=False)
+    op.add_column('import_jobs', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_import_jobs_content_hash'), 'import_jobs', ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_import_jobs_content_hash'), table_name='import_jobs')
+    op.drop_column('import_jobs', 'content_hash')
+    op.drop_index(op.f('ix_imports_content_hash'), table_name='imports')
+    op.drop_column('imports', 'content_hash')
+    op.drop_index(op.f('ix_upload_aliases_id'), table_name='upload_aliases')
+    op.drop_index(op.f('ix_upload_aliases_filename'), table_name='upload_aliases')
+    op.drop_index(op.f('ix_upload_aliases_content_hash'), table_name='upload_aliases')
+    op.drop_table('upload_aliases')
+    op.drop_table('upload_blobs')
@@ -0,0 +1,28 @@
+"""Add data versions
+
+Revision ID: 6a3f9d1e2c84
+Revises: 0b7e4c2f9a15
+Create Date: 2026-10-17 23:41:08.265317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6a3f9d1e2c84'
+down_revision = '0b7e4c2f9a15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('data_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('data_versions')
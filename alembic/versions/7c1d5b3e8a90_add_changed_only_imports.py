@@ -0,0 +1,26 @@
+"""Add changed-only import mode
+
+Revision ID: 7c1d5b3e8a90
+Revises: 5e2a8c4d9f16
+Create Date: 2026-10-17 15:18:07.662410
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1d5b3e8a90'
+down_revision = '5e2a8c4d9f16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('imports', sa.Column('records_unchanged', sa.Integer(), nullable=True))
+    op.add_column('import_jobs', sa.Column('changed_only', sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('import_jobs', 'changed_only')
+    op.drop_column('imports', 'records_unchanged')
@@ -0,0 +1,24 @@
+"""Record changed-only mode on imports
+
+Revision ID: 8e2f6b4a0d51
+Revises: 4f8b2d6e1a93
+Create Date: 2026-10-17 20:15:41.207316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e2f6b4a0d51'
+down_revision = '4f8b2d6e1a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('imports', sa.Column('changed_only', sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('imports', 'changed_only')
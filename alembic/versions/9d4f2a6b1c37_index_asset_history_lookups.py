@@ -0,0 +1,26 @@
+"""Index asset history by import and asset
+
+Revision ID: 9d4f2a6b1c37
+Revises: 7c1d5b3e8a90
+Create Date: 2026-10-17 16:45:31.907214
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4f2a6b1c37'
+down_revision = '7c1d5b3e8a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_asset_history_import_asset', 'asset_history', ['import_id', 'asset_id'], unique=False)
+    op.create_index(op.f('ix_asset_history_asset_id'), 'asset_history', ['asset_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_asset_history_asset_id'), table_name='asset_history')
+    op.drop_index('idx_asset_history_import_asset', table_name='asset_history')
@@ -0,0 +1,54 @@
+"""Add asset content hash
+
+Revision ID: a4d7337c5fc8
+Revises: 8c814be0766b
+Create Date: 2026-10-17 09:12:41.301522
+
+"""
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4d7337c5fc8'
+down_revision = '8c814be0766b'
+branch_labels = None
+depends_on = None
+
+# The fingerprint as of this revision, written out rather than taken from
+# app.models.asset so later changes there cannot rewrite the backfill
+FINGERPRINT_FIELDS = (
+    "department", "assigned_user_name", "assigned_user_id",
+    "status", "operating_system", "notes", "computer_name"
+)
+
+
+def compute_content_hash(values) -> str:
+    normalized = [str(values[field]) if values.get(field) else None for field in FINGERPRINT_FIELDS]
+    return hashlib.blake2b(json.dumps(normalized).encode(), digest_size=16).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column('assets', sa.Column('content_hash', sa.String(length=32), nullable=True))
+    
+    # Backfill hashes for existing assets
+    assets = sa.table(
+        'assets',
+        sa.column('id', sa.Integer),
+        sa.column('content_hash', sa.String),
+        *[sa.column(field, sa.String) for field in FINGERPRINT_FIELDS]
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(assets.c.id, *[assets.c[field] for field in FINGERPRINT_FIELDS])).mappings().all()
+    if rows:
+        connection.execute(
+            assets.update().where(assets.c.id == sa.bindparam('asset_id')).values(content_hash=sa.bindparam('hash')),
+            [{'asset_id': row['id'], 'hash': compute_content_hash(row)} for row in rows]
+        )
+
+
+def downgrade() -> None:
+    op.drop_column('assets', 'content_hash')
@@ -0,0 +1,45 @@
+"""Add batch import sources
+
+Revision ID: b6e3f1a2d845
+Revises: 9d4f2a6b1c37
+Create Date: 2026-10-17 17:42:51.208316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e3f1a2d845'
+down_revision = '9d4f2a6b1c37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('import_sources',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('import_id', sa.Integer(), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('sheet_name', sa.String(length=255), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=True),
+    sa.Column('column_mapping', sa.Text(), nullable=True),
+    sa.Column('records_processed', sa.Integer(), nullable=True),
+    sa.Column('records_created', sa.Integer(), nullable=True),
+    sa.Column('records_updated', sa.Integer(), nullable=True),
+    sa.Column('records_unchanged', sa.Integer(), nullable=True),
+    sa.Column('records_failed', sa.Integer(), nullable=True),
+    sa.Column('records_duplicate', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['import_id'], ['imports.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_import_sources_id'), 'import_sources', ['id'], unique=False)
+    op.create_index(op.f('ix_import_sources_import_id'), 'import_sources', ['import_id'], unique=False)
+    op.add_column('import_jobs', sa.Column('sources', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('import_jobs', 'sources')
+    op.drop_index(op.f('ix_import_sources_import_id'), table_name='import_sources')
+    op.drop_index(op.f('ix_import_sources_id'), table_name='import_sources')
+    op.drop_table('import_sources')
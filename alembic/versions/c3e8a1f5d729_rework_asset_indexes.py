@@ -0,0 +1,50 @@
+"""Rework asset indexes
+
+Revision ID: c3e8a1f5d729
+Revises: 6a3f9d1e2c84
+Create Date: 2026-10-17 03:42:18.305617
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8a1f5d729'
+down_revision = '6a3f9d1e2c84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index(op.f('ix_assets_id'), table_name='assets')
+    op.drop_index('idx_asset_tag', table_name='assets')
+    op.drop_index(op.f('ix_assets_status'), table_name='assets')
+    op.drop_index(op.f('ix_assets_department'), table_name='assets')
+    op.drop_index(op.f('ix_assets_refresh_due_date'), table_name='assets')
+    op.drop_index(op.f('ix_assets_assigned_user_id'), table_name='assets')
+    op.drop_index('idx_assigned_user_id', table_name='assets')
+    op.create_index('idx_status_asset_tag', 'assets', ['status', 'asset_tag'], unique=False)
+    op.create_index('idx_department_asset_tag', 'assets', ['department', 'asset_tag'], unique=False)
+    op.create_index('idx_status_department_asset_tag', 'assets', ['status', 'department', 'asset_tag'], unique=False)
+    op.create_index('idx_status_refresh_due_date', 'assets', ['status', 'refresh_due_date'], unique=False)
+    op.drop_index(op.f('ix_asset_history_id'), table_name='asset_history')
+    op.create_index('idx_asset_history_changed_at', 'asset_history', ['changed_at'], unique=False)
+    op.create_index('idx_verification_records_campaign_asset', 'verification_records', ['campaign_id', 'asset_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_verification_records_campaign_asset', table_name='verification_records')
+    op.drop_index('idx_asset_history_changed_at', table_name='asset_history')
+    op.create_index(op.f('ix_asset_history_id'), 'asset_history', ['id'], unique=False)
+    op.drop_index('idx_status_refresh_due_date', table_name='assets')
+    op.drop_index('idx_status_department_asset_tag', table_name='assets')
+    op.drop_index('idx_department_asset_tag', table_name='assets')
+    op.drop_index('idx_status_asset_tag', table_name='assets')
+    op.create_index('idx_assigned_user_id', 'assets', ['assigned_user_id'], unique=False)
+    op.create_index(op.f('ix_assets_assigned_user_id'), 'assets', ['assigned_user_id'], unique=False)
+    op.create_index(op.f('ix_assets_refresh_due_date'), 'assets', ['refresh_due_date'], unique=False)
+    op.create_index(op.f('ix_assets_department'), 'assets', ['department'], unique=False)
+    op.create_index(op.f('ix_assets_status'), 'assets', ['status'], unique=False)
+    op.create_index('idx_asset_tag', 'assets', ['asset_tag'], unique=False)
+    op.create_index(op.f('ix_assets_id'), 'assets', ['id'], unique=False)
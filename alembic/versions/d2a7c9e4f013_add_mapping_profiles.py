@@ -0,0 +1,36 @@
+"""Add mapping profiles
+
+Revision ID: d2a7c9e4f013
+Revises: b6e3f1a2d845
+Create Date: 2026-10-17 19:06:33.417205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a7c9e4f013'
+down_revision = 'b6e3f1a2d845'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('mapping_profiles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('header_fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('headers', sa.Text(), nullable=False),
+    sa.Column('column_mapping', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_mapping_profiles_header_fingerprint'), 'mapping_profiles', ['header_fingerprint'], unique=True)
+    op.create_index(op.f('ix_mapping_profiles_id'), 'mapping_profiles', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_mapping_profiles_id'), table_name='mapping_profiles')
+    op.drop_index(op.f('ix_mapping_profiles_header_fingerprint'), table_name='mapping_profiles')
+    op.drop_table('mapping_profiles')
@@ -0,0 +1,35 @@
+"""Add import errors
+
+Revision ID: e5b8d1c3a207
+Revises: d2a7c9e4f013
+Create Date: 2026-10-17 19:12:06.441857
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b8d1c3a207'
+down_revision = 'd2a7c9e4f013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('import_errors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('import_id', sa.Integer(), nullable=False),
+    sa.Column('row', sa.Integer(), nullable=True),
+    sa.Column('source', sa.String(length=520), nullable=True),
+    sa.Column('field', sa.String(length=100), nullable=True),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.ForeignKeyConstraint(['import_id'], ['imports.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_import_errors_import_row', 'import_errors', ['import_id', 'row'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_import_errors_import_row', table_name='import_errors')
+    op.drop_table('import_errors')
@@ -0,0 +1,65 @@
+"""Add asset search index
+
+Revision ID: f1c6a8d4b392
+Revises: e5b8d1c3a207
+Create Date: 2026-10-17 21:03:52.118640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c6a8d4b392'
+down_revision = 'e5b8d1c3a207'
+branch_labels = None
+depends_on = None
+
+# The index as of this revision, written out rather than taken from
+# app.models.asset_search so later changes there cannot rewrite it
+FIELDS = "asset_tag, computer_name, serial_number, assigned_user_name, department, model, notes"
+NEW = "new.id, new.asset_tag, new.computer_name, new.serial_number, new.assigned_user_name, new.department, new.model, new.notes"
+OLD = "old.id, old.asset_tag, old.computer_name, old.serial_number, old.assigned_user_name, old.department, old.model, old.notes"
+
+CREATE_STATEMENTS = (
+    f"CREATE VIRTUAL TABLE assets_fts USING fts5({FIELDS}, content='assets', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER assets_fts_insert AFTER INSERT ON assets BEGIN "
+    f"INSERT INTO assets_fts(rowid, {FIELDS}) VALUES ({NEW}); END",
+    f"CREATE TRIGGER assets_fts_delete AFTER DELETE ON assets BEGIN "
+    f"INSERT INTO assets_fts(assets_fts, rowid, {FIELDS}) VALUES ('delete', {OLD}); END",
+    f"CREATE TRIGGER assets_fts_update AFTER UPDATE OF {FIELDS} ON assets BEGIN "
+    f"INSERT INTO assets_fts(assets_fts, rowid, {FIELDS}) VALUES ('delete', {OLD}); "
+    f"INSERT INTO assets_fts(rowid, {FIELDS}) VALUES ({NEW}); END",
+    "INSERT INTO assets_fts(assets_fts, rank) VALUES ('rank', 'bm25(10.0, 8.0, 8.0, 4.0, 2.0, 2.0, 1.0)')",
+    # Index the assets already stored
+    "INSERT INTO assets_fts(assets_fts) VALUES ('rebuild')",
+)
+
+DROP_STATEMENTS = (
+    "DROP TRIGGER IF EXISTS assets_fts_update",
+    "DROP TRIGGER IF EXISTS assets_fts_delete",
+    "DROP TRIGGER IF EXISTS assets_fts_insert",
+    "DROP TABLE IF EXISTS assets_fts",
+)
+
+
+def upgrade() -> None:
+    # SQLite only; other databases search without an index
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    exists = bind.execute(
+        sa.text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'assets_fts'")
+    ).first()
+    if exists:
+        return
+    for statement in CREATE_STATEMENTS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in DROP_STATEMENTS:
+        op.execute(statement)
@@ -1,6 +1,7 @@
 """Application configuration."""
 from pydantic_settings import BaseSettings
 from pathlib import Path
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -16,6 +17,38 @@ class Settings(BaseSettings):
     # Uploads
     upload_dir: Path = Path("uploads")
     max_upload_size: int = 10 * 1024 * 1024  # 10MB
+    max_batch_upload_size: int = 100 * 1024 * 1024  # 100MB, all files of a batch import request
+    
+    # Workbook reader backend: "auto" uses calamine when python-calamine is
+    # installed and openpyxl otherwise
+    excel_reader: Literal["auto", "calamine", "openpyxl"] = "auto"
+    
+    # JSON list of import validation rules; unset uses the bundled
+    # app/validators/validation_rules.json
+    validation_rules_file: Optional[Path] = None
+    
+    # Rows profiled at upload to auto-map columns by their contents
+    profile_sample_rows: int = 1000
+    
+    # Parsed upload cache
+    parse_cache_dir: Path = Path("cache/parsed")
+    parse_cache_max_bytes: int = 512 * 1024 * 1024  # 512MB
+    parse_cache_max_age: int = 7 * 24 * 60 * 60  # 7 days, in seconds
+    
+    # Imports
+    import_chunk_size: int = 1000  # Rows validated and upserted per statement batch
+    import_workers: int = 2  # Background import jobs run concurrently (commits are serialized)
+    parse_processes: int = 4  # Worker processes parsing the sheets of a batch import
+    import_heartbeat_seconds: float = 5.0  # How often a running job records its progress
+    import_stale_seconds: int = 300  # A running job silent this long is treated as interrupted
+    import_sweep_seconds: float = 60.0  # How often each worker fails running jobs whose owner is gone
+    
+    # Asset list totals
+    asset_count_cache_size: int = 256  # Filter combinations whose counts are kept
+    asset_count_limit: Optional[int] = None  # Stop counting past this many and show "N+"; unset counts exactly
+    
+    # Rows per Parquet row group / Arrow record batch in columnar exports
+    export_batch_rows: int = 50_000
     
     # Session
     session_secret: str = "dev-session-secret-change-in-production"
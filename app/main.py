@@ -4,10 +4,14 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from fastapi.exceptions import RequestValidationError
+from contextlib import asynccontextmanager
+import asyncio
 import logging
 from app.config import settings
 from app.database import engine, Base
 from app import models  # noqa: F401 - Import models to register them
+from app.models.asset_search import create_asset_search_index
+from app.services.import_job_service import resume_import_jobs, shutdown_import_jobs
 from app.exceptions import (
     validation_exception_handler,
     http_exception_handler,
@@ -24,15 +28,28 @@ logger = logging.getLogger(__name__)
 # Create tables (for development - use Alembic in production)
 try:
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        if create_asset_search_index(connection):
+            logger.info("Asset search index created")
     logger.info("Database tables created/verified")
 except Exception as e:
     logger.error(f"Error creating database tables: {e}")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Resume queued import jobs on startup and drain running ones on shutdown."""
+    resume_import_jobs()
+    yield
+    await asyncio.to_thread(shutdown_import_jobs)
+
+
 app = FastAPI(
     title="Fox Hardware Inventory",
     description="Hardware inventory management system",
     version="0.1.0",
     debug=settings.debug,
+    lifespan=lifespan,
 )
 
 # Add exception handlers
@@ -52,10 +69,15 @@ templates = Jinja2Templates(directory="app/templates")
 
 # Include routers
 from app.routes import auth, dashboard, assets, reports, verification, file_api
-from app.middleware import UserContextMiddleware
+from app.middleware import UserContextMiddleware, UploadSizeLimitMiddleware
 import importlib
 import_router = importlib.import_module("app.routes.import")
 
+# Refuse oversized uploads before their bodies are spooled to disk (added
+# first so it runs inside UserContextMiddleware and its 413 reaches the
+# exception handlers)
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # Add user context middleware
 app.add_middleware(UserContextMiddleware)
 
@@ -1,7 +1,14 @@
-"""Middleware for adding user context to requests."""
-from fastapi import Request
+"""Middleware for adding user context to requests and limiting upload sizes."""
+from typing import Optional
+from fastapi import Request, HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.config import settings
 from app.dependencies import get_current_user
+from app.services.upload_service import UploadTooLargeError
+
+# Allowance for multipart boundaries, part headers and small form fields
+MULTIPART_OVERHEAD = 64 * 1024
 
 
 class UserContextMiddleware(BaseHTTPMiddleware):
@@ -22,3 +29,58 @@ class UserContextMiddleware(BaseHTTPMiddleware):
         
         response = await call_next(request)
         return response
+
+
+class UploadSizeLimitMiddleware:
+    """Reject upload requests whose body exceeds the upload size limit.
+    
+    Starlette spools a multipart body to disk before a route sees it, so
+    the per-file limit in store_upload alone still costs the whole body
+    in I/O and temp space. A Content-Length over the limit is refused
+    before any of the body is read, and a body sent without one is cut
+    off as soon as it passes the limit. Either way the answer is 413, the
+    same status the upload routes give a file that store_upload finds over
+    the limit within the multipart allowance.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        limit = _upload_body_limit(scope)
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        declared = int(content_length) if content_length.isdigit() else None
+        received = 0
+        
+        async def limited_receive():
+            nonlocal received
+            if declared is not None and declared > limit:
+                raise _too_large(limit)
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise _too_large(limit)
+            return message
+        
+        await self.app(scope, limited_receive, send)
+
+
+def _upload_body_limit(scope: Scope) -> Optional[int]:
+    """Largest request body accepted by an upload route, or None for other requests."""
+    if scope["type"] != "http" or scope["method"] != "POST":
+        return None
+    if scope["path"] in ("/import/upload", "/api/files/upload"):
+        return settings.max_upload_size + MULTIPART_OVERHEAD
+    if scope["path"] == "/api/files/batch-import":
+        return settings.max_batch_upload_size + MULTIPART_OVERHEAD
+    return None
+
+
+def _too_large(limit: int) -> HTTPException:
+    """The error answered for an oversized upload body."""
+    return HTTPException(status_code=413, detail=str(UploadTooLargeError(limit - MULTIPART_OVERHEAD)))
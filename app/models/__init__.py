@@ -1,13 +1,26 @@
 """Database models."""
 from .asset import Asset
 from .import_record import ImportRecord
+from .import_source import ImportSource
+from .import_error import ImportRowError
+from .import_job import ImportJob
+from .upload import UploadBlob, UploadAlias
+from .mapping_profile import MappingProfile
 from .asset_history import AssetHistory
 from .verification import VerificationCampaign, VerificationRecord
+from .data_version import DataVersion
 
 __all__ = [
     "Asset",
     "ImportRecord",
+    "ImportSource",
+    "ImportRowError",
+    "ImportJob",
+    "UploadBlob",
+    "UploadAlias",
+    "MappingProfile",
     "AssetHistory",
     "VerificationCampaign",
     "VerificationRecord",
+    "DataVersion",
 ]
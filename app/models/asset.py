@@ -1,16 +1,35 @@
 """Asset model."""
-from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Index
+import hashlib
+import json
+from typing import Any, Dict
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Index, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
+# Import-relevant fields covered by Asset.content_hash
+FINGERPRINT_FIELDS = (
+    "department", "assigned_user_name", "assigned_user_id",
+    "status", "operating_system", "notes", "computer_name"
+)
+
+
+def compute_content_hash(values: Dict[str, Any]) -> str:
+    """Return a normalized hash of the import-relevant fields in values.
+    
+    Empty values hash the same as missing ones, matching how delta
+    detection compares fields.
+    """
+    normalized = [str(values[field]) if values.get(field) else None for field in FINGERPRINT_FIELDS]
+    return hashlib.blake2b(json.dumps(normalized).encode(), digest_size=16).hexdigest()
+
 
 class Asset(Base):
     """Hardware asset model."""
     
     __tablename__ = "assets"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     asset_tag = Column(String(100), unique=True, nullable=False, index=True)
     computer_name = Column(String(100))
     serial_number = Column(String(100))
@@ -21,11 +40,11 @@ class Asset(Base):
     specs = Column(Text)  # JSON string for RAM, CPU, storage, etc.
     purchase_date = Column(Date)
     warranty_expiration = Column(Date)
-    refresh_due_date = Column(Date, index=True)
-    status = Column(String(20), nullable=False, default="active", index=True)
+    refresh_due_date = Column(Date)
+    status = Column(String(20), nullable=False, default="active")
     assigned_user_name = Column(String(200))
-    assigned_user_id = Column(String(50), index=True)
-    department = Column(String(100), index=True)
+    assigned_user_id = Column(String(50))
+    department = Column(String(100))
     cost_center = Column(String(50))
     location_building = Column(String(100))
     location_floor = Column(String(50))
@@ -35,15 +54,34 @@ class Asset(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     last_verified_at = Column(DateTime(timezone=True))
     last_verified_by = Column(String(100))
+    content_hash = Column(String(32))  # compute_content_hash of FINGERPRINT_FIELDS
     
     # Relationships
     history = relationship("AssetHistory", back_populates="asset", cascade="all, delete-orphan")
     verification_records = relationship("VerificationRecord", back_populates="asset", cascade="all, delete-orphan")
     
     __table_args__ = (
-        Index("idx_asset_tag", "asset_tag"),
+        # Sortable asset list columns, for keyset pagination (asset_tag has
+        # its unique index)
         Index("idx_status", "status"),
         Index("idx_department", "department"),
         Index("idx_refresh_due_date", "refresh_due_date"),
-        Index("idx_assigned_user_id", "assigned_user_id"),
+        Index("idx_computer_name", "computer_name"),
+        Index("idx_assigned_user_name", "assigned_user_name"),
+        Index("idx_device_type", "device_type"),
+        Index("idx_last_verified_at", "last_verified_at"),
+        # Filtered asset list pages in the default order, verification
+        # campaigns, exports, and the reports and dashboard (all of active
+        # assets, by department or refresh date)
+        Index("idx_status_asset_tag", "status", "asset_tag"),
+        Index("idx_department_asset_tag", "department", "asset_tag"),
+        Index("idx_status_department_asset_tag", "status", "department", "asset_tag"),
+        Index("idx_status_refresh_due_date", "status", "refresh_due_date"),
     )
+
+
+@event.listens_for(Asset, "before_insert")
+@event.listens_for(Asset, "before_update")
+def _refresh_content_hash(mapper, connection, target: Asset) -> None:
+    """Keep content_hash in step with every ORM write."""
+    target.content_hash = compute_content_hash({field: getattr(target, field) for field in FINGERPRINT_FIELDS})
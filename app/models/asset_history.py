@@ -1,5 +1,5 @@
 """Asset history model for audit trail."""
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -10,8 +10,8 @@ class AssetHistory(Base):
     
     __tablename__ = "asset_history"
     
-    id = Column(Integer, primary_key=True, index=True)
-    asset_id = Column(Integer, ForeignKey("assets.id"), nullable=False)
+    id = Column(Integer, primary_key=True)
+    asset_id = Column(Integer, ForeignKey("assets.id"), nullable=False, index=True)
     field_name = Column(String(100))
     old_value = Column(Text)
     new_value = Column(Text)
@@ -23,3 +23,10 @@ class AssetHistory(Base):
     # Relationships
     asset = relationship("Asset", back_populates="history")
     import_record = relationship("ImportRecord", back_populates="history")
+    
+    __table_args__ = (
+        # Serves lookups by import alone and by (import, asset) during rollback
+        Index("idx_asset_history_import_asset", "import_id", "asset_id"),
+        # Recent activity on the dashboard
+        Index("idx_asset_history_changed_at", "changed_at"),
+    )
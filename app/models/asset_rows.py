@@ -0,0 +1,70 @@
+"""Read models: assets as light rows of the columns a view shows.
+
+Each row type is a NamedTuple, immutable and without a per-row __dict__,
+whose fields name Asset columns. Querying AssetRows(row_type) selects
+just those columns and returns row_type tuples, so list and report views
+skip the text blobs (notes, specs) and the ORM's identity map, change
+tracking and relationship loading. Templates read rows by the same
+attribute names as Asset instances.
+"""
+from datetime import date, datetime
+from typing import NamedTuple, Optional, Type
+from sqlalchemy.orm import Bundle
+from app.models.asset import Asset
+
+
+class AssetListRow(NamedTuple):
+    """An asset in the asset list."""
+    
+    id: int
+    asset_tag: str
+    computer_name: Optional[str]
+    device_type: Optional[str]
+    operating_system: Optional[str]
+    department: Optional[str]
+    assigned_user_name: Optional[str]
+    status: str
+    refresh_due_date: Optional[date]
+    last_verified_at: Optional[datetime]
+
+
+class AssetReportRow(NamedTuple):
+    """An asset in the refresh schedule, department inventory and unassigned reports."""
+    
+    id: int
+    asset_tag: str
+    department: Optional[str]
+    assigned_user_name: Optional[str]
+    status: str
+    operating_system: Optional[str]
+    refresh_due_date: Optional[date]
+
+
+class CampaignAssetRow(NamedTuple):
+    """An asset in a verification campaign."""
+    
+    id: int
+    asset_tag: str
+    department: Optional[str]
+    assigned_user_name: Optional[str]
+    status: str
+
+
+class AssetRows(Bundle):
+    """Query entity selecting a row type's Asset columns, loaded as row type tuples.
+    
+    Use it where Asset would go: db.query(AssetRows(AssetListRow)).
+    """
+    
+    def __init__(self, row_type: Type[NamedTuple]):
+        super().__init__(
+            row_type.__name__, *(getattr(Asset, field) for field in row_type._fields), single_entity=True
+        )
+        self.row_type = row_type
+    
+    def create_row_processor(self, query, procs, labels):
+        make = self.row_type._make
+        
+        def proc(row):
+            return make([column(row) for column in procs])
+        return proc
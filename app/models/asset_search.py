@@ -0,0 +1,80 @@
+"""Full-text search index over assets (SQLite FTS5).
+
+assets_fts is an external-content FTS5 table: it stores only the index,
+keyed by asset id, and reads the text back from assets. Triggers on
+assets keep it in step with every write, ORM or bulk upsert alike, and
+the update trigger only fires when an indexed column changes. Every
+token is also indexed by its first 2 and 3 characters so short prefix
+searches stay cheap. The rank column is bm25 weighted towards
+identifiers: a hit in the asset tag outranks one in the notes.
+"""
+from sqlalchemy import Integer, Float, column, table, text
+
+# Indexed columns of assets, with their bm25 weights
+SEARCH_WEIGHTS = {
+    "asset_tag": 10.0,
+    "computer_name": 8.0,
+    "serial_number": 8.0,
+    "assigned_user_name": 4.0,
+    "department": 2.0,
+    "model": 2.0,
+    "notes": 1.0,
+}
+
+asset_search = table(
+    "assets_fts",
+    column("rowid", Integer),
+    column("rank", Float),
+)
+
+_FIELDS = ", ".join(SEARCH_WEIGHTS)
+_NEW = ", ".join(f"new.{field}" for field in SEARCH_WEIGHTS)
+_OLD = ", ".join(f"old.{field}" for field in SEARCH_WEIGHTS)
+
+CREATE_STATEMENTS = (
+    f"CREATE VIRTUAL TABLE assets_fts USING fts5({_FIELDS}, content='assets', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER assets_fts_insert AFTER INSERT ON assets BEGIN "
+    f"INSERT INTO assets_fts(rowid, {_FIELDS}) VALUES (new.id, {_NEW}); END",
+    f"CREATE TRIGGER assets_fts_delete AFTER DELETE ON assets BEGIN "
+    f"INSERT INTO assets_fts(assets_fts, rowid, {_FIELDS}) VALUES ('delete', old.id, {_OLD}); END",
+    f"CREATE TRIGGER assets_fts_update AFTER UPDATE OF {_FIELDS} ON assets BEGIN "
+    f"INSERT INTO assets_fts(assets_fts, rowid, {_FIELDS}) VALUES ('delete', old.id, {_OLD}); "
+    f"INSERT INTO assets_fts(rowid, {_FIELDS}) VALUES (new.id, {_NEW}); END",
+    "INSERT INTO assets_fts(assets_fts, rank) VALUES "
+    f"('rank', 'bm25({', '.join(str(weight) for weight in SEARCH_WEIGHTS.values())})')",
+    # Index the assets already stored
+    "INSERT INTO assets_fts(assets_fts) VALUES ('rebuild')",
+)
+
+DROP_STATEMENTS = (
+    "DROP TRIGGER IF EXISTS assets_fts_update",
+    "DROP TRIGGER IF EXISTS assets_fts_delete",
+    "DROP TRIGGER IF EXISTS assets_fts_insert",
+    "DROP TABLE IF EXISTS assets_fts",
+)
+
+
+def create_asset_search_index(connection) -> bool:
+    """Create and fill the search index if a SQLite database lacks it.
+    
+    Returns whether it was created.
+    """
+    if connection.dialect.name != "sqlite":
+        return False
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'assets_fts'")
+    ).first()
+    if exists:
+        return False
+    for statement in CREATE_STATEMENTS:
+        connection.execute(text(statement))
+    return True
+
+
+def drop_asset_search_index(connection) -> None:
+    """Drop the search index and its triggers."""
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in DROP_STATEMENTS:
+        connection.execute(text(statement))
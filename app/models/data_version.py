@@ -0,0 +1,97 @@
+"""Data version counters.
+
+A counter per table that goes up once for every committed transaction
+that wrote to it, so anything cached from the table's contents (such as
+the asset list counts) can tell it is stale with one primary key lookup,
+whichever process made the change. Asset writes are noted by session
+events rather than at each call site: flushes of Asset instances and
+every INSERT, UPDATE or DELETE on assets run through a session, which
+covers the bulk import upserts and rollbacks as well as ORM edits.
+
+The counter is bumped in its own short transaction after the writing one
+commits, not inside it, so a long import does not hold the counter row
+locked and block every other asset write until it finishes. A reader
+that caches between the two commits caches under the old version, which
+the bump then retires.
+"""
+import logging
+from itertools import chain
+from sqlalchemy import Column, Integer, String, event, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.database import Base
+from app.models.asset import Asset
+
+logger = logging.getLogger(__name__)
+
+# Session.info key holding the tables written in the current transaction
+_WRITTEN_TABLES = "data_version_written_tables"
+
+
+class DataVersion(Base):
+    """Write counter for one table."""
+    
+    __tablename__ = "data_versions"
+    
+    name = Column(String(50), primary_key=True)  # Table name
+    version = Column(Integer, nullable=False, default=0)
+
+
+def bump_data_version(connection, name: str) -> None:
+    """Count a write to the named table, creating its counter if needed."""
+    insert = postgresql_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    statement = insert(DataVersion.__table__).values(name=name, version=1)
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"version": DataVersion.__table__.c.version + 1}
+    ))
+
+
+def get_data_version(db: Session, name: str) -> int:
+    """Return the named table's write counter (0 if never written)."""
+    return db.execute(select(DataVersion.version).where(DataVersion.name == name)).scalar() or 0
+
+
+def _note_write(session: Session, name: str) -> None:
+    """Remember that the session's transaction wrote to the named table."""
+    session.info.setdefault(_WRITTEN_TABLES, set()).add(name)
+
+
+@event.listens_for(Session, "before_flush")
+def _count_asset_flushes(session: Session, flush_context, instances) -> None:
+    """Note flushes that add, change or delete assets."""
+    if any(isinstance(obj, Asset) for obj in chain(session.new, session.dirty, session.deleted)):
+        _note_write(session, Asset.__tablename__)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _count_asset_statements(state) -> None:
+    """Note INSERT, UPDATE and DELETE statements run on assets."""
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    table = getattr(state.statement, "table", None)
+    if table is not None and table.name == Asset.__tablename__:
+        _note_write(state.session, Asset.__tablename__)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_written_tables(session: Session) -> None:
+    """Bump the counters of the tables the committed transaction wrote, once each."""
+    names = session.info.pop(_WRITTEN_TABLES, None)
+    if not names:
+        return
+    try:
+        with session.get_bind().begin() as connection:
+            for name in sorted(names):
+                bump_data_version(connection, name)
+    except SQLAlchemyError as e:
+        # Cached counts stay stale until the next write bumps the counter
+        logger.warning(f"Could not bump data versions of {', '.join(sorted(names))}: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_written_tables(session: Session) -> None:
+    """Rolled back writes changed nothing to count."""
+    session.info.pop(_WRITTEN_TABLES, None)
@@ -0,0 +1,25 @@
+"""Import error model."""
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class ImportRowError(Base):
+    """A row an import could not commit, and why."""
+    
+    __tablename__ = "import_errors"
+    
+    id = Column(Integer, primary_key=True)
+    import_id = Column(Integer, ForeignKey("imports.id"), nullable=False)
+    row = Column(Integer)  # 1-based row within the file, or within the sheet for batch imports
+    source = Column(String(520))  # "file [sheet]" for batch imports
+    field = Column(String(100))
+    message = Column(Text, nullable=False)
+    
+    # Relationships
+    import_record = relationship("ImportRecord", back_populates="errors")
+    
+    __table_args__ = (
+        # Serves paging an import's errors in row order
+        Index("idx_import_errors_import_row", "import_id", "row"),
+    )
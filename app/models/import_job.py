@@ -0,0 +1,34 @@
+"""Import job model."""
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ImportJob(Base):
+    """Background import job queued from the commit step."""
+    
+    __tablename__ = "import_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    file_path = Column(String(500), nullable=False)
+    filename = Column(String(255), nullable=False)
+    column_mapping = Column(Text, nullable=False)  # JSON string
+    content_hash = Column(String(64), index=True)  # SHA-256 of the file, or of a batch's sources
+    sources = Column(Text)  # JSON list of workbook sheets for batch imports
+    uploaded_by = Column(String(100))
+    changed_only = Column(Boolean, default=False)  # Write only new and modified rows
+    status = Column(String(20), default="queued", index=True)  # queued, running, completed, failed
+    phase = Column(String(20), default="queued")  # queued, parsing, transforming, committing, done
+    rows_total = Column(Integer)
+    rows_processed = Column(Integer, default=0)  # Written every few seconds while running
+    worker_id = Column(String(100))  # host:pid:start token of the process running the job
+    heartbeat_at = Column(DateTime(timezone=True))  # Last sign of life from that process
+    error = Column(Text)
+    import_id = Column(Integer, ForeignKey("imports.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    
+    # Relationships
+    import_record = relationship("ImportRecord")
@@ -1,5 +1,5 @@
 """Import record model."""
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -15,13 +15,18 @@ class ImportRecord(Base):
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
     uploaded_by = Column(String(100))
     column_mapping = Column(Text)  # JSON string
+    content_hash = Column(String(64), index=True)  # SHA-256 of the imported file
+    changed_only = Column(Boolean, default=False)  # Wrote only new and modified rows
     records_processed = Column(Integer, default=0)
     records_created = Column(Integer, default=0)
     records_updated = Column(Integer, default=0)
+    records_unchanged = Column(Integer, default=0)
     records_failed = Column(Integer, default=0)
-    validation_errors = Column(Text)  # JSON string
+    validation_errors = Column(Text)  # Why a failed import failed; row errors are in import_errors
     status = Column(String(20), default="pending")  # pending, completed, rolled_back
     rolled_back_at = Column(DateTime(timezone=True))
     
     # Relationships
     history = relationship("AssetHistory", back_populates="import_record")
+    sources = relationship("ImportSource", back_populates="import_record", order_by="ImportSource.id")
+    errors = relationship("ImportRowError", back_populates="import_record", lazy="dynamic")
@@ -0,0 +1,26 @@
+"""Import source model."""
+from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class ImportSource(Base):
+    """Counters for one workbook sheet of a batch import."""
+    
+    __tablename__ = "import_sources"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    import_id = Column(Integer, ForeignKey("imports.id"), nullable=False, index=True)
+    filename = Column(String(255), nullable=False)
+    sheet_name = Column(String(255), nullable=False)
+    content_hash = Column(String(64))  # SHA-256 of the workbook
+    column_mapping = Column(Text)  # JSON string
+    records_processed = Column(Integer, default=0)
+    records_created = Column(Integer, default=0)
+    records_updated = Column(Integer, default=0)
+    records_unchanged = Column(Integer, default=0)
+    records_failed = Column(Integer, default=0)
+    records_duplicate = Column(Integer, default=0)  # Rows superseded by a later source with the same tag
+    
+    # Relationships
+    import_record = relationship("ImportRecord", back_populates="sources")
@@ -0,0 +1,17 @@
+"""Mapping profile model."""
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class MappingProfile(Base):
+    """Column mapping saved for a header row, reused for files with the same headers."""
+    
+    __tablename__ = "mapping_profiles"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    header_fingerprint = Column(String(64), unique=True, nullable=False, index=True)  # SHA-256 of the normalized headers
+    headers = Column(Text, nullable=False)  # JSON list of normalized headers
+    column_mapping = Column(Text, nullable=False)  # JSON string: field -> normalized header
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
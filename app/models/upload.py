@@ -0,0 +1,34 @@
+"""Uploaded file models."""
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class UploadBlob(Base):
+    """Uploaded file contents, stored once per SHA-256."""
+    
+    __tablename__ = "upload_blobs"
+    
+    content_hash = Column(String(64), primary_key=True)  # SHA-256 hex digest
+    size = Column(Integer, nullable=False)
+    suffix = Column(String(10), nullable=False)  # .xlsx, .xls, .csv, .tsv
+    file_info = Column(Text)  # JSON string: columns, sample_data, auto_mapping, row_count
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    aliases = relationship("UploadAlias", back_populates="blob")
+
+
+class UploadAlias(Base):
+    """Filename an upload was saved under, pointing at its contents."""
+    
+    __tablename__ = "upload_aliases"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String(255), unique=True, nullable=False, index=True)
+    content_hash = Column(String(64), ForeignKey("upload_blobs.content_hash"), nullable=False, index=True)
+    uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    blob = relationship("UploadBlob", back_populates="aliases")
@@ -1,5 +1,5 @@
 """Verification models."""
-from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -40,3 +40,8 @@ class VerificationRecord(Base):
     # Relationships
     campaign = relationship("VerificationCampaign", back_populates="verification_records")
     asset = relationship("Asset", back_populates="verification_records")
+    
+    __table_args__ = (
+        # A campaign's records, and whether it has verified an asset
+        Index("idx_verification_records_campaign_asset", "campaign_id", "asset_id"),
+    )
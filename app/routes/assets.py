@@ -9,6 +9,7 @@ import pandas as pd
 import io
 from app.database import get_db
 from app.models.asset import Asset
+from app.models.asset_rows import AssetListRow
 from app.services.asset_service import (
     get_assets,
     get_asset,
@@ -32,49 +33,64 @@ async def assets_list(
     search: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     department: Optional[str] = Query(None),
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
     per_page: int = Query(50, ge=1, le=100),
-    sort_by: str = Query("asset_tag"),
-    order: str = Query("asc")
+    sort_by: Optional[str] = Query(None),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    rows_only: bool = Query(False)
 ):
-    """Asset list view."""
-    skip = (page - 1) * per_page
-    assets, total = get_assets(
-        db,
-        skip=skip,
-        limit=per_page,
-        search=search,
-        status=status,
-        department=department,
-        sort_by=sort_by,
-        order=order
-    )
+    """Asset list view.
+    
+    Pages are addressed by cursor; rows_only returns just the page's rows,
+    for the list's infinite scroll.
+    """
+    try:
+        page = get_assets(
+            db,
+            limit=per_page,
+            cursor=cursor,
+            search=search,
+            status=status,
+            department=department,
+            sort_by=sort_by,
+            order=order,
+            row_type=AssetListRow
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    context = {
+        "request": request,
+        "assets": page["assets"],
+        "total": page["total"],
+        "total_approximate": page["total_approximate"],
+        "next_cursor": page["next_cursor"],
+        "prev_cursor": page["prev_cursor"],
+        "cursor": cursor or "",
+        "per_page": per_page,
+        "search": search or "",
+        "status": status or "",
+        "department": department or "",
+        "sort_by": sort_by or "",
+        "order": order,
+    }
+    if rows_only:
+        return templates.TemplateResponse("assets/rows.html", context)
     
-    total_pages = (total + per_page - 1) // per_page if total > 0 else 1
     user = getattr(request.state, "user", {"username": "Guest", "role": "guest", "is_authenticated": False})
     last_import = get_last_import_info(db)
     
     return templates.TemplateResponse(
         "assets/list.html",
         {
-            "request": request,
-            "assets": assets,
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "total_pages": total_pages,
-            "search": search or "",
-            "status": status or "",
-            "department": department or "",
-            "sort_by": sort_by,
-            "order": order,
+            **context,
             "user": user,
             "last_import": last_import
         }
     )
 
 
-@router.get("/assets/{asset_id}", response_class=HTMLResponse)
+@router.get("/assets/{asset_id:int}", response_class=HTMLResponse)
 async def asset_detail(
     request: Request,
     asset_id: int,
@@ -1,19 +1,38 @@
 """API routes for Excel file management."""
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Query
 from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from pathlib import Path
 import shutil
 import json
+import logging
 import pandas as pd
 import numpy as np
 from datetime import datetime
 from app.database import get_db
 from app.config import settings
 from app.models.import_record import ImportRecord
-from app.services.import_service import process_uploaded_file
-from app.validators.excel_parser import parse_excel_file, get_column_names, get_sample_data
+from app.models.import_source import ImportSource
+from app.models.upload import UploadAlias
+from app.services.parse_cache import load_parsed_upload
+from app.services.upload_service import (
+    save_upload,
+    get_upload,
+    upload_file_info,
+    upload_path,
+    delete_upload,
+    UploadTooLargeError,
+)
+from app.services.export_service import COLUMNAR_FORMATS, frame_batches, write_columnar
+from app.services.batch_import_service import resolve_batch_sources, load_batch_aliases, batch_content_hash
+from app.services.import_job_service import enqueue_batch_import_job, get_job_status
+from app.services.import_service import find_completed_import
+from app.services.mapping_profile_service import find_profile_mapping
+from app.validators.excel_parser import get_column_names, get_sample_data, is_supported_file
+
+logger = logging.getLogger(__name__)
 
 
 def json_serialize(obj):
@@ -35,6 +54,14 @@ def json_serialize(obj):
     except:
         return None
 
+# Content types for downloads of stored uploads, by suffix
+DOWNLOAD_MEDIA_TYPES = {
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".xls": "application/vnd.ms-excel",
+    ".csv": "text/csv",
+    ".tsv": "text/tab-separated-values",
+}
+
 router = APIRouter(prefix="/api/files", tags=["files"])
 
 
@@ -48,30 +75,21 @@ async def upload_file_api(
     Returns file metadata and processing information.
     """
     # Validate file type
-    if not file.filename.endswith(('.xlsx', '.xls')):
+    if not is_supported_file(file.filename):
         raise HTTPException(
             status_code=400,
-            detail="Only Excel files (.xlsx, .xls) are supported"
+            detail="Only Excel (.xlsx, .xls), CSV and TSV files are supported"
         )
     
-    # Validate file size
-    file_content = await file.read()
-    if len(file_content) > settings.max_upload_size:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File size exceeds maximum allowed size of {settings.max_upload_size / 1024 / 1024}MB"
-        )
-    
-    # Save uploaded file
-    upload_path = settings.upload_dir / file.filename
-    upload_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(upload_path, "wb") as buffer:
-        buffer.write(file_content)
+    # Store uploaded file, enforcing the size limit while streaming
+    try:
+        alias = await run_in_threadpool(save_upload, db, file.file, file.filename, settings.max_upload_size)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     
     try:
-        # Process file to get metadata
-        file_info = process_uploaded_file(upload_path)
+        # Process file to get metadata (reuses saved metadata for contents seen before)
+        file_info = await run_in_threadpool(upload_file_info, db, alias.blob)
         
         # Clean sample data for JSON serialization
         sample_data_clean = []
@@ -83,22 +101,138 @@ async def upload_file_api(
             "success": True,
             "file": {
                 "filename": file.filename,
-                "path": str(upload_path),
-                "size": len(file_content),
+                "path": str(upload_path(alias)),
+                "size": alias.blob.size,
+                "sha256": alias.content_hash,
                 "uploaded_at": datetime.now().isoformat(),
                 "columns": file_info["columns"],
                 "row_count": file_info["row_count"],
                 "auto_mapping": file_info["auto_mapping"],
+                "mapping_candidates": file_info.get("mapping_candidates"),
+                "mapping_profile": find_profile_mapping(db, file_info["columns"]),
                 "sample_data": sample_data_clean
             }
         })
     except Exception as e:
         # Clean up file on error
-        if upload_path.exists():
-            upload_path.unlink()
+        db.rollback()
+        delete_upload(db, alias)
         raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
 
 
+@router.post("/batch-import")
+async def batch_import_api(
+    files: List[UploadFile] = File(default=[]),
+    filenames: Optional[str] = Form(None, description="JSON list of previously uploaded filenames to include"),
+    sheets: Optional[str] = Form(None, description="JSON object mapping filenames to lists of sheet names"),
+    mapping: Optional[str] = Form(None, description="JSON string of column mapping; detected per sheet if omitted"),
+    changed_only: bool = Form(False),
+    db: Session = Depends(get_db)
+):
+    """Import several workbooks, and chosen sheets within them, as one batch.
+    
+    Uploaded files are stored like single uploads; previously uploaded
+    files can be included by name. Workbooks without a sheet selection
+    contribute every sheet. The batch runs as a background import job;
+    poll /api/files/jobs/{job_id} for progress and per-sheet counters.
+    """
+    try:
+        existing_names = json.loads(filenames) if filenames else []
+        sheet_selection = json.loads(sheets) if sheets else {}
+        column_mapping = json.loads(mapping) if mapping else {}
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
+    
+    batch_names = [file.filename for file in files] + existing_names
+    if not batch_names:
+        raise HTTPException(status_code=400, detail="No files given")
+    if len(set(batch_names)) != len(batch_names):
+        raise HTTPException(status_code=400, detail="Each file may appear in a batch only once")
+    for filename in batch_names:
+        if not is_supported_file(filename):
+            raise HTTPException(
+                status_code=400,
+                detail=f"{filename}: only Excel (.xlsx, .xls), CSV and TSV files are supported"
+            )
+    
+    # Store uploaded files, enforcing the size limit while streaming
+    for file in files:
+        try:
+            await run_in_threadpool(save_upload, db, file.file, file.filename, settings.max_upload_size)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=f"{file.filename}: {str(e)}")
+    
+    try:
+        aliases = load_batch_aliases(db, batch_names)
+        sources = await run_in_threadpool(resolve_batch_sources, aliases, sheet_selection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error reading workbooks: {str(e)}")
+    
+    source_list = [
+        {"filename": source["filename"], "sheet_name": source["sheet_name"]}
+        for source in sources
+    ]
+    
+    # An identical batch with the same mapping has already been imported
+    existing_import = find_completed_import(db, batch_content_hash(sources), column_mapping, changed_only)
+    if existing_import:
+        return JSONResponse({
+            "success": True,
+            "already_imported": True,
+            "import_id": existing_import.id,
+            "sources": source_list
+        })
+    
+    job = enqueue_batch_import_job(
+        db,
+        sources,
+        column_mapping,
+        uploaded_by="api",
+        changed_only=changed_only
+    )
+    return JSONResponse({
+        "success": True,
+        "already_imported": False,
+        "job_id": job.id,
+        "status_url": f"/api/files/jobs/{job.id}",
+        "sources": source_list
+    }, status_code=202)
+
+
+@router.get("/jobs/{job_id}")
+async def get_import_job_api(
+    job_id: int,
+    db: Session = Depends(get_db)
+):
+    """Get an import job's progress, and its per-sheet counters once committed."""
+    job_status = get_job_status(db, job_id)
+    if job_status is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    
+    sources = []
+    if job_status["import_id"]:
+        sources = [
+            {
+                "filename": source.filename,
+                "sheet_name": source.sheet_name,
+                "sha256": source.content_hash,
+                "records_processed": source.records_processed,
+                "records_created": source.records_created,
+                "records_updated": source.records_updated,
+                "records_unchanged": source.records_unchanged,
+                "records_failed": source.records_failed,
+                "records_duplicate": source.records_duplicate,
+            }
+            for source in db.query(ImportSource).filter(
+                ImportSource.import_id == job_status["import_id"]
+            ).order_by(ImportSource.id)
+        ]
+    
+    return JSONResponse({**job_status, "sources": sources})
+
+
 @router.get("/list")
 async def list_files_api(
     db: Session = Depends(get_db),
@@ -106,21 +240,19 @@ async def list_files_api(
     limit: int = Query(50, ge=1, le=100)
 ):
     """List all uploaded Excel files with metadata."""
-    # Get files from upload directory
-    upload_dir = Path(settings.upload_dir)
-    files = []
-    
-    if upload_dir.exists():
-        for file_path in sorted(upload_dir.glob("*.xlsx"), reverse=True):
-            if file_path.is_file():
-                stat = file_path.stat()
-                files.append({
-                    "filename": file_path.name,
-                    "path": str(file_path),
-                    "size": stat.st_size,
-                    "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                    "modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                })
+    # Get files from the upload store
+    aliases = db.query(UploadAlias).options(joinedload(UploadAlias.blob)).order_by(UploadAlias.filename.desc()).all()
+    files = [
+        {
+            "filename": alias.filename,
+            "path": str(upload_path(alias)),
+            "size": alias.blob.size,
+            "sha256": alias.content_hash,
+            "created_at": alias.blob.created_at.isoformat() if alias.blob.created_at else None,
+            "modified_at": alias.uploaded_at.isoformat() if alias.uploaded_at else None,
+        }
+        for alias in aliases
+    ]
     
     # Also get import records
     import_records = db.query(ImportRecord).order_by(
@@ -138,6 +270,7 @@ async def list_files_api(
                 "records_processed": imp.records_processed,
                 "records_created": imp.records_created,
                 "records_updated": imp.records_updated,
+                "records_unchanged": imp.records_unchanged,
                 "records_failed": imp.records_failed,
             }
             for imp in import_records
@@ -157,15 +290,15 @@ async def download_file_api(
     if ".." in filename or "/" in filename or "\\" in filename:
         raise HTTPException(status_code=400, detail="Invalid filename")
     
-    file_path = settings.upload_dir / filename
-    
-    if not file_path.exists():
+    alias = get_upload(db, filename)
+    if alias is None or not upload_path(alias).exists():
         raise HTTPException(status_code=404, detail="File not found")
+    file_path = upload_path(alias)
     
     return FileResponse(
         path=str(file_path),
         filename=filename,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        media_type=DOWNLOAD_MEDIA_TYPES.get(file_path.suffix, DOWNLOAD_MEDIA_TYPES[".xlsx"])
     )
 
 
@@ -179,19 +312,18 @@ async def get_file_info_api(
     if ".." in filename or "/" in filename or "\\" in filename:
         raise HTTPException(status_code=400, detail="Invalid filename")
     
-    file_path = settings.upload_dir / filename
-    
-    if not file_path.exists():
+    alias = get_upload(db, filename)
+    if alias is None or not upload_path(alias).exists():
         raise HTTPException(status_code=404, detail="File not found")
+    file_path = upload_path(alias)
     
     try:
-        # Process file to get detailed info
-        file_info = process_uploaded_file(file_path)
-        stat = file_path.stat()
+        # Saved probe metadata; the file is only processed if it has none
+        file_info = await run_in_threadpool(upload_file_info, db, alias.blob)
         
-        # Check if file has been imported
+        # Check if these contents have been imported
         import_record = db.query(ImportRecord).filter(
-            ImportRecord.filename == filename
+            ImportRecord.content_hash == alias.content_hash
         ).order_by(ImportRecord.uploaded_at.desc()).first()
         
         # Clean sample data for JSON serialization
@@ -203,9 +335,10 @@ async def get_file_info_api(
         return JSONResponse({
             "filename": filename,
             "path": str(file_path),
-            "size": stat.st_size,
-            "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-            "modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            "size": alias.blob.size,
+            "sha256": alias.content_hash,
+            "created_at": alias.blob.created_at.isoformat() if alias.blob.created_at else None,
+            "modified_at": alias.uploaded_at.isoformat() if alias.uploaded_at else None,
             "columns": file_info["columns"],
             "row_count": file_info["row_count"],
             "auto_mapping": file_info["auto_mapping"],
@@ -231,13 +364,12 @@ async def delete_file_api(
     if ".." in filename or "/" in filename or "\\" in filename:
         raise HTTPException(status_code=400, detail="Invalid filename")
     
-    file_path = settings.upload_dir / filename
-    
-    if not file_path.exists():
+    alias = get_upload(db, filename)
+    if alias is None:
         raise HTTPException(status_code=404, detail="File not found")
     
     try:
-        file_path.unlink()
+        delete_upload(db, alias)
         return JSONResponse({
             "success": True,
             "message": f"File {filename} deleted successfully"
@@ -256,13 +388,13 @@ async def get_file_columns_api(
     if ".." in filename or "/" in filename or "\\" in filename:
         raise HTTPException(status_code=400, detail="Invalid filename")
     
-    file_path = settings.upload_dir / filename
-    
-    if not file_path.exists():
+    alias = get_upload(db, filename)
+    if alias is None or not upload_path(alias).exists():
         raise HTTPException(status_code=404, detail="File not found")
+    file_path = upload_path(alias)
     
     try:
-        df = parse_excel_file(file_path)
+        df = load_parsed_upload(file_path)
         columns = get_column_names(df)
         sample_data_raw = get_sample_data(df, num_rows=5)
         
@@ -287,77 +419,135 @@ async def get_file_columns_api(
 async def parse_file_api(
     filename: str,
     mapping: Optional[str] = Query(None, description="JSON string of column mapping"),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
     db: Session = Depends(get_db)
 ):
     """Parse an Excel file with optional column mapping.
     
-    Returns transformed data ready for import.
+    Without a mapping, the saved mapping profile for the file's headers is
+    used if there is one. Returns transformed data ready for import, as
+    one JSON document or, with format=ndjson, as newline-delimited JSON: a
+    summary line followed by one line per row.
+    
+    The sheet is parsed (or read from the parse cache) in full first; rows
+    are then transformed and encoded a chunk at a time as the response
+    streams, so only the transformed output stays small. The first chunk
+    is transformed before responding, so a mapping that cannot be applied
+    answers 400. If a later chunk fails, the rows already sent are followed
+    by the error: a final {"error": ...} line in NDJSON, and in the JSON
+    document an "error" member in place of mapping_used and mapping_source.
     """
     # Security: prevent path traversal
     if ".." in filename or "/" in filename or "\\" in filename:
         raise HTTPException(status_code=400, detail="Invalid filename")
     
-    file_path = settings.upload_dir / filename
-    
-    if not file_path.exists():
+    alias = get_upload(db, filename)
+    if alias is None or not upload_path(alias).exists():
         raise HTTPException(status_code=404, detail="File not found")
+    file_path = upload_path(alias)
     
     try:
-        from app.services.import_service import transform_row
-        
-        df = parse_excel_file(file_path)
-        column_mapping = json.loads(mapping) if mapping else {}
+        from app.services.import_service import iter_transformed_json, mapped_columns
         
-        # Transform all rows
-        transformed_rows = []
-        for _, row in df.iterrows():
-            row_dict = row.to_dict()
-            transformed = transform_row(row_dict, column_mapping)
-            transformed_rows.append(transformed)
-        
-        # Clean transformed data for JSON serialization
-        transformed_rows_clean = []
-        for row in transformed_rows:
-            clean_row = {k: json_serialize(v) for k, v in row.items()}
-            transformed_rows_clean.append(clean_row)
-        
-        return JSONResponse({
-            "filename": filename,
-            "total_rows": len(transformed_rows_clean),
-            "transformed_data": transformed_rows_clean,
-            "mapping_used": column_mapping
-        })
+        if mapping:
+            column_mapping = json.loads(mapping)
+            mapping_source = "request"
+        else:
+            file_info = await run_in_threadpool(upload_file_info, db, alias.blob)
+            column_mapping = find_profile_mapping(db, file_info["columns"]) or {}
+            mapping_source = "profile" if column_mapping else None
+        df = load_parsed_upload(file_path, columns=mapped_columns(column_mapping))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error parsing file: {str(e)}")
+    
+    summary = {
+        "filename": filename,
+        "total_rows": len(df),
+        "mapping_used": column_mapping,
+        "mapping_source": mapping_source
+    }
+    chunks = iter_transformed_json(df, column_mapping)
+    try:
+        first_chunk = await run_in_threadpool(next, chunks, None)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error parsing file: {str(e)}")
+    
+    def transformed_chunks():
+        """The rows chunk by chunk, then the error message if a chunk fails."""
+        if first_chunk is None:
+            return
+        yield first_chunk, None
+        try:
+            for lines in chunks:
+                yield lines, None
+        except Exception as e:
+            logger.error(f"Error parsing {filename} after streaming began: {e}", exc_info=True)
+            yield [], f"Error parsing file: {str(e)}"
+    
+    if format == "ndjson":
+        def ndjson_body():
+            yield json.dumps(summary) + "\n"
+            for lines, error in transformed_chunks():
+                if error:
+                    yield json.dumps({"error": error}) + "\n"
+                    return
+                yield "\n".join(lines) + "\n"
+        
+        return StreamingResponse(ndjson_body(), media_type="application/x-ndjson")
+    
+    def json_body():
+        # The summary fields with the rows streamed into transformed_data
+        yield f'{{"filename": {json.dumps(filename)}, "total_rows": {len(df)}, "transformed_data": ['
+        separator = ""
+        for lines, error in transformed_chunks():
+            if error:
+                yield f'], "error": {json.dumps(error)}}}'
+                return
+            yield separator + ",".join(lines)
+            separator = ","
+        yield (
+            f'], "mapping_used": {json.dumps(column_mapping)}, '
+            f'"mapping_source": {json.dumps(mapping_source)}}}'
+        )
+    
+    return StreamingResponse(json_body(), media_type="application/json")
 
 
 @router.get("/{filename}/export")
 async def export_file_data_api(
     filename: str,
-    format: str = Query("json", pattern="^(json|csv)$"),
+    format: str = Query("json", pattern="^(json|csv|parquet|arrow)$"),
     db: Session = Depends(get_db)
 ):
-    """Export file data in JSON or CSV format."""
+    """Export file data in JSON, CSV, Parquet or Arrow IPC format."""
     # Security: prevent path traversal
     if ".." in filename or "/" in filename or "\\" in filename:
         raise HTTPException(status_code=400, detail="Invalid filename")
     
-    file_path = settings.upload_dir / filename
-    
-    if not file_path.exists():
+    alias = get_upload(db, filename)
+    if alias is None or not upload_path(alias).exists():
         raise HTTPException(status_code=404, detail="File not found")
+    file_path = upload_path(alias)
     
     try:
-        df = parse_excel_file(file_path)
+        df = load_parsed_upload(file_path)
         
-        if format == "csv":
+        if format in COLUMNAR_FORMATS:
+            media_type, suffix = COLUMNAR_FORMATS[format]
+            schema, batches = frame_batches(df, settings.export_batch_rows)
+            return StreamingResponse(
+                write_columnar(batches, schema, format),
+                media_type=media_type,
+                headers={"Content-Disposition": f"attachment; filename={Path(filename).stem}{suffix}"}
+            )
+        elif format == "csv":
             import io
             output = io.StringIO()
             df.to_csv(output, index=False)
             return StreamingResponse(
                 io.BytesIO(output.getvalue().encode()),
                 media_type="text/csv",
-                headers={"Content-Disposition": f"attachment; filename={filename.replace('.xlsx', '.csv')}"}
+                headers={"Content-Disposition": f"attachment; filename={Path(filename).stem}.csv"}
             )
         else:
             # Convert DataFrame to dict, replacing NaN with None
@@ -1,19 +1,32 @@
 """Import routes."""
 import shutil
 from pathlib import Path
-from fastapi import APIRouter, Request, Depends, UploadFile, File, Form, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import APIRouter, Request, Depends, UploadFile, File, Form, HTTPException, Query
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, defer
 from typing import Optional
 import json
 from app.database import get_db
 from app.config import settings
-from app.services.import_service import process_uploaded_file, transform_row, commit_import
-from app.services.validation_service import validate_import_data
-from app.services.delta_service import detect_deltas
-from app.validators.excel_parser import parse_excel_file, get_sample_data
+from app.services.import_service import transform_dataframe, find_completed_import, mapped_columns
+from app.services.import_job_service import enqueue_import_job, get_job_status
+from app.services.upload_service import (
+    save_upload,
+    upload_file_info,
+    upload_path,
+    upload_display_name,
+    delete_upload,
+    UploadTooLargeError,
+)
+from app.services.analysis_service import analyze_import
+from app.services.parse_cache import load_parsed_upload, file_content_hash
 from app.models.import_record import ImportRecord
+from app.models.upload import UploadBlob
+from app.services.mapping_profile_service import find_profile_mapping, save_mapping_profile
+from app.services.import_error_service import get_import_errors, import_error_facets, serialize_import_error
+from app.validators.excel_parser import is_supported_file
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/templates")
@@ -32,32 +45,30 @@ async def upload_file(
     db: Session = Depends(get_db)
 ):
     """Handle file upload and return column mapping UI."""
-    upload_path = None
+    alias = None
     try:
         # Validate file type
-        if not file.filename or not file.filename.endswith(('.xlsx', '.xls')):
+        if not file.filename or not is_supported_file(file.filename):
             raise HTTPException(
                 status_code=400,
-                detail="Only Excel files (.xlsx, .xls) are supported"
+                detail="Only Excel (.xlsx, .xls), CSV and TSV files are supported"
             )
         
-        # Validate file size
-        file_content = await file.read()
-        if len(file_content) > settings.max_upload_size:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size exceeds maximum allowed size of {settings.max_upload_size / 1024 / 1024:.1f}MB"
-            )
-        
-        # Save uploaded file temporarily
-        upload_path = settings.upload_dir / file.filename
-        upload_path.parent.mkdir(parents=True, exist_ok=True)
+        # Store uploaded file, enforcing the size limit while streaming
+        try:
+            alias = await run_in_threadpool(save_upload, db, file.file, file.filename, settings.max_upload_size)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
         
-        with open(upload_path, "wb") as buffer:
-            buffer.write(file_content)
+        # Process file (reuses saved metadata for contents seen before)
+        file_info = await run_in_threadpool(upload_file_info, db, alias.blob)
         
-        # Process file
-        file_info = process_uploaded_file(upload_path)
+        # Files whose headers have a saved mapping go straight to preview
+        profile_mapping = find_profile_mapping(db, file_info["columns"])
+        if profile_mapping:
+            return await run_in_threadpool(
+                _render_preview, request, db, str(upload_path(alias)), profile_mapping, True
+            )
         
         return templates.TemplateResponse(
             "import/mapping.html",
@@ -68,7 +79,7 @@ async def upload_file(
                 "sample_data": file_info["sample_data"],
                 "auto_mapping": file_info["auto_mapping"],
                 "row_count": file_info["row_count"],
-                "file_path": str(upload_path)
+                "file_path": str(upload_path(alias))
             }
         )
     except HTTPException:
@@ -76,9 +87,10 @@ async def upload_file(
         raise
     except Exception as e:
         # Clean up file on error
-        if upload_path and upload_path.exists():
+        if alias is not None:
             try:
-                upload_path.unlink()
+                db.rollback()
+                delete_upload(db, alias)
             except:
                 pass
         import logging
@@ -109,38 +121,10 @@ async def preview_import(
             raise HTTPException(status_code=400, detail=f"Invalid mapping JSON: {str(e)}")
         
         # Validate file exists
-        file_path_obj = Path(file_path)
-        if not file_path_obj.exists():
+        if not Path(file_path).exists():
             raise HTTPException(status_code=404, detail="File not found")
         
-        # Parse Excel file
-        df = parse_excel_file(file_path_obj)
-        
-        # Transform all rows
-        transformed_rows = []
-        for _, row in df.iterrows():
-            row_dict = row.to_dict()
-            transformed = transform_row(row_dict, mapping)
-            transformed_rows.append(transformed)
-        
-        # Validate data
-        validation_result = validate_import_data(transformed_rows, db)
-        
-        # Detect deltas
-        deltas = detect_deltas(transformed_rows, db)
-        
-        return templates.TemplateResponse(
-            "import/preview.html",
-            {
-                "request": request,
-                "file_path": file_path,
-                "mapping_json": mapping_json,
-                "transformed_data": transformed_rows[:50],  # Preview first 50 rows
-                "total_rows": len(transformed_rows),
-                "validation": validation_result,
-                "deltas": deltas
-            }
-        )
+        return await run_in_threadpool(_render_preview, request, db, file_path, mapping)
     except HTTPException:
         raise
     except Exception as e:
@@ -149,14 +133,78 @@ async def preview_import(
         raise HTTPException(status_code=400, detail=f"Error previewing import: {str(e)}")
 
 
+def _render_preview(
+    request: Request,
+    db: Session,
+    file_path: str,
+    mapping: dict,
+    from_profile: bool = False
+) -> HTMLResponse:
+    """Render the preview of importing an uploaded file with a mapping."""
+    # Parse the mapped columns of the Excel file
+    df = load_parsed_upload(Path(file_path), columns=mapped_columns(mapping))
+    
+    # Transform all rows
+    transformed_rows = transform_dataframe(df, mapping)
+    
+    # Validate data and detect deltas in one pass
+    analysis = analyze_import(transformed_rows, db)
+    
+    return templates.TemplateResponse(
+        "import/preview.html",
+        {
+            "request": request,
+            "file_path": file_path,
+            "mapping_json": json.dumps(mapping),
+            "from_profile": from_profile,
+            "transformed_data": transformed_rows[:50],  # Preview first 50 rows
+            "total_rows": len(transformed_rows),
+            "validation": analysis["validation"],
+            "deltas": analysis["deltas"]
+        }
+    )
+
+
+@router.get("/import/mapping", response_class=HTMLResponse)
+async def mapping_page(
+    request: Request,
+    file_path: str,
+    db: Session = Depends(get_db)
+):
+    """Column mapping page for an uploaded file, e.g. to change a saved mapping."""
+    # Validate file path security
+    if ".." in file_path or file_path.startswith("/"):
+        raise HTTPException(status_code=400, detail="Invalid file path")
+    
+    file_path_obj = Path(file_path)
+    blob = db.get(UploadBlob, file_path_obj.stem)
+    if blob is None or not file_path_obj.exists():
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    file_info = await run_in_threadpool(upload_file_info, db, blob)
+    return templates.TemplateResponse(
+        "import/mapping.html",
+        {
+            "request": request,
+            "filename": upload_display_name(db, blob.content_hash) or file_path_obj.name,
+            "columns": file_info["columns"],
+            "sample_data": file_info["sample_data"],
+            "auto_mapping": find_profile_mapping(db, file_info["columns"]) or file_info["auto_mapping"],
+            "row_count": file_info["row_count"],
+            "file_path": file_path
+        }
+    )
+
+
 @router.post("/import/commit")
 async def commit_import_route(
     request: Request,
     file_path: str = Form(...),
     mapping_json: str = Form(...),
+    changed_only: bool = Form(False),
     db: Session = Depends(get_db)
 ):
-    """Commit the import to database."""
+    """Queue the import as a background job and show its progress."""
     try:
         # Validate file path security
         if ".." in file_path or file_path.startswith("/"):
@@ -173,46 +221,80 @@ async def commit_import_route(
         if not file_path_obj.exists():
             raise HTTPException(status_code=404, detail="File not found")
         
-        # Parse Excel file
-        df = parse_excel_file(file_path_obj)
+        # Submitting the same content with the same mapping and mode again
+        # returns the existing import instead of running a second one
+        content_hash = await run_in_threadpool(file_content_hash, file_path_obj)
+        existing_import = find_completed_import(db, content_hash, mapping, changed_only)
+        if existing_import:
+            history_url = f"/import/history?success=true&import_id={existing_import.id}"
+            if request.headers.get("HX-Request"):
+                return HTMLResponse("", headers={"HX-Redirect": history_url})
+            return RedirectResponse(url=history_url, status_code=303)
         
-        # Transform all rows
-        transformed_rows = []
-        for _, row in df.iterrows():
-            row_dict = row.to_dict()
-            transformed = transform_row(row_dict, mapping)
-            transformed_rows.append(transformed)
+        # Remember the confirmed mapping for files with the same headers
+        blob = db.get(UploadBlob, content_hash)
+        if blob is not None:
+            file_info = await run_in_threadpool(upload_file_info, db, blob)
+            save_mapping_profile(db, file_info["columns"], mapping)
         
-        # Commit import
-        import_record = commit_import(
+        job = enqueue_import_job(
             db=db,
             file_path=file_path_obj,
-            filename=file_path_obj.name,
             column_mapping=mapping,
-            transformed_data=transformed_rows,
-            uploaded_by="user"  # TODO: Get from session
+            uploaded_by="user",  # TODO: Get from session
+            filename=upload_display_name(db, content_hash),
+            content_hash=content_hash,
+            changed_only=changed_only
         )
         
-        # Clean up uploaded file
-        try:
-            if file_path_obj.exists():
-                file_path_obj.unlink()
-        except Exception as cleanup_error:
-            import logging
-            logging.warning(f"Could not clean up file {file_path}: {cleanup_error}")
-        
-        return RedirectResponse(
-            url=f"/import/history?success=true&import_id={import_record.id}",
-            status_code=303
-        )
+        if request.headers.get("HX-Request"):
+            return templates.TemplateResponse(
+                "import/job_status.html",
+                {"request": request, "job": get_job_status(db, job.id)}
+            )
+        return RedirectResponse(url=f"/import/jobs/{job.id}", status_code=303)
     except HTTPException:
         raise
     except Exception as e:
         import logging
-        logging.error(f"Error committing import: {e}", exc_info=True)
+        logging.error(f"Error queueing import: {e}", exc_info=True)
         raise HTTPException(status_code=400, detail=f"Error committing import: {str(e)}")
 
 
+@router.get("/import/jobs/{job_id}", response_class=HTMLResponse)
+async def import_job_page(
+    request: Request,
+    job_id: int,
+    db: Session = Depends(get_db)
+):
+    """Import job progress page."""
+    job = get_job_status(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    
+    return templates.TemplateResponse(
+        "import/job.html",
+        {"request": request, "job": job}
+    )
+
+
+@router.get("/import/jobs/{job_id}/status", response_class=HTMLResponse)
+async def import_job_status(
+    request: Request,
+    job_id: int,
+    db: Session = Depends(get_db)
+):
+    """Import job status fragment, polled by the progress page."""
+    job = get_job_status(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    
+    return templates.TemplateResponse(
+        "import/job_status.html",
+        {"request": request, "job": job}
+    )
+
+
 @router.post("/import/{import_id}/rollback")
 async def rollback_import_route(
     import_id: int,
@@ -236,7 +318,9 @@ async def import_history(
     import_id: Optional[int] = None
 ):
     """Import history page."""
-    imports = db.query(ImportRecord).order_by(ImportRecord.uploaded_at.desc()).limit(50).all()
+    imports = db.query(ImportRecord).options(
+        defer(ImportRecord.validation_errors)
+    ).order_by(ImportRecord.uploaded_at.desc()).limit(50).all()
     
     return templates.TemplateResponse(
         "import/history.html",
@@ -247,3 +331,82 @@ async def import_history(
             "import_id": import_id
         }
     )
+
+
+@router.get("/import/{import_id}/errors", response_class=HTMLResponse)
+async def import_errors_page(
+    request: Request,
+    import_id: int,
+    db: Session = Depends(get_db),
+    field: Optional[str] = Query(None),
+    source: Optional[str] = Query(None),
+    search: Optional[str] = Query(None),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(50, ge=1, le=100)
+):
+    """Browse the row errors of an import."""
+    import_record = db.query(ImportRecord).options(
+        defer(ImportRecord.validation_errors)
+    ).filter(ImportRecord.id == import_id).first()
+    if import_record is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    
+    errors, total = get_import_errors(
+        db,
+        import_id,
+        skip=(page - 1) * per_page,
+        limit=per_page,
+        field=field,
+        source=source,
+        search=search
+    )
+    total_pages = (total + per_page - 1) // per_page if total > 0 else 1
+    
+    return templates.TemplateResponse(
+        "import/errors.html",
+        {
+            "request": request,
+            "import_record": import_record,
+            "errors": errors,
+            "facets": import_error_facets(db, import_id),
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "total_pages": total_pages,
+            "field": field or "",
+            "source": source or "",
+            "search": search or ""
+        }
+    )
+
+
+@router.get("/api/imports/{import_id}/errors", response_class=JSONResponse)
+async def import_errors_api(
+    import_id: int,
+    db: Session = Depends(get_db),
+    field: Optional[str] = Query(None),
+    source: Optional[str] = Query(None),
+    search: Optional[str] = Query(None),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(50, ge=1, le=1000)
+):
+    """Page through the row errors of an import as JSON."""
+    if db.query(ImportRecord.id).filter(ImportRecord.id == import_id).first() is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    
+    errors, total = get_import_errors(
+        db,
+        import_id,
+        skip=(page - 1) * per_page,
+        limit=per_page,
+        field=field,
+        source=source,
+        search=search
+    )
+    return {
+        "import_id": import_id,
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "errors": [serialize_import_error(error) for error in errors]
+    }
@@ -7,9 +7,12 @@ from typing import Optional
 from datetime import date, timedelta
 import pandas as pd
 import io
-from app.database import get_db
-from app.services.asset_service import get_assets
+from app.config import settings
+from app.database import get_db, SessionLocal
+from app.services.asset_service import iter_assets
+from app.services.export_service import COLUMNAR_FORMATS, asset_batches, asset_export_schema, write_columnar
 from app.models.asset import Asset
+from app.models.asset_rows import AssetRows, AssetReportRow
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/templates")
@@ -25,7 +28,7 @@ async def refresh_schedule_report(
     today = date.today()
     due_date = today + timedelta(days=days)
     
-    assets = db.query(Asset).filter(
+    assets = db.query(AssetRows(AssetReportRow)).filter(
         Asset.refresh_due_date.isnot(None),
         Asset.refresh_due_date <= due_date,
         Asset.status == "active"
@@ -36,7 +39,8 @@ async def refresh_schedule_report(
         {
             "request": request,
             "assets": assets,
-            "days": days
+            "days": days,
+            "today": today
         }
     )
 
@@ -48,7 +52,7 @@ async def department_inventory_report(
     department: Optional[str] = None
 ):
     """Department inventory report."""
-    query = db.query(Asset).filter(Asset.status == "active")
+    query = db.query(AssetRows(AssetReportRow)).filter(Asset.status == "active")
     
     if department:
         query = query.filter(Asset.department == department)
@@ -79,7 +83,7 @@ async def unassigned_report(
     db: Session = Depends(get_db)
 ):
     """Unassigned assets report."""
-    assets = db.query(Asset).filter(
+    assets = db.query(AssetRows(AssetReportRow)).filter(
         Asset.status == "active",
         (Asset.assigned_user_name.is_(None) | (Asset.assigned_user_name == ""))
     ).order_by(Asset.department, Asset.asset_tag).all()
@@ -96,17 +100,36 @@ async def unassigned_report(
 @router.get("/assets/export")
 async def export_assets(
     db: Session = Depends(get_db),
-    format: str = Query("xlsx", pattern="^(xlsx|csv)$"),
+    format: str = Query("xlsx", pattern="^(xlsx|csv|parquet|arrow)$"),
     search: Optional[str] = None,
     status: Optional[str] = None,
     department: Optional[str] = None
 ):
-    """Export assets to XLSX or CSV."""
-    assets, _ = get_assets(db, skip=0, limit=10000, search=search, status=status, department=department)
+    """Export assets to XLSX, CSV, Parquet or Arrow IPC."""
+    if format in COLUMNAR_FORMATS:
+        media_type, suffix = COLUMNAR_FORMATS[format]
+        
+        def body():
+            # The request's session is closed before a streamed body is sent
+            export_db = SessionLocal()
+            try:
+                batches = asset_batches(
+                    export_db, settings.export_batch_rows,
+                    search=search, status=status, department=department
+                )
+                yield from write_columnar(batches, asset_export_schema(), format)
+            finally:
+                export_db.close()
+        
+        return StreamingResponse(
+            body(),
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename=assets_export{suffix}"}
+        )
     
     # Convert to DataFrame
     data = []
-    for asset in assets:
+    for asset in iter_assets(db, search=search, status=status, department=department):
         data.append({
             "Asset Tag": asset.asset_tag,
             "Computer Name": asset.computer_name,
@@ -8,7 +8,8 @@ from datetime import date
 from app.database import get_db
 from app.models.verification import VerificationCampaign, VerificationRecord
 from app.models.asset import Asset
-from app.services.asset_service import get_assets
+from app.models.asset_rows import CampaignAssetRow
+from app.services.asset_service import count_assets, iter_assets
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/templates")
@@ -47,20 +48,14 @@ async def create_campaign(
 ):
     """Create new verification campaign."""
     # Get assets for the campaign
-    assets, _ = get_assets(
-        db,
-        skip=0,
-        limit=10000,
-        department=department if department else None,
-        status="active"
-    )
+    asset_count, _ = count_assets(db, department=department if department else None, status="active")
     
     campaign = VerificationCampaign(
         name=name,
         department=department if department else None,
         due_date=date.fromisoformat(due_date) if due_date else None,
         created_by="user",  # TODO: Get from session
-        total_count=len(assets),
+        total_count=asset_count,
         status="active"
     )
     db.add(campaign)
@@ -82,10 +77,7 @@ async def campaign_detail(
         raise HTTPException(status_code=404, detail="Campaign not found")
     
     # Get assets for verification
-    if campaign.department:
-        assets, _ = get_assets(db, skip=0, limit=10000, department=campaign.department, status="active")
-    else:
-        assets, _ = get_assets(db, skip=0, limit=10000, status="active")
+    assets = list(iter_assets(db, department=campaign.department, status="active", row_type=CampaignAssetRow))
     
     # Get verification records
     verified_asset_ids = {
@@ -0,0 +1,45 @@
+"""Import analysis service combining validation and delta detection."""
+from typing import List, Dict, Any
+from sqlalchemy.orm import Session
+from app.models.asset import compute_content_hash
+from app.services.validation_service import validate_rows, validation_result
+from app.services.delta_service import load_existing_assets, classify_row
+
+
+def analyze_import(transformed_data: List[Dict[str, Any]], db: Session) -> Dict[str, Any]:
+    """Validate imported rows and detect deltas in a single pass.
+    
+    Incoming asset tags are resolved against the database in batched
+    IN (...) lookups, so the cost grows with the upload rather than the
+    size of the assets table. Validation errors include asset tags that
+    appear more than once in the upload.
+    
+    Returns:
+        {
+            "validation": {...},  # Same shape as validate_import_data
+            "deltas": {...},      # Same shape as detect_deltas
+        }
+    """
+    row_hashes = [compute_content_hash(row) for row in transformed_data]
+    existing_assets = load_existing_assets(db, transformed_data, row_hashes)
+    
+    # The validation rules run over the whole upload at once
+    errors = validate_rows(transformed_data, existing_assets)
+    
+    new_assets = []
+    modified_assets = []
+    unchanged_assets = []
+    
+    for row, row_hash in zip(transformed_data, row_hashes):
+        asset_tag = row.get("asset_tag")
+        existing = existing_assets.get(asset_tag) if asset_tag else None
+        classify_row(row, row_hash, existing, new_assets, modified_assets, unchanged_assets)
+    
+    return {
+        "validation": validation_result(transformed_data, errors),
+        "deltas": {
+            "new": new_assets,
+            "modified": modified_assets,
+            "unchanged": unchanged_assets
+        }
+    }
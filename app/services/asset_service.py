@@ -1,9 +1,20 @@
 """Asset service for CRUD operations."""
+import base64
+import binascii
+import json
+import re
+import threading
+from collections import OrderedDict
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
-from typing import Optional, List, Dict, Any
+from sqlalchemy import or_, func, select, literal_column
+from sqlalchemy.sql import Subquery
+from typing import Optional, List, Dict, Any, Iterator, Tuple, Type, NamedTuple, Union
 from datetime import date, datetime, timedelta
+from app.config import settings
 from app.models.asset import Asset
+from app.models.asset_rows import AssetRows
+from app.models.asset_search import asset_search
+from app.models.data_version import get_data_version
 from app.schemas.asset import AssetCreate, AssetUpdate
 
 
@@ -17,21 +28,54 @@ def get_asset_by_tag(db: Session, asset_tag: str) -> Optional[Asset]:
     return db.query(Asset).filter(Asset.asset_tag == asset_tag).first()
 
 
-def get_assets(
-    db: Session,
-    skip: int = 0,
-    limit: int = 50,
+# Tokens as the search index's unicode61 tokenizer splits them
+SEARCH_TOKEN = re.compile(r"[^\W_]+")
+
+
+def search_matches(db: Session, search: Optional[str]) -> Optional[Subquery]:
+    """Return the ids and ranks of assets matching a search, from the
+    full-text index, or None where the index can't serve it.
+    
+    Every word of the search must be the start of a word in one of the
+    indexed fields: "mcgon pa" finds "McGonagle, Paul", and "wjbkpw" finds
+    WJBKPWLT0RDJ but "0rdj" does not. Databases other than SQLite have no
+    index, and searches without letters or digits can't use it; those
+    fall back to substring matching in filter_assets.
+    """
+    tokens = _search_tokens(db, search)
+    if not tokens:
+        return None
+    match = " ".join(f'"{token}"*' for token in tokens)
+    # rank + 0: FTS5 reads a constraint on the bare rank column, such as
+    # the keyset seek's rank = ?, as a ranking function to use
+    return select(asset_search.c.rowid, (asset_search.c.rank + 0).label("rank")).where(
+        literal_column(asset_search.name).match(match)
+    ).subquery("asset_matches")
+
+
+def _search_tokens(db: Session, search: Optional[str]) -> List[str]:
+    """The words of a search the full-text index can match (none where it
+    can't serve the search)."""
+    if not search or db.get_bind().dialect.name != "sqlite":
+        return []
+    return SEARCH_TOKEN.findall(search)
+
+
+def filter_assets(
+    query,
     search: Optional[str] = None,
     status: Optional[str] = None,
     department: Optional[str] = None,
-    sort_by: str = "asset_tag",
-    order: str = "asc"
-) -> tuple[List[Asset], int]:
-    """Get assets with filtering and pagination."""
-    query = db.query(Asset)
-    
-    # Apply filters
-    if search:
+    matches: Optional[Subquery] = None
+):
+    """Apply the asset list filters to a query or select() over Asset.
+    
+    With matches (from search_matches), the search is answered by the
+    full-text index; otherwise search is a substring match.
+    """
+    if matches is not None:
+        query = query.join(matches, matches.c.rowid == Asset.id)
+    elif search:
         search_term = f"%{search}%"
         query = query.filter(
             or_(
@@ -48,21 +92,239 @@ def get_assets(
     
     if department:
         query = query.filter(Asset.department == department)
+    return query
+
+
+# Columns the asset list can be sorted by
+ASSET_SORT_COLUMNS = (
+    "asset_tag",
+    "computer_name",
+    "department",
+    "assigned_user_name",
+    "status",
+    "device_type",
+    "refresh_due_date",
+    "last_verified_at",
+)
+
+# Sort name in cursors for searches ordered by relevance
+RANK_SORT = "rank"
+
+
+# Asset counts by filters and limit, with the assets data version they
+# were counted at: (version, count, approximate)
+_asset_counts: "OrderedDict[Tuple[Any, ...], Tuple[int, int, bool]]" = OrderedDict()
+_asset_counts_lock = threading.Lock()
+
+
+def count_assets(
+    db: Session,
+    search: Optional[str] = None,
+    status: Optional[str] = None,
+    department: Optional[str] = None,
+    limit: Optional[int] = None
+) -> Tuple[int, bool]:
+    """Count the assets matching the asset list filters.
     
-    # Get total count before pagination
-    total = query.count()
+    Counts are cached by filters until the assets change (their data
+    version goes up), so paging through a list counts it once. With
+    limit, counting stops past limit rows. Returns the count and whether
+    it is approximate: (limit, True) when more than limit match.
+    """
+    key = (_search_key(db, search), status or None, department or None, limit)
+    version = get_data_version(db, Asset.__tablename__)
+    with _asset_counts_lock:
+        cached = _asset_counts.get(key)
+        if cached is not None and cached[0] == version:
+            _asset_counts.move_to_end(key)
+            return cached[1], cached[2]
     
-    # Apply sorting
-    sort_column = getattr(Asset, sort_by, Asset.asset_tag)
-    if order == "desc":
-        query = query.order_by(sort_column.desc())
+    query = filter_assets(
+        db.query(Asset), search=search, status=status, department=department,
+        matches=search_matches(db, search)
+    )
+    if limit is None:
+        total, approximate = query.count(), False
     else:
-        query = query.order_by(sort_column.asc())
+        total = query.with_entities(Asset.id).limit(limit + 1).count()
+        total, approximate = min(total, limit), total > limit
     
-    # Apply pagination
-    assets = query.offset(skip).limit(limit).all()
+    with _asset_counts_lock:
+        _asset_counts[key] = (version, total, approximate)
+        _asset_counts.move_to_end(key)
+        while len(_asset_counts) > settings.asset_count_cache_size:
+            _asset_counts.popitem(last=False)
+    return total, approximate
+
+
+def _search_key(db: Session, search: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Normalize a search for the count cache: searches the index serves
+    are equal if they have the same words in any case."""
+    if not search:
+        return None
+    tokens = _search_tokens(db, search)
+    if tokens:
+        return ("match", *(token.lower() for token in tokens))
+    return ("like", search)
+
+
+def get_assets(
+    db: Session,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    search: Optional[str] = None,
+    status: Optional[str] = None,
+    department: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    order: str = "asc",
+    row_type: Optional[Type[NamedTuple]] = None
+) -> Dict[str, Any]:
+    """Get one page of assets with filtering and keyset pagination.
+    
+    Searches are ranked by relevance unless sort_by is given; otherwise
+    assets are sorted by sort_by (asset tag if it isn't one of
+    ASSET_SORT_COLUMNS), ties broken by id. Pages are found by seeking to
+    the sort key of the row a cursor names, so every page costs the
+    same. Returns the page's assets (Asset instances, or row_type rows of
+    just the columns a view shows, see app.models.asset_rows), the total
+    matching (from count_assets, capped at settings.asset_count_limit
+    with total_approximate set past it), and opaque next_cursor and
+    prev_cursor values for the neighbouring pages (None where there is
+    no such page).
+    
+    Raises:
+        ValueError: if cursor is malformed or was made for another sort
+    """
+    matches = search_matches(db, search)
+    query = filter_assets(
+        _asset_query(db, row_type), search=search, status=status, department=department, matches=matches
+    )
+    total, total_approximate = count_assets(
+        db, search=search, status=status, department=department, limit=settings.asset_count_limit
+    )
+    
+    if not sort_by and matches is not None:
+        sort_name, key, nullable = RANK_SORT, matches.c.rank, False
+    else:
+        sort_name = sort_by if sort_by in ASSET_SORT_COLUMNS else "asset_tag"
+        key, nullable = getattr(Asset, sort_name), Asset.__table__.c[sort_name].nullable
+    descending = order == "desc"
+    
+    direction, position = "after", None
+    if cursor:
+        direction, position = decode_cursor(cursor, sort_name, order, key.type.python_type)
+    
+    # Pages before a cursor are the rows after it in the reverse order
+    rows = _seek(query, key, nullable, descending != (direction == "before"), position, limit + 1)
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == "before":
+        rows.reverse()
+    has_next = more if direction == "after" else position is not None
+    has_prev = position is not None if direction == "after" else more
+    
+    return {
+        "assets": [asset for asset, _ in rows],
+        "total": total,
+        "total_approximate": total_approximate,
+        "next_cursor": encode_cursor(sort_name, order, "after", rows[-1]) if rows and has_next else None,
+        "prev_cursor": encode_cursor(sort_name, order, "before", rows[0]) if rows and has_prev else None,
+    }
+
+
+def iter_assets(
+    db: Session,
+    batch_size: int = 1000,
+    search: Optional[str] = None,
+    status: Optional[str] = None,
+    department: Optional[str] = None,
+    row_type: Optional[Type[NamedTuple]] = None
+) -> Iterator[Union[Asset, NamedTuple]]:
+    """Yield every asset matching the filters (as Asset instances, or
+    row_type rows), in asset tag order, loading batch_size at a time by
+    keyset."""
+    query = filter_assets(
+        _asset_query(db, row_type), search=search, status=status, department=department,
+        matches=search_matches(db, search)
+    )
+    position = None
+    while True:
+        rows = _seek(query, Asset.asset_tag, False, False, position, batch_size)
+        for asset, _ in rows:
+            yield asset
+        if len(rows) < batch_size:
+            return
+        position = (rows[-1][1], rows[-1][0].id)
+
+
+def _asset_query(db: Session, row_type: Optional[Type[NamedTuple]] = None):
+    """Query assets as Asset instances, or as row_type rows."""
+    return db.query(Asset if row_type is None else AssetRows(row_type))
+
+
+def encode_cursor(sort_name: str, order: str, direction: str, row: Tuple[Any, Any]) -> str:
+    """Make an opaque cursor for the page after or before a row (an asset,
+    or an asset row, and its sort key value)."""
+    asset, value = row
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    payload = json.dumps([sort_name, order, direction, value, asset.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_name: str, order: str, value_type: type) -> Tuple[str, Tuple[Any, int]]:
+    """Return the direction and the (sort key value, id) position of a
+    cursor made for this sort.
+    
+    Raises:
+        ValueError: if cursor is malformed or was made for another sort
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, cursor_order, direction, value, asset_id = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    if (cursor_sort, cursor_order) != (sort_name, order) or direction not in ("after", "before"):
+        raise ValueError("Cursor is for a different sort order")
+    if value is not None and value_type in (date, datetime):
+        value = value_type.fromisoformat(value)
+    return direction, (value, int(asset_id))
+
+
+def _seek(query, key, nullable: bool, descending: bool, position: Optional[Tuple[Any, int]], limit: int):
+    """Return up to limit (asset, key value) rows following position (a
+    (key value, id) pair, or None for the start) in key, id order. The
+    assets are whatever the query selects: Asset instances or asset rows.
+    
+    NULL keys sort lowest. The rows are read as consecutive segments (the
+    rest of the position's key value, then the greater or lesser keys,
+    and the NULL keys), each a query that seeks on the key's index, so
+    the cost doesn't grow with the position.
+    """
+    by_id = Asset.id.desc() if descending else Asset.id.asc()
+    by_key = (key.desc(), by_id) if descending else (key.asc(), by_id)
+    missing = query.filter(key.is_(None)).order_by(by_id) if nullable else None
+    
+    if position is None:
+        present = (query.filter(key.isnot(None)) if nullable else query).order_by(*by_key)
+        segments = [present, missing] if descending else [missing, present]
+    else:
+        value, asset_id = position
+        following = Asset.id < asset_id if descending else Asset.id > asset_id
+        if value is None:
+            segments = [missing.filter(following)]
+            if not descending:
+                segments.append(query.filter(key.isnot(None)).order_by(*by_key))
+        else:
+            ties = query.filter(key == value, following).order_by(by_id)
+            beyond = query.filter(key < value if descending else key > value).order_by(*by_key)
+            segments = [ties, beyond, missing if descending else None]
     
-    return assets, total
+    rows = []
+    for segment in segments:
+        if segment is not None and len(rows) < limit:
+            rows.extend(tuple(row) for row in segment.add_columns(key).limit(limit - len(rows)).all())
+    return rows
 
 
 def create_asset(db: Session, asset: AssetCreate) -> Asset:
@@ -0,0 +1,168 @@
+"""Batch imports of several workbooks and sheets.
+
+Regional offices send one workbook each, often with one sheet per site.
+A batch import takes any number of uploaded workbooks and the sheets to
+read from each, parses the sheets in parallel worker processes (parsing
+is CPU-bound, so threads would not overlap), and merges the transformed
+rows into a single ImportRecord with counters for every sheet.
+
+When the same asset tag appears in more than one sheet, the last sheet in
+batch order wins: earlier rows for that tag are dropped before the commit
+and counted as duplicates of their sheet.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+import pandas as pd
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.upload import UploadAlias
+from app.validators.excel_parser import list_sheet_names, get_column_names
+from app.validators.column_detector import detect_column_mapping
+from app.validators.column_profiler import profile_columns
+from app.services.import_service import transform_dataframe
+from app.services.parse_cache import load_parsed_upload
+from app.services.upload_service import upload_path
+
+
+def resolve_batch_sources(
+    aliases: List[UploadAlias],
+    sheet_selection: Optional[Dict[str, List[str]]] = None
+) -> List[Dict[str, Any]]:
+    """List the (workbook, sheet) sources of a batch in import order.
+    
+    sheet_selection maps a filename to the sheets to import from it;
+    workbooks it does not name contribute all of their sheets.
+    
+    Raises:
+        ValueError: if a selection names a file outside the batch or a
+            sheet the workbook does not have
+    """
+    sheet_selection = sheet_selection or {}
+    unknown_files = set(sheet_selection) - {alias.filename for alias in aliases}
+    if unknown_files:
+        raise ValueError(f"Sheets selected for files not in the batch: {', '.join(sorted(unknown_files))}")
+    
+    sources = []
+    for alias in aliases:
+        path = upload_path(alias)
+        available = list_sheet_names(path)
+        selected = sheet_selection.get(alias.filename) or available
+        missing = [sheet for sheet in selected if sheet not in available]
+        if missing:
+            raise ValueError(f"{alias.filename} has no sheet named {', '.join(missing)}")
+        
+        for sheet_name in selected:
+            sources.append({
+                "path": str(path),
+                "filename": alias.filename,
+                "content_hash": alias.content_hash,
+                "sheet_name": sheet_name,
+                # The first sheet shares its parse cache entry with single-file imports
+                "sheet": 0 if sheet_name == available[0] else sheet_name
+            })
+    return sources
+
+
+def batch_content_hash(sources: List[Dict[str, Any]]) -> str:
+    """Identify a batch by the contents and sheets it imports, in order."""
+    key = json.dumps([[source["content_hash"], source["sheet_name"]] for source in sources])
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def parse_batch_sources(
+    sources: List[Dict[str, Any]],
+    columns: Optional[List[str]] = None
+) -> List[pd.DataFrame]:
+    """Parse every source's sheet, in up to settings.parse_processes processes
+    (no more than there are CPUs).
+    
+    columns limits the read to those columns, as load_parsed_upload does.
+    Sheets already in the parse cache are read from it. Workers are
+    spawned rather than forked, since the caller runs on a thread of a
+    process holding database connections.
+    """
+    paths = [Path(source["path"]) for source in sources]
+    sheets = [source["sheet"] for source in sources]
+    workers = min(settings.parse_processes, os.cpu_count() or 1, len(sources))
+    if workers <= 1:
+        return [load_parsed_upload(path, sheet, columns) for path, sheet in zip(paths, sheets)]
+    
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        return list(pool.map(load_parsed_upload, paths, sheets, repeat(columns)))
+
+
+def merge_batch_sources(
+    sources: List[Dict[str, Any]],
+    frames: List[pd.DataFrame],
+    column_mapping: Dict[str, str]
+) -> List[Dict[str, Any]]:
+    """Transform each source's sheet and drop rows superseded by a later sheet.
+    
+    An empty column_mapping detects each sheet's mapping from its headers
+    and a profile of its first settings.profile_sample_rows rows.
+    
+    Returns the sources in order, each with its column_mapping, the rows
+    to commit, their 1-based row_numbers within the sheet, and the number
+    of duplicates dropped, as commit_batch_import expects.
+    """
+    merged = []
+    last_source: Dict[str, int] = {}
+    for index, (source, df) in enumerate(zip(sources, frames)):
+        mapping = column_mapping or {
+            field: column
+            for field, column in detect_column_mapping(
+                get_column_names(df),
+                profile_columns(df.head(settings.profile_sample_rows))
+            ).items()
+            if column
+        }
+        rows = transform_dataframe(df, mapping)
+        for row in rows:
+            if row.get("asset_tag"):
+                last_source[row["asset_tag"]] = index
+        merged.append({
+            "filename": source["filename"],
+            "sheet_name": source["sheet_name"],
+            "content_hash": source["content_hash"],
+            "column_mapping": mapping,
+            "rows": rows
+        })
+    
+    for index, source in enumerate(merged):
+        kept_rows = []
+        row_numbers = []
+        for row_number, row in enumerate(source["rows"], start=1):
+            asset_tag = row.get("asset_tag")
+            if asset_tag and last_source[asset_tag] != index:
+                continue
+            kept_rows.append(row)
+            row_numbers.append(row_number)
+        source["duplicates"] = len(source["rows"]) - len(kept_rows)
+        source["rows"] = kept_rows
+        source["row_numbers"] = row_numbers
+    return merged
+
+
+def load_batch_aliases(db: Session, filenames: List[str]) -> List[UploadAlias]:
+    """Return the upload aliases for filenames in the given order.
+    
+    Raises:
+        ValueError: if a filename has not been uploaded
+    """
+    aliases = {
+        alias.filename: alias
+        for alias in db.query(UploadAlias).filter(UploadAlias.filename.in_(filenames))
+    }
+    missing = [filename for filename in filenames if filename not in aliases]
+    if missing:
+        raise ValueError(f"Files not uploaded: {', '.join(missing)}")
+    return [aliases[filename] for filename in filenames]
@@ -1,8 +1,17 @@
 """Delta detection service for comparing imported data with existing assets."""
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Mapping
+from pydantic import ValidationError
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from app.models.asset import Asset
-from app.services.asset_service import get_asset_by_tag
+from app.models.asset import Asset, FINGERPRINT_FIELDS, compute_content_hash
+from app.schemas.asset import AssetCreate
+
+# Fields an import may overwrite on an existing asset, and so the fields
+# compared to decide whether an imported row modifies it
+COMPARED_FIELDS = sorted(set(AssetCreate.model_fields) - {"asset_tag"})
+
+# Asset tags resolved per IN (...) lookup
+LOOKUP_BATCH_SIZE = 500
 
 
 def detect_deltas(transformed_data: List[Dict[str, Any]], db: Session) -> Dict[str, List[Dict[str, Any]]]:
@@ -19,36 +28,13 @@ def detect_deltas(transformed_data: List[Dict[str, Any]], db: Session) -> Dict[s
     modified_assets = []
     unchanged_assets = []
     
-    # Load all existing assets keyed by asset_tag
-    existing_assets = {}
-    for asset in db.query(Asset).all():
-        if asset.asset_tag:
-            existing_assets[asset.asset_tag] = asset
+    row_hashes = [compute_content_hash(row_data) for row_data in transformed_data]
+    existing_assets = load_existing_assets(db, transformed_data, row_hashes)
     
-    for row_data in transformed_data:
+    for row_data, row_hash in zip(transformed_data, row_hashes):
         asset_tag = row_data.get("asset_tag")
-        
-        if not asset_tag:
-            # No asset tag, treat as new
-            new_assets.append(row_data)
-            continue
-        
-        existing = existing_assets.get(asset_tag)
-        
-        if not existing:
-            # New asset
-            new_assets.append(row_data)
-        else:
-            # Check for modifications
-            changes = _compare_asset(existing, row_data)
-            if changes:
-                modified_assets.append({
-                    "row_data": row_data,
-                    "existing": existing,
-                    "changes": changes
-                })
-            else:
-                unchanged_assets.append(row_data)
+        existing = existing_assets.get(asset_tag) if asset_tag else None
+        classify_row(row_data, row_hash, existing, new_assets, modified_assets, unchanged_assets)
     
     return {
         "new": new_assets,
@@ -57,19 +43,110 @@ def detect_deltas(transformed_data: List[Dict[str, Any]], db: Session) -> Dict[s
     }
 
 
-def _compare_asset(existing: Asset, new_data: Dict[str, Any]) -> Dict[str, Tuple[Any, Any]]:
-    """Compare existing asset with new data and return changes."""
-    changes = {}
+def load_existing_assets(
+    db: Session,
+    transformed_data: List[Dict[str, Any]],
+    row_hashes: List[str]
+) -> Dict[str, Any]:
+    """Resolve the rows' asset tags against existing assets, keyed by asset_tag.
+    
+    Only asset_tag and content_hash are fetched for every tag. The compared
+    fields are loaded just for assets whose stored hash differs from an
+    incoming row, or whose row sets fields the hash does not cover, so
+    re-importing unchanged data reads almost nothing.
+    """
+    asset_tags = {row_data.get("asset_tag") for row_data in transformed_data if row_data.get("asset_tag")}
+    existing = lookup_assets_by_tag(db, asset_tags, [Asset.id, Asset.asset_tag, Asset.content_hash])
+    
+    changed_tags = {
+        row_data["asset_tag"]
+        for row_data, row_hash in zip(transformed_data, row_hashes)
+        if row_data.get("asset_tag") in existing
+        and not _hash_matches(existing[row_data["asset_tag"]], row_data, row_hash)
+    }
+    existing.update(lookup_assets_by_tag(db, changed_tags))
+    return existing
+
+
+def lookup_assets_by_tag(db: Session, asset_tags: Iterable[str], columns: Optional[List[Any]] = None) -> Dict[str, Any]:
+    """Load columns (by default the compared fields) of assets keyed by asset_tag."""
+    if columns is None:
+        columns = [Asset.id, Asset.asset_tag, Asset.content_hash] + [getattr(Asset, field) for field in COMPARED_FIELDS]
+    asset_tags = list(asset_tags)
+    existing = {}
+    for start in range(0, len(asset_tags), LOOKUP_BATCH_SIZE):
+        batch = asset_tags[start:start + LOOKUP_BATCH_SIZE]
+        for row in db.execute(select(*columns).where(Asset.asset_tag.in_(batch))):
+            existing[row.asset_tag] = row
+    return existing
+
+
+def classify_row(
+    row_data: Dict[str, Any],
+    row_hash: str,
+    existing: Optional[Any],
+    new_assets: List[Dict[str, Any]],
+    modified_assets: List[Dict[str, Any]],
+    unchanged_assets: List[Dict[str, Any]]
+) -> None:
+    """Append row_data to the delta bucket it belongs in.
+    
+    existing is the matching asset from load_existing_assets, or None when
+    the row has no tag or the tag is unknown.
+    """
+    if existing is None:
+        # New asset (rows without an asset tag are treated as new)
+        new_assets.append(row_data)
+        return
+    
+    if _hash_matches(existing, row_data, row_hash):
+        unchanged_assets.append(row_data)
+        return
     
-    # Fields to compare
-    fields_to_compare = [
-        "department", "assigned_user_name", "assigned_user_id",
-        "status", "operating_system", "notes", "computer_name"
-    ]
+    # Check for modifications
+    changes = _compare_asset(existing, row_data)
+    if changes:
+        modified_assets.append({
+            "row_data": row_data,
+            "existing": existing,
+            "changes": changes
+        })
+    else:
+        unchanged_assets.append(row_data)
+
+
+def _hash_matches(existing: Any, row_data: Dict[str, Any], row_hash: str) -> bool:
+    """Whether the stored hash shows the row would change nothing, which
+    holds only if the row sets no fields beyond those the hash covers."""
+    return existing.content_hash == row_hash and all(
+        field in FINGERPRINT_FIELDS for field in row_data if field in COMPARED_FIELDS
+    )
+
+
+def _compare_asset(existing: Any, new_data: Dict[str, Any]) -> Dict[str, Tuple[Any, Any]]:
+    """Compare existing asset with new data and return changes.
+    
+    Compares the fields the row sets, with values validated the way the
+    commit validates them, so the commit writes exactly these changes.
+    """
+    try:
+        values = AssetCreate(**new_data).model_dump()
+    except ValidationError:
+        values = new_data
+    return changed_fields(existing._mapping, values, [field for field in new_data if field in COMPARED_FIELDS])
+
+
+def changed_fields(
+    existing_values: Mapping[str, Any],
+    new_values: Mapping[str, Any],
+    fields: Iterable[str]
+) -> Dict[str, Tuple[Any, Any]]:
+    """Return {field: (existing value, new value)} for the fields that differ."""
+    changes = {}
     
-    for field in fields_to_compare:
-        existing_value = getattr(existing, field, None)
-        new_value = new_data.get(field)
+    for field in fields:
+        existing_value = existing_values.get(field)
+        new_value = new_values.get(field)
         
         # Normalize None/empty values
         existing_value = existing_value if existing_value else None
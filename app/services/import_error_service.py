@@ -0,0 +1,86 @@
+"""Storage and retrieval of the row errors of imports.
+
+Errors are written to import_errors with bulk inserts as each chunk of an
+import is committed, so a file with many bad rows never builds one large
+value, and are read back a page at a time.
+"""
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy import insert, func
+from sqlalchemy.orm import Session
+from app.models.import_error import ImportRowError
+
+
+def store_import_errors(
+    db: Session,
+    import_id: int,
+    errors: List[Dict[str, Any]],
+    source: Optional[str] = None
+) -> None:
+    """Insert row errors ({"row", "message", optional "field"}) for an import."""
+    if not errors:
+        return
+    db.execute(insert(ImportRowError), [
+        {
+            "import_id": import_id,
+            "row": error.get("row"),
+            "source": source,
+            "field": error.get("field"),
+            "message": error["message"]
+        }
+        for error in errors
+    ])
+
+
+def get_import_errors(
+    db: Session,
+    import_id: int,
+    skip: int = 0,
+    limit: int = 50,
+    field: Optional[str] = None,
+    source: Optional[str] = None,
+    search: Optional[str] = None
+) -> Tuple[List[ImportRowError], int]:
+    """Get an import's errors in row order, with filtering and pagination."""
+    query = db.query(ImportRowError).filter(ImportRowError.import_id == import_id)
+    
+    # Apply filters
+    if field:
+        query = query.filter(ImportRowError.field == field)
+    
+    if source:
+        query = query.filter(ImportRowError.source == source)
+    
+    if search:
+        query = query.filter(ImportRowError.message.ilike(f"%{search}%"))
+    
+    # Get total count before pagination
+    total = query.count()
+    
+    errors = query.order_by(
+        ImportRowError.row,
+        ImportRowError.id
+    ).offset(skip).limit(limit).all()
+    
+    return errors, total
+
+
+def import_error_facets(db: Session, import_id: int) -> Dict[str, List[Tuple[Optional[str], int]]]:
+    """Error counts of an import by field and by source, for filtering."""
+    facets = {}
+    for name, column in (("fields", ImportRowError.field), ("sources", ImportRowError.source)):
+        facets[name] = [
+            tuple(row) for row in db.query(column, func.count(ImportRowError.id)).filter(
+                ImportRowError.import_id == import_id
+            ).group_by(column).order_by(column).all()
+        ]
+    return facets
+
+
+def serialize_import_error(error: ImportRowError) -> Dict[str, Any]:
+    """JSON form of an import error."""
+    return {
+        "row": error.row,
+        "source": error.source,
+        "field": error.field,
+        "message": error.message
+    }
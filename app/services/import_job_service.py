@@ -0,0 +1,489 @@
+"""Background import jobs.
+
+Committing an import parses, transforms and writes every row, which can
+take far longer than a proxy will hold a request open. The commit step
+records an ImportJob and returns; a bounded thread pool runs the job and
+the UI polls its status, which any worker process can serve.
+
+A running job records the process that owns it (worker_id: host, pid and,
+where /proc exposes it, a token derived from the boot and the process start
+time) and a heartbeat_at that a side thread refreshes every
+import_heartbeat_seconds, along with rows_processed, through its own short
+session. On startup, and every import_sweep_seconds after, each worker
+fails running jobs whose owner is gone: a process on this host whose pid no
+longer carries the recorded start token, or else a heartbeat older than
+import_stale_seconds. The token keeps a reused pid (a sibling worker after
+a container restart) from passing for the dead owner. On SQLite the import
+transaction holds the write lock while it commits, so heartbeats written
+then wait for it and may be skipped; the owner check keeps those jobs
+alive, and the process running the job serves its row progress from memory.
+"""
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Set
+from sqlalchemy import text, or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.import_job import ImportJob
+from app.services.import_service import (
+    transform_dataframe,
+    commit_import,
+    commit_batch_import,
+    canonical_mapping,
+    batch_display_name,
+    mapped_columns,
+)
+from app.services.batch_import_service import batch_content_hash, parse_batch_sources, merge_batch_sources
+from app.services.parse_cache import load_parsed_upload
+from app.services.upload_service import release_job_uploads
+
+logger = logging.getLogger(__name__)
+
+# Job statuses that will not change again
+FINISHED_STATUSES = ("completed", "failed")
+
+# PostgreSQL advisory lock key held while an import commits
+IMPORT_LOCK_KEY = 7_301_001
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_shutting_down = False
+
+# Serializes commits so two imports cannot race on the unique asset_tag
+_commit_lock = threading.Lock()
+
+# Rows committed so far for jobs this process is running, keyed by job id
+_progress: Dict[int, int] = {}
+
+# Jobs this process has claimed and not yet finished
+_active_jobs: Set[int] = set()
+
+# Stops the periodic sweep for jobs whose owner is gone
+_sweep_stop = threading.Event()
+_sweeper: Optional[threading.Thread] = None
+
+
+def enqueue_import_job(
+    db: Session,
+    file_path: Path,
+    column_mapping: Dict[str, str],
+    uploaded_by: str = "system",
+    filename: Optional[str] = None,
+    content_hash: Optional[str] = None,
+    changed_only: bool = False
+) -> ImportJob:
+    """Record an import job for an uploaded file and queue it for a worker.
+    
+    If a job for the same content_hash, mapping and changed_only mode is
+    already queued or running, that job is returned instead of queueing
+    another.
+    """
+    if content_hash:
+        active_job = db.query(ImportJob).filter(
+            ImportJob.content_hash == content_hash,
+            ImportJob.column_mapping == canonical_mapping(column_mapping),
+            ImportJob.changed_only.is_(True) if changed_only else ImportJob.changed_only.isnot(True),
+            ImportJob.status.in_(("queued", "running"))
+        ).first()
+        if active_job:
+            return active_job
+    
+    job = ImportJob(
+        file_path=str(file_path),
+        filename=filename or file_path.name,
+        column_mapping=canonical_mapping(column_mapping),
+        content_hash=content_hash,
+        uploaded_by=uploaded_by,
+        changed_only=changed_only,
+        status="queued",
+        phase="queued"
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    
+    _submit(job.id)
+    return job
+
+
+def enqueue_batch_import_job(
+    db: Session,
+    sources: List[Dict[str, Any]],
+    column_mapping: Dict[str, str],
+    uploaded_by: str = "system",
+    changed_only: bool = False
+) -> ImportJob:
+    """Record a batch import of several workbook sheets and queue it.
+    
+    sources come from resolve_batch_sources. An empty column_mapping
+    detects each sheet's mapping from its headers. As with single files,
+    an identical batch already queued or running is returned instead.
+    """
+    content_hash = batch_content_hash(sources)
+    active_job = db.query(ImportJob).filter(
+        ImportJob.content_hash == content_hash,
+        ImportJob.column_mapping == canonical_mapping(column_mapping),
+        ImportJob.changed_only.is_(True) if changed_only else ImportJob.changed_only.isnot(True),
+        ImportJob.status.in_(("queued", "running"))
+    ).first()
+    if active_job:
+        return active_job
+    
+    job = ImportJob(
+        file_path=sources[0]["path"],
+        filename=batch_display_name(sources),
+        column_mapping=canonical_mapping(column_mapping),
+        content_hash=content_hash,
+        sources=json.dumps(sources),
+        uploaded_by=uploaded_by,
+        changed_only=changed_only,
+        status="queued",
+        phase="queued"
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    
+    _submit(job.id)
+    return job
+
+
+def get_job_status(db: Session, job_id: int) -> Optional[Dict[str, Any]]:
+    """Return a job's status and progress, or None if it does not exist."""
+    job = db.get(ImportJob, job_id)
+    if job is None:
+        return None
+    
+    rows_processed = _progress.get(job.id, job.rows_processed or 0)
+    percent = 0
+    if job.status == "completed":
+        percent = 100
+    elif job.rows_total:
+        percent = int(rows_processed * 100 / job.rows_total)
+    
+    return {
+        "id": job.id,
+        "filename": job.filename,
+        "status": job.status,
+        "phase": job.phase,
+        "rows_total": job.rows_total,
+        "rows_processed": rows_processed,
+        "percent": percent,
+        "error": job.error,
+        "import_id": job.import_id,
+        "finished": job.status in FINISHED_STATUSES
+    }
+
+
+def resume_import_jobs() -> None:
+    """Queue jobs left waiting by the last shutdown and start the sweep.
+    
+    Running jobs whose owning process is gone are failed first (see
+    reap_import_jobs); the sweep repeats that check every
+    import_sweep_seconds for owners that die while this worker runs.
+    """
+    global _sweeper
+    reap_import_jobs()
+    db = SessionLocal()
+    try:
+        queued_ids = [
+            job_id for (job_id,) in
+            db.query(ImportJob.id).filter(ImportJob.status == "queued").order_by(ImportJob.id)
+        ]
+    finally:
+        db.close()
+    
+    for job_id in queued_ids:
+        _submit(job_id)
+    
+    with _executor_lock:
+        if _sweeper is None and not _shutting_down:
+            _sweep_stop.clear()
+            _sweeper = threading.Thread(target=_sweep, name="import-job-sweep", daemon=True)
+            _sweeper.start()
+
+
+def reap_import_jobs() -> int:
+    """Fail running jobs whose owning process is gone; returns how many.
+    
+    Such jobs were interrupted mid-import (their transaction was rolled
+    back). Jobs another live worker is running are left alone, and a job
+    is only failed while it still carries the owner that was checked.
+    """
+    db = SessionLocal()
+    try:
+        cutoff = datetime.now() - timedelta(seconds=settings.import_stale_seconds)
+        stale_ids = {
+            job_id for (job_id,) in db.query(ImportJob.id).filter(
+                ImportJob.status == "running",
+                or_(ImportJob.heartbeat_at.is_(None), ImportJob.heartbeat_at < cutoff)
+            )
+        }
+        running = db.query(ImportJob.id, ImportJob.worker_id).filter(ImportJob.status == "running").all()
+        reaped = 0
+        for job_id, worker_id in running:
+            owner_alive = _owner_alive(job_id, worker_id)
+            if owner_alive is False or (owner_alive is None and job_id in stale_ids):
+                reaped += db.query(ImportJob).filter(
+                    ImportJob.id == job_id,
+                    ImportJob.status == "running",
+                    ImportJob.worker_id.is_(None) if worker_id is None else ImportJob.worker_id == worker_id
+                ).update(
+                    {
+                        "status": "failed",
+                        "error": "Interrupted: the worker running it stopped",
+                        "finished_at": datetime.now()
+                    },
+                    synchronize_session=False
+                )
+        db.commit()
+    finally:
+        db.close()
+    if reaped:
+        logger.warning(f"Failed {reaped} import job(s) whose worker stopped")
+    return reaped
+
+
+def shutdown_import_jobs() -> None:
+    """Stop taking new jobs and wait for running jobs to finish.
+    
+    Jobs that have not started stay queued and are picked up by
+    resume_import_jobs on the next startup.
+    """
+    global _executor, _shutting_down, _sweeper
+    with _executor_lock:
+        _shutting_down = True
+        executor, _executor = _executor, None
+        sweeper, _sweeper = _sweeper, None
+    _sweep_stop.set()
+    if sweeper is not None:
+        sweeper.join()
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _submit(job_id: int) -> None:
+    """Hand a queued job to the worker pool, creating the pool on first use."""
+    global _executor
+    with _executor_lock:
+        if _shutting_down:
+            return
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.import_workers,
+                thread_name_prefix="import-job"
+            )
+        _executor.submit(_run_job, job_id)
+
+
+def _run_job(job_id: int) -> None:
+    """Claim and run one queued job, recording failures on the job row."""
+    db = SessionLocal()
+    # Marked before the claim so a sweep never sees the job ownerless
+    _active_jobs.add(job_id)
+    try:
+        # Claim the job atomically so it never runs twice
+        claimed = db.query(ImportJob).filter(
+            ImportJob.id == job_id,
+            ImportJob.status == "queued"
+        ).update(
+            {
+                "status": "running",
+                "phase": "parsing",
+                "started_at": datetime.now(),
+                "worker_id": WORKER_ID,
+                "heartbeat_at": datetime.now()
+            },
+            synchronize_session=False
+        )
+        db.commit()
+        if not claimed:
+            return
+        
+        job = db.get(ImportJob, job_id)
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(
+            target=_heartbeat, args=(job_id, stop_heartbeat),
+            name=f"import-job-{job_id}-heartbeat", daemon=True
+        )
+        heartbeat.start()
+        try:
+            _execute_job(db, job)
+        except Exception as e:
+            logger.error(f"Import job {job_id} failed: {e}", exc_info=True)
+            db.rollback()
+            job.status = "failed"
+            job.error = str(e)
+            job.finished_at = datetime.now()
+            db.commit()
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+        
+        # Contents replaced or deleted while the job ran can go now
+        paths = [source["path"] for source in json.loads(job.sources)] if job.sources else [job.file_path]
+        try:
+            release_job_uploads(db, paths)
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Could not release uploads of import job {job_id}: {e}")
+    finally:
+        _active_jobs.discard(job_id)
+        _progress.pop(job_id, None)
+        db.close()
+
+
+def _heartbeat(job_id: int, stop: threading.Event) -> None:
+    """Record a running job's heartbeat and row progress until stopped.
+    
+    Uses its own session so the writes commit independently of the
+    import transaction. A write that cannot get the database (SQLite
+    while the import commits) is skipped until the next beat.
+    """
+    while not stop.wait(settings.import_heartbeat_seconds):
+        db = SessionLocal()
+        try:
+            values = {"heartbeat_at": datetime.now()}
+            if job_id in _progress:
+                values["rows_processed"] = _progress[job_id]
+            db.query(ImportJob).filter(
+                ImportJob.id == job_id,
+                ImportJob.status == "running"
+            ).update(values, synchronize_session=False)
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.debug(f"Skipped heartbeat for import job {job_id}: {e}")
+        finally:
+            db.close()
+
+
+def _sweep() -> None:
+    """Fail jobs whose owner died, every import_sweep_seconds until shutdown."""
+    while not _sweep_stop.wait(settings.import_sweep_seconds):
+        try:
+            reap_import_jobs()
+        except SQLAlchemyError as e:
+            logger.warning(f"Import job sweep failed: {e}")
+
+
+def _process_token(pid: int) -> Optional[str]:
+    """Token naming one run of a process: its boot and start time.
+    
+    Returns None where /proc is unavailable or the process does not exist.
+    A pid reused by a later process, or after a reboot, gets a new token.
+    """
+    try:
+        boot_id = Path("/proc/sys/kernel/random/boot_id").read_text().strip()
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return None
+    # Fields after the parenthesized command name; starttime is field 22
+    start_time = stat.rpartition(")")[2].split()[19]
+    return hashlib.blake2b(f"{boot_id}:{start_time}".encode(), digest_size=6).hexdigest()
+
+
+def _owner_alive(job_id: int, worker_id: Optional[str]) -> Optional[bool]:
+    """Whether the process that claimed a job still runs, if this host can tell.
+    
+    Returns None for jobs owned by another host, or recorded without a
+    start token (no /proc), leaving the heartbeat to decide.
+    """
+    if worker_id == WORKER_ID:
+        return job_id in _active_jobs
+    host, _, rest = (worker_id or "").partition(":")
+    pid, _, token = rest.partition(":")
+    if host != socket.gethostname() or not pid.isdigit() or not token:
+        return None
+    return _process_token(int(pid)) == token
+
+
+# Identifies this process, and this run of its pid, as the owner of the jobs it runs
+WORKER_ID = ":".join(
+    part for part in (socket.gethostname(), str(os.getpid()), _process_token(os.getpid())) if part
+)
+
+
+def _execute_job(db: Session, job: ImportJob) -> None:
+    """Parse, transform and commit the job's file, or its batch of sheets."""
+    job_id = job.id
+    column_mapping = json.loads(job.column_mapping)
+    
+    def report_progress(rows_processed: int) -> None:
+        _progress[job_id] = rows_processed
+    
+    if job.sources:
+        sources = json.loads(job.sources)
+        frames = parse_batch_sources(sources, mapped_columns(column_mapping))
+        _set_phase(db, job, "transforming")
+        
+        merged_sources = merge_batch_sources(sources, frames, column_mapping)
+        job.rows_total = sum(len(source["rows"]) for source in merged_sources)
+        _set_phase(db, job, "committing")
+        
+        with _import_lock(db):
+            _progress[job_id] = 0
+            import_record = commit_batch_import(
+                db=db,
+                sources=merged_sources,
+                column_mapping=column_mapping,
+                uploaded_by=job.uploaded_by,
+                progress=report_progress,
+                content_hash=job.content_hash,
+                changed_only=bool(job.changed_only)
+            )
+    else:
+        file_path = Path(job.file_path)
+        df = load_parsed_upload(file_path, columns=mapped_columns(column_mapping))
+        _set_phase(db, job, "transforming")
+        
+        transformed_rows = transform_dataframe(df, column_mapping)
+        job.rows_total = len(transformed_rows)
+        _set_phase(db, job, "committing")
+        
+        with _import_lock(db):
+            _progress[job_id] = 0
+            import_record = commit_import(
+                db=db,
+                file_path=file_path,
+                filename=job.filename,
+                column_mapping=column_mapping,
+                transformed_data=transformed_rows,
+                uploaded_by=job.uploaded_by,
+                progress=report_progress,
+                content_hash=job.content_hash,
+                changed_only=bool(job.changed_only)
+            )
+    
+    job.import_id = import_record.id
+    job.rows_processed = job.rows_total
+    job.status = "completed"
+    job.phase = "done"
+    job.finished_at = datetime.now()
+    db.commit()
+
+
+@contextmanager
+def _import_lock(db: Session) -> Iterator[None]:
+    """Hold the lock serializing import commits."""
+    with _commit_lock:
+        if db.get_bind().dialect.name == "postgresql":
+            # Also serialize against imports running in other processes
+            db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": IMPORT_LOCK_KEY})
+        yield
+
+
+def _set_phase(db: Session, job: ImportJob, phase: str) -> None:
+    """Record the phase a running job has reached."""
+    job.phase = phase
+    db.commit()
@@ -1,16 +1,44 @@
 """Import service for processing Excel imports."""
+import json
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator
 from datetime import datetime
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update, delete, and_, cast, bindparam
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
-from app.validators.excel_parser import parse_excel_file, get_column_names, get_sample_data
-from app.validators.column_detector import detect_column_mapping
-from app.validators.data_cleaner import normalize_department, parse_notes, clean_asset_tag, normalize_status
-from app.models.asset import Asset
+from app.config import settings
+from app.validators.excel_parser import probe_excel_file, get_column_names, get_sample_data
+from app.validators.column_detector import detect_column_mapping, rank_column_candidates
+from app.validators.column_profiler import profile_columns
+from app.validators.data_cleaner import (
+    normalize_department,
+    parse_notes,
+    clean_asset_tag,
+    normalize_status,
+    normalize_department_column,
+    parse_notes_user_column,
+    clean_asset_tag_column,
+    normalize_status_column,
+)
+from app.models.asset import Asset, FINGERPRINT_FIELDS, compute_content_hash
 from app.models.import_record import ImportRecord
+from app.models.import_source import ImportSource
 from app.models.asset_history import AssetHistory
+from app.models.verification import VerificationRecord
 from app.schemas.asset import AssetCreate
+from app.services.delta_service import lookup_assets_by_tag, changed_fields, COMPARED_FIELDS, LOOKUP_BATCH_SIZE
+from app.services.parse_cache import load_parsed_upload
+from app.services.import_error_service import store_import_errors
+from app.services.validation_service import validation_rules
+from app.validators.validation_rules import validate_frame
+
+
+# Ranked columns kept per field in an upload's mapping candidates
+MAPPING_CANDIDATES = 3
 
 
 def get_last_import_info(db: Session) -> Optional[Dict[str, Any]]:
@@ -28,17 +56,39 @@ def get_last_import_info(db: Session) -> Optional[Dict[str, Any]]:
 
 
 def process_uploaded_file(file_path: Path) -> Dict[str, Any]:
-    """Process uploaded Excel file and return column information."""
-    df = parse_excel_file(file_path)
-    columns = get_column_names(df)
-    sample_data = get_sample_data(df, num_rows=5)
-    auto_mapping = detect_column_mapping(columns)
+    """Process uploaded Excel file and return column information.
+    
+    .xlsx workbooks are only probed for their header and first rows; the
+    full sheet is parsed (and cached) the first time preview needs it.
+    The auto-mapping uses profiles of the first settings.profile_sample_rows
+    rows as well as the headers; mapping_candidates lists the best-scoring
+    columns for each field.
+    """
+    try:
+        probe = probe_excel_file(file_path, num_rows=5, profile_rows=settings.profile_sample_rows)
+        columns = probe["columns"]
+        sample_data = probe["sample_data"]
+        row_count = probe["row_count"]
+        sample_frame = probe["sample_frame"]
+    except ValueError:
+        df = load_parsed_upload(file_path)
+        columns = get_column_names(df)
+        sample_data = get_sample_data(df, num_rows=5)
+        row_count = len(df)
+        sample_frame = df.head(settings.profile_sample_rows)
+    profiles = profile_columns(sample_frame)
+    auto_mapping = detect_column_mapping(columns, profiles)
+    candidates = rank_column_candidates(columns, profiles)
     
     return {
         "columns": columns,
         "sample_data": sample_data,
         "auto_mapping": auto_mapping,
-        "row_count": len(df)
+        "mapping_candidates": {
+            field: [{"column": column, "score": score} for column, score in ranked[:MAPPING_CANDIDATES]]
+            for field, ranked in candidates.items()
+        },
+        "row_count": row_count
     }
 
 
@@ -81,95 +131,357 @@ def transform_row(row_data: Dict[str, Any], column_mapping: Dict[str, str]) -> D
     return transformed
 
 
+# Fields transform_row only adds to a row when it fills them in
+_DERIVED_FIELDS = ("assigned_user_name", "computer_name")
+
+
+def transform_frame(df: pd.DataFrame, column_mapping: Dict[str, str]) -> pd.DataFrame:
+    """Transform a whole DataFrame according to column mapping.
+    
+    Column-wise equivalent of calling transform_row on every row. All result
+    columns are object dtype so values keep the Python types transform_row
+    would produce; use transformed_records to get the row dicts.
+    """
+    row_count = len(df)
+    columns: Dict[str, np.ndarray] = {}
+    
+    # Map source columns to target fields
+    for target_field, source_column in column_mapping.items():
+        if source_column and source_column in df.columns:
+            values = df[source_column].to_numpy(dtype=object, copy=True)
+            values[pd.isna(values)] = None
+        else:
+            values = np.full(row_count, None, dtype=object)
+        columns[target_field] = values
+    
+    if "assigned_user_name" not in columns:
+        columns["assigned_user_name"] = np.full(row_count, None, dtype=object)
+    
+    # Apply transformations, each only to the rows transform_row would touch
+    if "department" in column_mapping:
+        _apply_to_truthy(columns["department"], normalize_department_column)
+    
+    if "notes" in column_mapping:
+        users = columns["notes"].copy()
+        _apply_to_truthy(users, parse_notes_user_column)
+        assigned = columns["assigned_user_name"]
+        fill = users.astype(bool) & ~assigned.astype(bool)
+        assigned[fill] = users[fill]
+    
+    if "asset_tag" in column_mapping:
+        _apply_to_truthy(columns["asset_tag"], clean_asset_tag_column)
+    
+    if "status" in column_mapping:
+        columns["status"] = normalize_status_column(pd.Series(columns["status"], dtype=object)).to_numpy(dtype=object)
+    else:
+        columns["status"] = np.full(row_count, "active", dtype=object)
+    
+    # Set computer_name from asset_tag if not provided
+    if "computer_name" not in columns:
+        columns["computer_name"] = np.full(row_count, None, dtype=object)
+    if "asset_tag" in column_mapping:
+        computer_names = columns["computer_name"]
+        asset_tags = columns["asset_tag"]
+        fill = ~computer_names.astype(bool) & asset_tags.astype(bool)
+        computer_names[fill] = asset_tags[fill]
+    
+    return pd.DataFrame(columns, index=pd.RangeIndex(row_count), dtype=object)
+
+
+def _apply_to_truthy(values: np.ndarray, column_func) -> None:
+    """Replace the truthy entries of values in place with column_func's result."""
+    mask = values.astype(bool)
+    if mask.any():
+        values[mask] = column_func(pd.Series(values[mask], dtype=object)).to_numpy(dtype=object)
+
+
+def record_layouts(frame: pd.DataFrame, column_mapping: Dict[str, str]) -> List[Tuple[Optional[np.ndarray], List[str]]]:
+    """Group the rows of a transform_frame result by the fields transform_row
+    would give them.
+    
+    Derived fields that are not in the mapping are left out of a row unless
+    they were filled in. Returns (row positions, fields) pairs; positions
+    is None when every row has every field.
+    """
+    derived = [field for field in _DERIVED_FIELDS if field not in column_mapping]
+    present = frame[derived].notna().to_numpy()
+    if present.all():
+        return [(None, list(frame.columns))]
+    
+    # Rows share at most four key layouts
+    layouts = present @ (1 << np.arange(len(derived)))
+    groups = []
+    for layout in np.unique(layouts):
+        dropped = {field for bit, field in enumerate(derived) if not layout & (1 << bit)}
+        groups.append((
+            np.flatnonzero(layouts == layout),
+            [field for field in frame.columns if field not in dropped]
+        ))
+    return groups
+
+
+def transformed_records(frame: pd.DataFrame, column_mapping: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Convert a transform_frame result into the row dicts transform_row returns."""
+    layouts = record_layouts(frame, column_mapping)
+    if layouts[0][0] is None:
+        return _zip_records(frame, layouts[0][1])
+    
+    # Convert each layout in one pass
+    records: List[Dict[str, Any]] = [None] * len(frame)
+    for positions, fields in layouts:
+        for position, record in zip(positions.tolist(), _zip_records(frame.iloc[positions], fields)):
+            records[position] = record
+    return records
+
+
+def iter_transformed_json(
+    df: pd.DataFrame,
+    column_mapping: Dict[str, str],
+    chunk_size: Optional[int] = None
+) -> Iterator[List[str]]:
+    """Transform a DataFrame chunk by chunk, yielding each chunk's rows as
+    JSON object strings in row order.
+    
+    Each chunk of chunk_size rows (defaults to settings.import_chunk_size)
+    is encoded by pandas' JSON writer one key layout at a time, so missing
+    values become null and NumPy scalars and timestamps (as ISO 8601) are
+    converted column-wise rather than per cell. Only one chunk of output
+    is held in memory at a time; df itself is already loaded in full.
+    """
+    chunk_size = chunk_size or settings.import_chunk_size
+    for start in range(0, len(df), chunk_size):
+        frame = transform_frame(df.iloc[start:start + chunk_size], column_mapping)
+        lines: List[str] = [None] * len(frame)
+        for positions, fields in record_layouts(frame, column_mapping):
+            rows = frame[fields] if positions is None else frame.iloc[positions][fields]
+            encoded = rows.to_json(
+                orient="records",
+                lines=True,
+                date_format="iso",
+                double_precision=15,
+                force_ascii=False,
+                default_handler=str
+            ).rstrip("\n").split("\n")
+            if positions is None:
+                lines = encoded
+            else:
+                for position, line in zip(positions.tolist(), encoded):
+                    lines[position] = line
+        yield lines
+
+
+def _zip_records(frame: pd.DataFrame, fields) -> List[Dict[str, Any]]:
+    """Build row dicts straight from object columns, skipping per-cell boxing."""
+    fields = list(fields)
+    columns = [frame[field].to_numpy(dtype=object) for field in fields]
+    return [dict(zip(fields, values)) for values in zip(*columns)]
+
+
+def transform_dataframe(df: pd.DataFrame, column_mapping: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Transform every row of a DataFrame according to column mapping."""
+    return transformed_records(transform_frame(df, column_mapping), column_mapping)
+
+
+# Asset fields an import may overwrite on an existing asset, the same ones
+# the preview compares
+_UPDATABLE_FIELDS = frozenset(COMPARED_FIELDS)
+
+
+def canonical_mapping(column_mapping: Dict[str, str]) -> str:
+    """Serialize a column mapping so equal mappings compare equal as strings."""
+    return json.dumps(column_mapping, sort_keys=True)
+
+
+def mapped_columns(column_mapping: Dict[str, str]) -> Optional[List[str]]:
+    """Source columns a mapping reads, or None (read every column) if it maps none."""
+    columns = sorted({column for column in column_mapping.values() if column})
+    return columns or None
+
+
+def find_completed_import(
+    db: Session,
+    content_hash: str,
+    column_mapping: Dict[str, str],
+    changed_only: bool = False
+) -> Optional[ImportRecord]:
+    """Return the completed import of this file content with this mapping
+    and changed_only mode, if any.
+    
+    Rolled back and failed imports are ignored, so those can be run again.
+    """
+    return db.query(ImportRecord).filter(
+        ImportRecord.content_hash == content_hash,
+        ImportRecord.column_mapping == canonical_mapping(column_mapping),
+        ImportRecord.changed_only.is_(True) if changed_only else ImportRecord.changed_only.isnot(True),
+        ImportRecord.status == "completed"
+    ).order_by(ImportRecord.id.desc()).first()
+
+
 def commit_import(
     db: Session,
     file_path: Path,
     filename: str,
     column_mapping: Dict[str, str],
     transformed_data: List[Dict[str, Any]],
-    uploaded_by: str = "system"
+    uploaded_by: str = "system",
+    chunk_size: Optional[int] = None,
+    progress: Optional[Callable[[int], None]] = None,
+    content_hash: Optional[str] = None,
+    changed_only: bool = False
 ) -> ImportRecord:
-    """Commit import to database."""
+    """Commit import to database.
+    
+    Rows are validated and upserted in chunks of chunk_size (defaults to
+    settings.import_chunk_size) using set-based statements, so the number
+    of round trips grows with the number of chunks rather than rows.
+    progress, if given, is called with the number of rows processed after
+    each chunk.
+    
+    When content_hash (the SHA-256 of the source file) is given and the same
+    content was already imported with the same mapping, the existing
+    ImportRecord is returned and nothing is written.
+    
+    With changed_only, only new and modified rows are written, and only the
+    fields that differ on modified assets. Unchanged rows are counted in
+    records_unchanged without touching the database.
+    
+    Rows that fail validation are counted in records_failed and stored in
+    import_errors as each chunk is committed.
+    """
+    if content_hash:
+        existing_import = find_completed_import(db, content_hash, column_mapping, changed_only)
+        if existing_import:
+            return existing_import
+    
     # Create import record
     import_record = ImportRecord(
         filename=filename,
         uploaded_by=uploaded_by,
-        column_mapping=str(column_mapping),
+        column_mapping=canonical_mapping(column_mapping),
+        content_hash=content_hash,
+        changed_only=changed_only,
         records_processed=len(transformed_data),
         status="pending"
     )
     db.add(import_record)
     db.flush()  # Get the ID
     
+    try:
+        records_created, records_updated, records_unchanged, records_failed = _commit_rows(
+            db,
+            transformed_data,
+            import_record.id,
+            uploaded_by,
+            chunk_size,
+            changed_only,
+            progress
+        )
+        
+        # Update import record
+        import_record.records_created = records_created
+        import_record.records_updated = records_updated
+        import_record.records_unchanged = records_unchanged
+        import_record.records_failed = records_failed
+        import_record.status = "completed"
+        
+        db.commit()
+        return import_record
+    
+    except Exception as e:
+        db.rollback()
+        import_record.status = "failed"
+        import_record.validation_errors = str(e)
+        db.commit()
+        raise
+
+
+def commit_batch_import(
+    db: Session,
+    sources: List[Dict[str, Any]],
+    column_mapping: Dict[str, str],
+    uploaded_by: str = "system",
+    chunk_size: Optional[int] = None,
+    progress: Optional[Callable[[int], None]] = None,
+    content_hash: Optional[str] = None,
+    changed_only: bool = False
+) -> ImportRecord:
+    """Commit the sheets of several workbooks as one import.
+    
+    sources are built by merge_batch_sources: each has filename,
+    sheet_name, content_hash, column_mapping, rows, row_numbers and
+    duplicates. Sources are committed in order in a single transaction,
+    with the same chunking, progress and changed_only behaviour as
+    commit_import. The ImportRecord holds the batch totals and an
+    ImportSource row holds each sheet's counters; stored row errors name
+    the source and the row within its sheet.
+    
+    column_mapping is the mapping requested for the batch ({} when each
+    sheet's mapping was detected) and, with content_hash (identifying the
+    batch's sources), makes repeated batches return the existing import.
+    """
+    if content_hash:
+        existing_import = find_completed_import(db, content_hash, column_mapping, changed_only)
+        if existing_import:
+            return existing_import
+    
+    import_record = ImportRecord(
+        filename=batch_display_name(sources),
+        uploaded_by=uploaded_by,
+        column_mapping=canonical_mapping(column_mapping),
+        content_hash=content_hash,
+        changed_only=changed_only,
+        records_processed=sum(len(source["rows"]) + source["duplicates"] for source in sources),
+        status="pending"
+    )
+    db.add(import_record)
+    db.flush()  # Get the ID
+    
     records_created = 0
     records_updated = 0
+    records_unchanged = 0
     records_failed = 0
-    validation_errors = []
+    rows_done = 0
     
     try:
-        for i, row_data in enumerate(transformed_data):
-            try:
-                asset_tag = row_data.get("asset_tag")
-                
-                if not asset_tag:
-                    records_failed += 1
-                    validation_errors.append({
-                        "row": i + 1,
-                        "message": "Missing asset_tag"
-                    })
-                    continue
-                
-                # Check if asset exists
-                existing = db.query(Asset).filter(Asset.asset_tag == asset_tag).first()
-                
-                if existing:
-                    # Update existing asset
-                    for field, value in row_data.items():
-                        if field != "asset_tag" and hasattr(existing, field):
-                            setattr(existing, field, value)
-                    
-                    existing.updated_at = datetime.now()
-                    records_updated += 1
-                    
-                    # Create history record
-                    history = AssetHistory(
-                        asset_id=existing.id,
-                        field_name="import",
-                        change_type="import",
-                        changed_by=uploaded_by,
-                        import_id=import_record.id
-                    )
-                    db.add(history)
-                else:
-                    # Create new asset
-                    asset_create = AssetCreate(**row_data)
-                    new_asset = Asset(**asset_create.model_dump())
-                    db.add(new_asset)
-                    records_created += 1
-                    
-                    # Create history record
-                    db.flush()
-                    history = AssetHistory(
-                        asset_id=new_asset.id,
-                        field_name="created",
-                        change_type="import",
-                        changed_by=uploaded_by,
-                        import_id=import_record.id
-                    )
-                    db.add(history)
+        for source in sources:
+            source_progress = None
+            if progress:
+                source_progress = lambda rows_processed, before=rows_done: progress(before + rows_processed)
+            created, updated, unchanged, failed = _commit_rows(
+                db,
+                source["rows"],
+                import_record.id,
+                uploaded_by,
+                chunk_size,
+                changed_only,
+                source_progress,
+                source=f"{source['filename']} [{source['sheet_name']}]",
+                row_numbers=source["row_numbers"]
+            )
             
-            except Exception as e:
-                records_failed += 1
-                validation_errors.append({
-                    "row": i + 1,
-                    "message": str(e)
-                })
+            db.add(ImportSource(
+                import_id=import_record.id,
+                filename=source["filename"],
+                sheet_name=source["sheet_name"],
+                content_hash=source["content_hash"],
+                column_mapping=canonical_mapping(source["column_mapping"]),
+                records_processed=len(source["rows"]) + source["duplicates"],
+                records_created=created,
+                records_updated=updated,
+                records_unchanged=unchanged,
+                records_failed=failed,
+                records_duplicate=source["duplicates"]
+            ))
+            records_created += created
+            records_updated += updated
+            records_unchanged += unchanged
+            records_failed += failed
+            rows_done += len(source["rows"])
         
-        # Update import record
         import_record.records_created = records_created
         import_record.records_updated = records_updated
+        import_record.records_unchanged = records_unchanged
         import_record.records_failed = records_failed
-        import_record.validation_errors = str(validation_errors) if validation_errors else None
         import_record.status = "completed"
         
         db.commit()
@@ -183,38 +495,306 @@ def commit_import(
         raise
 
 
+def batch_display_name(sources: List[Dict[str, Any]]) -> str:
+    """Name a batch import after its workbooks, within ImportRecord.filename's length."""
+    filenames = list(dict.fromkeys(source["filename"] for source in sources))
+    name = ", ".join(filenames)
+    if len(name) > 255:
+        name = f"{filenames[0]} and {len(filenames) - 1} more files"[:255]
+    return name
+
+
+def _commit_rows(
+    db: Session,
+    rows: List[Dict[str, Any]],
+    import_id: int,
+    uploaded_by: str,
+    chunk_size: Optional[int] = None,
+    changed_only: bool = False,
+    progress: Optional[Callable[[int], None]] = None,
+    source: Optional[str] = None,
+    row_numbers: Optional[List[int]] = None
+) -> Tuple[int, int, int, int]:
+    """Commit rows in chunks of chunk_size (defaults to settings.import_chunk_size).
+    
+    Rows failing the validation rules the preview reports are not
+    written. Each chunk's validation errors are bulk inserted into
+    import_errors, labelled with source and numbered by row_numbers (the
+    1-based row of each entry of rows; their positions if None).
+    
+    Returns (records_created, records_updated, records_unchanged, records_failed).
+    """
+    chunk_size = chunk_size or settings.import_chunk_size
+    records_created = 0
+    records_updated = 0
+    records_unchanged = 0
+    records_failed = 0
+    
+    # The rules run over all rows at once, so in-file checks such as
+    # unique see every row, as they do in the preview
+    rule_errors = _rule_errors(rows)
+    
+    for offset in range(0, len(rows), chunk_size):
+        created, updated, unchanged, errors = _commit_chunk(
+            db,
+            rows[offset:offset + chunk_size],
+            offset,
+            import_id,
+            uploaded_by,
+            changed_only,
+            rule_errors
+        )
+        records_created += created
+        records_updated += updated
+        records_unchanged += unchanged
+        records_failed += len({error["row"] for error in errors})
+        if row_numbers is not None:
+            for error in errors:
+                error["row"] = row_numbers[error["row"] - 1]
+        store_import_errors(db, import_id, errors, source)
+        if progress:
+            progress(min(offset + chunk_size, len(rows)))
+    
+    return records_created, records_updated, records_unchanged, records_failed
+
+
+def _rule_errors(rows: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+    """Errors from the validation rules, keyed by 0-based row position."""
+    frame = pd.DataFrame.from_records(rows) if rows else pd.DataFrame()
+    errors: Dict[int, List[Dict[str, Any]]] = {}
+    for error in validate_frame(frame, validation_rules()):
+        errors.setdefault(error["row"] - 1, []).append(error)
+    return errors
+
+
+def _validation_error(row: int, error: ValidationError) -> Dict[str, Any]:
+    """Describe a row's schema validation failure, naming its first failing field."""
+    details = error.errors()
+    return {
+        "row": row,
+        "field": str(details[0]["loc"][0]) if details and details[0]["loc"] else None,
+        "message": "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in details
+        )
+    }
+
+
+def _commit_chunk(
+    db: Session,
+    rows: List[Dict[str, Any]],
+    offset: int,
+    import_id: int,
+    uploaded_by: str,
+    changed_only: bool = False,
+    rule_errors: Optional[Dict[int, List[Dict[str, Any]]]] = None
+) -> Tuple[int, int, int, List[Dict[str, Any]]]:
+    """Validate and upsert one chunk of rows.
+    
+    Rows with errors in rule_errors (from _rule_errors, keyed by position
+    in the whole import) are rejected with those errors.
+    
+    Each field an import changes on an existing asset gets a history row
+    with its old and new value, which rollback_import restores. With
+    changed_only, rows matching their existing asset are skipped and
+    modified assets have only their differing fields written.
+    
+    Returns (records_created, records_updated, records_unchanged, validation_errors).
+    """
+    errors = []
+    valid_rows = []
+    
+    # Validate the whole chunk before touching the database
+    for i, row_data in enumerate(rows, start=offset):
+        if rule_errors and i in rule_errors:
+            errors.extend(rule_errors[i])
+            continue
+        if not row_data.get("asset_tag"):
+            errors.append({"row": i + 1, "field": "asset_tag", "message": "Missing asset_tag"})
+            continue
+        try:
+            values = AssetCreate(**row_data).model_dump()
+        except ValidationError as e:
+            errors.append(_validation_error(i + 1, e))
+            continue
+        # Only fields present in the row are overwritten on existing assets
+        update_fields = tuple(field for field in row_data if field in _UPDATABLE_FIELDS)
+        valid_rows.append((values, update_fields))
+    
+    if not valid_rows:
+        return 0, 0, 0, errors
+    
+    # Resolve which tags already exist, and their current field values, in
+    # batched lookups
+    loaded_fields = sorted(_UPDATABLE_FIELDS | set(FINGERPRINT_FIELDS))
+    existing_assets = lookup_assets_by_tag(
+        db,
+        {values["asset_tag"] for values, _ in valid_rows},
+        [Asset.id, Asset.asset_tag] + [getattr(Asset, field) for field in loaded_fields]
+    )
+    current_fields = {
+        asset_tag: {field: getattr(existing, field) for field in loaded_fields}
+        for asset_tag, existing in existing_assets.items()
+    }
+    
+    # A tag repeated in the file is created by its first row and updated by
+    # the later ones, so split repeats into successive rounds
+    rounds: List[Dict[Tuple[str, ...], List[Dict[str, Any]]]] = []
+    occurrences: Dict[str, int] = {}
+    history_entries: List[Dict[str, Any]] = []
+    records_created = 0
+    records_updated = 0
+    records_unchanged = 0
+    for values, update_fields in valid_rows:
+        asset_tag = values["asset_tag"]
+        
+        if asset_tag in current_fields:
+            fields = current_fields[asset_tag]
+            changes = changed_fields(fields, values, update_fields)
+            if changed_only:
+                if not changes:
+                    records_unchanged += 1
+                    continue
+                update_fields = tuple(changes)
+            if changes:
+                history_entries.extend(
+                    {
+                        "asset_tag": asset_tag,
+                        "field_name": field,
+                        "old_value": _history_value(old_value),
+                        "new_value": _history_value(new_value),
+                    }
+                    for field, (old_value, new_value) in changes.items()
+                )
+            else:
+                history_entries.append({"asset_tag": asset_tag, "field_name": "import"})
+            records_updated += 1
+            fields.update((field, values[field]) for field in update_fields if field in fields)
+        else:
+            records_created += 1
+            history_entries.append({"asset_tag": asset_tag, "field_name": "created"})
+            fields = current_fields[asset_tag] = {field: values[field] for field in loaded_fields}
+        # Hash of the asset as it will be after this row is applied
+        values["content_hash"] = compute_content_hash(fields)
+        
+        occurrence = occurrences.get(asset_tag, 0)
+        occurrences[asset_tag] = occurrence + 1
+        if occurrence == len(rounds):
+            rounds.append({})
+        rounds[occurrence].setdefault(update_fields, []).append(values)
+    
+    asset_ids: Dict[str, int] = {}
+    for batches in rounds:
+        for update_fields, batch in batches.items():
+            asset_ids.update(_upsert_assets(db, batch, update_fields))
+    
+    # Bulk insert history rows using the ids returned by the upserts
+    if history_entries:
+        db.execute(
+            insert(AssetHistory.__table__),
+            [
+                {
+                    "asset_id": asset_ids[entry["asset_tag"]],
+                    "field_name": entry["field_name"],
+                    "old_value": entry.get("old_value"),
+                    "new_value": entry.get("new_value"),
+                    "change_type": "import",
+                    "changed_by": uploaded_by,
+                    "import_id": import_id,
+                }
+                for entry in history_entries
+            ]
+        )
+    
+    return records_created, records_updated, records_unchanged, errors
+
+
+def _history_value(value: Any) -> Optional[str]:
+    """Format a field value for AssetHistory's text columns."""
+    return str(value) if value else None
+
+
+def _upsert_assets(db: Session, rows: List[Dict[str, Any]], update_fields: Tuple[str, ...]) -> Dict[str, int]:
+    """Insert rows, updating update_fields on asset_tag conflicts.
+    
+    Returns asset ids keyed by asset_tag.
+    """
+    dialect_insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    table = Asset.__table__
+    stmt = dialect_insert(table)
+    set_ = {field: stmt.excluded[field] for field in update_fields}
+    set_["content_hash"] = stmt.excluded.content_hash
+    set_["updated_at"] = datetime.now()
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.asset_tag],
+        set_=set_
+    ).returning(table.c.id, table.c.asset_tag)
+    
+    return {asset_tag: asset_id for asset_id, asset_tag in db.execute(stmt, rows)}
+
+
 def rollback_import(db: Session, import_id: int) -> bool:
-    """Rollback an import by deleting created assets and reverting updates."""
+    """Rollback an import by deleting created assets and reverting updates.
+    
+    Runs as a few set-based statements over asset_history's import_id and
+    asset_id indexes. Assets the import created are deleted, with their
+    history and verification records. Every field it changed is restored
+    to the old value recorded in its history, even if a later import
+    changed it again. Imports recorded before field-level history only
+    have their created assets removed.
+    """
     import_record = db.query(ImportRecord).filter(ImportRecord.id == import_id).first()
     if not import_record or import_record.status == "rolled_back":
         return False
     
+    history = AssetHistory.__table__
+    assets = Asset.__table__
+    import_history = history.c.import_id == import_id
+    
     try:
-        # Get all history records for this import
-        history_records = db.query(AssetHistory).filter(
-            AssetHistory.import_id == import_id
-        ).all()
+        # Delete assets the import created, in batches of ids
+        created_ids = db.execute(
+            select(history.c.asset_id).where(import_history, history.c.field_name == "created")
+        ).scalars().all()
+        for start in range(0, len(created_ids), LOOKUP_BATCH_SIZE):
+            batch = created_ids[start:start + LOOKUP_BATCH_SIZE]
+            db.execute(delete(VerificationRecord.__table__).where(VerificationRecord.asset_id.in_(batch)))
+            db.execute(delete(history).where(history.c.asset_id.in_(batch)))
+            db.execute(delete(assets).where(assets.c.id.in_(batch)))
+        
+        # Restore each changed field from the first value recorded for it,
+        # which predates any repeats of the asset later in the file
+        restored_fields = [
+            field for field in db.execute(
+                select(history.c.field_name).where(import_history).distinct()
+            ).scalars()
+            if field in _UPDATABLE_FIELDS
+        ]
+        cast_values = db.get_bind().dialect.name != "sqlite"
+        for field in restored_fields:
+            changed_field = and_(import_history, history.c.field_name == field)
+            old_value = (
+                select(history.c.old_value)
+                .where(changed_field, history.c.asset_id == assets.c.id)
+                .order_by(history.c.id)
+                .limit(1)
+                .scalar_subquery()
+            )
+            if cast_values:
+                old_value = cast(old_value, assets.c[field].type)
+            db.execute(
+                update(assets)
+                .where(assets.c.id.in_(select(history.c.asset_id).where(changed_field)))
+                .values({field: old_value, "updated_at": datetime.now()})
+            )
         
-        # Delete created assets and revert updates
-        for history in history_records:
-            if history.change_type == "import":
-                asset = db.query(Asset).filter(Asset.id == history.asset_id).first()
-                if asset:
-                    # Check if this was a new asset (no history before this import)
-                    earlier_history = db.query(AssetHistory).filter(
-                        AssetHistory.asset_id == asset.id,
-                        AssetHistory.changed_at < history.changed_at
-                    ).first()
-                    
-                    if not earlier_history:
-                        # This was a new asset, delete it
-                        db.delete(asset)
-                    # Otherwise, it was an update - we'd need to store old values to revert
-                    # For MVP, we'll just mark the import as rolled_back
+        if restored_fields:
+            _refresh_content_hashes(
+                db,
+                select(history.c.asset_id).where(import_history, history.c.field_name.in_(restored_fields))
+            )
         
         # Delete history records
-        for history in history_records:
-            db.delete(history)
+        db.execute(delete(history).where(import_history))
         
         import_record.status = "rolled_back"
         import_record.rolled_back_at = datetime.now()
@@ -224,3 +804,17 @@ def rollback_import(db: Session, import_id: int) -> bool:
     except Exception as e:
         db.rollback()
         raise
+
+
+def _refresh_content_hashes(db: Session, asset_ids) -> None:
+    """Recompute content_hash for the assets whose ids asset_ids selects."""
+    assets = Asset.__table__
+    rows = db.execute(
+        select(assets.c.id, *[assets.c[field] for field in FINGERPRINT_FIELDS])
+        .where(assets.c.id.in_(asset_ids))
+    ).mappings().all()
+    if rows:
+        db.execute(
+            update(assets).where(assets.c.id == bindparam("asset_id")).values(content_hash=bindparam("hash")),
+            [{"asset_id": row["id"], "hash": compute_content_hash(row)} for row in rows]
+        )
@@ -0,0 +1,74 @@
+"""Saved column mappings keyed by header row.
+
+Source spreadsheets from the same system always have the same headers, so
+the mapping confirmed when committing an import is saved under a
+fingerprint of the file's header row. Later files with that header row
+are mapped from the profile, found by one indexed lookup, and skip the
+mapping step. Headers are compared case-insensitively with whitespace
+collapsed, and their order is ignored.
+"""
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from app.models.mapping_profile import MappingProfile
+from app.services.import_service import canonical_mapping
+
+
+def normalize_header(column: Any) -> str:
+    """Normalize a header for matching: collapsed whitespace, case-folded."""
+    return " ".join(str(column).split()).casefold()
+
+
+def header_fingerprint(columns: List[Any]) -> str:
+    """Return the SHA-256 identifying a header row regardless of column order."""
+    normalized = sorted({normalize_header(column) for column in columns})
+    return hashlib.sha256(json.dumps(normalized).encode()).hexdigest()
+
+
+def find_profile_mapping(db: Session, columns: List[Any]) -> Optional[Dict[str, str]]:
+    """Return the saved mapping for files with these headers, or None.
+    
+    The mapping is returned in terms of these columns' own names.
+    """
+    profile = db.query(MappingProfile).filter(
+        MappingProfile.header_fingerprint == header_fingerprint(columns)
+    ).first()
+    if profile is None:
+        return None
+    
+    columns_by_header: Dict[str, Any] = {}
+    for column in columns:
+        columns_by_header.setdefault(normalize_header(column), column)
+    return {
+        field: columns_by_header[header]
+        for field, header in json.loads(profile.column_mapping).items()
+        if header in columns_by_header
+    }
+
+
+def save_mapping_profile(db: Session, columns: List[Any], column_mapping: Dict[str, str]) -> None:
+    """Save a confirmed mapping for files with these headers, replacing any
+    previous profile for them."""
+    mapping = {
+        field: normalize_header(column)
+        for field, column in column_mapping.items()
+        if column
+    }
+    if not mapping:
+        return
+    
+    insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    statement = insert(MappingProfile.__table__).values(
+        header_fingerprint=header_fingerprint(columns),
+        headers=json.dumps(sorted({normalize_header(column) for column in columns})),
+        column_mapping=canonical_mapping(mapping)
+    )
+    db.execute(statement.on_conflict_do_update(
+        index_elements=["header_fingerprint"],
+        set_={"column_mapping": statement.excluded.column_mapping, "updated_at": func.now()}
+    ))
+    db.commit()
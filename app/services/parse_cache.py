@@ -0,0 +1,213 @@
+"""Columnar cache of parsed uploads.
+
+Parsing a workbook with openpyxl is the slowest step of an import, and one
+import session needs the parsed sheet at upload, preview and commit (plus
+any file API calls). The first parse of an upload is stored as a Feather
+file keyed by the SHA-256 of the workbook's bytes (plus the sheet and
+column selection, for anything but a full read of the first sheet); later
+steps read that. Once a column mapping is known, only the mapped columns
+are read and cached.
+
+Object columns Arrow cannot store as one type (numbers and text mixed in
+one column, common for asset tags and user IDs) are converted to text
+before caching. Their names are kept in the entry's metadata and in the
+frame's attrs["stringified_columns"], and the first parse returns the
+same converted frame, so every step sees the same values.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+from app.config import settings
+from app.validators.excel_parser import parse_excel_file
+
+logger = logging.getLogger(__name__)
+
+# Cache entry metadata key listing the columns converted to text
+STRINGIFIED_KEY = b"stringified_columns"
+
+# Most recent content hash seen per source path, with the size and mtime it
+# was computed for, so unchanged files are not re-hashed
+_source_hashes: Dict[str, Tuple[int, int, str]] = {}
+_MAX_TRACKED_SOURCES = 1024
+
+
+def file_content_hash(file_path: Path) -> str:
+    """Return the SHA-256 of a file's contents.
+    
+    If the file has changed since it was last hashed, the cache entry for
+    its previous contents is dropped.
+    """
+    stat = file_path.stat()
+    source = str(file_path.resolve())
+    known = _source_hashes.get(source)
+    if known and known[:2] == (stat.st_size, stat.st_mtime_ns):
+        return known[2]
+    
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    content_hash = digest.hexdigest()
+    
+    if known and known[2] != content_hash:
+        _drop_entries(known[2])
+    remember_content_hash(file_path, content_hash)
+    return content_hash
+
+
+def remember_content_hash(file_path: Path, content_hash: str) -> None:
+    """Record a hash computed elsewhere (e.g. while saving an upload)."""
+    stat = file_path.stat()
+    if len(_source_hashes) >= _MAX_TRACKED_SOURCES:
+        _source_hashes.pop(next(iter(_source_hashes)))
+    _source_hashes[str(file_path.resolve())] = (stat.st_size, stat.st_mtime_ns, content_hash)
+
+
+def load_parsed_upload(
+    file_path: Path,
+    sheet_name: Union[str, int] = 0,
+    columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Return the parsed DataFrame for one sheet of an uploaded workbook
+    (the first by default), optionally only the given columns.
+    
+    The sheet is parsed with parse_excel_file only when no cache entry
+    exists for it (and that column selection) in the workbook's current
+    contents.
+    """
+    content_hash = file_content_hash(file_path)
+    cache_path = _cache_path(content_hash, sheet_name, columns)
+    
+    if cache_path.exists():
+        try:
+            table = feather.read_table(cache_path)
+            df = table.to_pandas()
+            metadata = table.schema.metadata or {}
+            df.attrs["stringified_columns"] = json.loads(metadata.get(STRINGIFIED_KEY, b"[]"))
+            # Reads refresh the entry's age for eviction
+            os.utime(cache_path)
+            return df
+        except Exception as e:
+            logger.warning(f"Discarding unreadable parse cache entry {cache_path}: {e}")
+            cache_path.unlink(missing_ok=True)
+    
+    df = parse_excel_file(file_path, sheet_name, columns)
+    return _store(cache_path, df)
+
+
+def invalidate_parsed_upload(file_path: Path) -> None:
+    """Drop every cache entry for a file, e.g. before deleting it."""
+    if file_path.exists():
+        _drop_entries(file_content_hash(file_path))
+    known = _source_hashes.pop(str(file_path.resolve()), None)
+    if known:
+        _drop_entries(known[2])
+
+
+def evict_parsed_uploads() -> int:
+    """Remove entries past the configured age, then the least recently used
+    ones until the cache fits its size limit. Returns the number removed."""
+    cache_dir = settings.parse_cache_dir
+    if not cache_dir.exists():
+        return 0
+    
+    entries = []
+    for path in cache_dir.glob("*.feather"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()
+    
+    removed = 0
+    total_size = sum(size for _, size, _ in entries)
+    oldest_allowed = time.time() - settings.parse_cache_max_age
+    for mtime, size, path in entries:
+        if mtime >= oldest_allowed and total_size <= settings.parse_cache_max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total_size -= size
+        removed += 1
+    return removed
+
+
+def _cache_path(
+    content_hash: str,
+    sheet_name: Union[str, int] = 0,
+    columns: Optional[List[str]] = None
+) -> Path:
+    if sheet_name == 0 and columns is None:
+        return settings.parse_cache_dir / f"{content_hash}.feather"
+    # Sheet and column names may contain characters that are not valid in filenames
+    selection = repr((sheet_name, sorted(columns) if columns is not None else None))
+    selection_key = hashlib.sha256(selection.encode()).hexdigest()[:16]
+    return settings.parse_cache_dir / f"{content_hash}-{selection_key}.feather"
+
+
+def _drop_entries(content_hash: str) -> None:
+    """Remove the cache entries for every sheet and column selection of the
+    given contents."""
+    cache_dir = settings.parse_cache_dir
+    if not cache_dir.exists():
+        return
+    _cache_path(content_hash).unlink(missing_ok=True)
+    for path in cache_dir.glob(f"{content_hash}-*.feather"):
+        path.unlink(missing_ok=True)
+
+
+def _store(cache_path: Path, df: pd.DataFrame) -> pd.DataFrame:
+    """Write df to cache_path atomically and return the frame as cached:
+    with mixed-type object columns converted to text. Frames with
+    non-string headers are returned as they are, uncached."""
+    if not all(isinstance(column, str) for column in df.columns):
+        logger.info(f"Not caching {cache_path.name}: non-string column names")
+        return df
+    
+    df = _stringify_mixed_columns(df)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        STRINGIFIED_KEY: json.dumps(df.attrs["stringified_columns"]).encode(),
+    })
+    
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        feather.write_feather(table, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.warning(f"Not caching {cache_path.name}: {e}")
+        tmp_path.unlink(missing_ok=True)
+        return df
+    
+    evict_parsed_uploads()
+    return df
+
+
+def _stringify_mixed_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert the object columns Arrow cannot type (e.g. numbers mixed
+    with text) to text, keeping missing values missing. Lists the
+    converted columns in attrs["stringified_columns"]."""
+    stringified = []
+    for column in df.columns:
+        if df[column].dtype != object:
+            continue
+        try:
+            pa.array(df[column], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            if not stringified:
+                df = df.copy()
+            df[column] = df[column].map(lambda value: value if pd.isna(value) else str(value))
+            stringified.append(column)
+    if stringified:
+        logger.info(f"Cached {', '.join(stringified)} as text: mixed value types")
+    df.attrs["stringified_columns"] = stringified
+    return df
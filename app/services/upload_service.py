@@ -0,0 +1,218 @@
+"""Content-addressed storage of uploaded files.
+
+Uploads are stored once per SHA-256 under settings.upload_dir / "store",
+and the filename each was uploaded as is recorded in the upload_aliases
+table. Uploading identical bytes again (under any name) reuses the stored
+file and its saved probe metadata instead of processing it again, and
+two different files uploaded under the same name no longer overwrite
+each other's contents.
+"""
+import hashlib
+import json
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, Any, Iterable, Optional, Tuple
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.upload import UploadBlob, UploadAlias
+from app.models.import_job import ImportJob
+from app.services.import_service import process_uploaded_file
+from app.services.parse_cache import remember_content_hash, invalidate_parsed_upload
+
+# Bytes copied per read while storing an upload
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit."""
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(
+            f"File size exceeds maximum allowed size of {max_size / 1024 / 1024:.1f}MB"
+        )
+
+
+def store_directory() -> Path:
+    """Directory holding stored upload contents."""
+    return settings.upload_dir / "store"
+
+
+def blob_path(blob: UploadBlob) -> Path:
+    """Path of a stored upload's contents."""
+    return store_directory() / f"{blob.content_hash}{blob.suffix}"
+
+
+def upload_path(alias: UploadAlias) -> Path:
+    """Path of the contents an upload alias points at."""
+    return blob_path(alias.blob)
+
+
+def store_upload(source: BinaryIO, suffix: str, max_size: int) -> Tuple[Path, int, str]:
+    """Copy an upload into the store in chunks, hashing it in the same pass.
+    
+    The copy is written to a temporary file and renamed to its content
+    hash once complete; if those contents are already stored the copy is
+    discarded. Blocking; call it from a worker thread.
+    
+    Returns:
+        (stored path, size in bytes, SHA-256 hex digest)
+    
+    Raises:
+        UploadTooLargeError: as soon as more than max_size bytes are read
+    """
+    directory = store_directory()
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp_path = directory / f".{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+    
+    try:
+        with open(tmp_path, "wb") as buffer:
+            for chunk in iter(lambda: source.read(UPLOAD_CHUNK_SIZE), b""):
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLargeError(max_size)
+                digest.update(chunk)
+                buffer.write(chunk)
+        
+        content_hash = digest.hexdigest()
+        stored_path = directory / f"{content_hash}{suffix}"
+        if stored_path.exists():
+            tmp_path.unlink()
+        else:
+            os.replace(tmp_path, stored_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    
+    # Spare the parse cache from hashing the file again
+    remember_content_hash(stored_path, content_hash)
+    return stored_path, size, content_hash
+
+
+def save_upload(db: Session, source: BinaryIO, filename: str, max_size: int) -> UploadAlias:
+    """Store an upload and point the filename's alias at its contents.
+    
+    If the filename previously held other contents that no alias or
+    unfinished import job uses any more, those are removed from the
+    store. Blocking; call it from a worker thread.
+    """
+    stored_path, size, content_hash = store_upload(source, Path(filename).suffix.lower(), max_size)
+    
+    insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    db.execute(
+        insert(UploadBlob.__table__)
+        .values(content_hash=content_hash, size=size, suffix=stored_path.suffix)
+        .on_conflict_do_nothing(index_elements=["content_hash"])
+    )
+    
+    alias = get_upload(db, filename)
+    previous_hash = alias.content_hash if alias else None
+    if alias is None:
+        alias = UploadAlias(filename=filename)
+        db.add(alias)
+    alias.content_hash = content_hash
+    alias.uploaded_at = datetime.now()
+    db.flush()
+    
+    released = None
+    if previous_hash and previous_hash != content_hash:
+        released = _release_blob(db, previous_hash)
+    db.commit()
+    _remove_stored_file(released)
+    db.refresh(alias)
+    return alias
+
+
+def get_upload(db: Session, filename: str) -> Optional[UploadAlias]:
+    """Return the alias for an uploaded filename, or None."""
+    return db.query(UploadAlias).filter(UploadAlias.filename == filename).first()
+
+
+def upload_display_name(db: Session, content_hash: str) -> Optional[str]:
+    """Return the filename these contents were most recently uploaded as."""
+    alias = db.query(UploadAlias).filter(
+        UploadAlias.content_hash == content_hash
+    ).order_by(UploadAlias.uploaded_at.desc()).first()
+    return alias.filename if alias else None
+
+
+def upload_file_info(db: Session, blob: UploadBlob) -> Dict[str, Any]:
+    """Return the probe metadata for stored contents (columns, sample_data,
+    auto_mapping, row_count), processing the file only the first time."""
+    if blob.file_info is None:
+        file_info = process_uploaded_file(blob_path(blob))
+        blob.file_info = json.dumps(file_info, default=_json_default)
+        db.commit()
+    return json.loads(blob.file_info)
+
+
+def delete_upload(db: Session, alias: UploadAlias) -> None:
+    """Remove an upload alias, and its contents if nothing else uses them."""
+    content_hash = alias.content_hash
+    db.delete(alias)
+    db.flush()
+    released = _release_blob(db, content_hash)
+    db.commit()
+    _remove_stored_file(released)
+
+
+def release_job_uploads(db: Session, paths: Iterable[str]) -> None:
+    """Remove stored contents a finished import job was the last user of.
+    
+    Contents replaced or deleted while a job still waited to read them
+    are kept until the job finishes; call this once it has.
+    """
+    released = []
+    for path in paths:
+        path = Path(path)
+        if path.parent.resolve() == store_directory().resolve():
+            released.append(_release_blob(db, path.stem))
+    db.commit()
+    for path in released:
+        _remove_stored_file(path)
+
+
+def _release_blob(db: Session, content_hash: str) -> Optional[Path]:
+    """Delete the record of stored contents that no alias points at and no
+    unfinished import job reads.
+    
+    Returns the path of the contents, for the caller to remove with
+    _remove_stored_file once the deletion is committed, or None if the
+    contents are still in use.
+    """
+    if db.query(UploadAlias.id).filter(UploadAlias.content_hash == content_hash).first():
+        return None
+    
+    blob = db.get(UploadBlob, content_hash)
+    if blob is None:
+        return None
+    path = blob_path(blob)
+    in_use = db.query(ImportJob.id).filter(
+        ImportJob.status.in_(("queued", "running")),
+        or_(ImportJob.file_path.endswith(path.name), ImportJob.sources.contains(path.name))
+    ).first()
+    if in_use:
+        return None
+    db.delete(blob)
+    return path
+
+
+def _remove_stored_file(path: Optional[Path]) -> None:
+    """Remove released contents from the store and the parse cache."""
+    if path is not None and path.exists():
+        invalidate_parsed_upload(path)
+        path.unlink()
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize numpy scalars and timestamps in saved probe metadata."""
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
@@ -1,60 +1,73 @@
 """Validation service for import data."""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable
+import numpy as np
+import pandas as pd
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.models.asset import Asset
-from app.services.asset_service import get_asset_by_tag
+from app.services.delta_service import lookup_assets_by_tag
+from app.validators.validation_rules import load_rules, validate_frame
 
 
-def validate_asset_row(row_data: Dict[str, Any], row_index: int, db: Session) -> List[Dict[str, Any]]:
-    """Validate a single asset row and return list of errors."""
-    errors = []
+def validation_rules():
+    """The compiled validation rules (settings.validation_rules_file, or the defaults)."""
+    return load_rules(settings.validation_rules_file)
+
+
+def validate_rows(transformed_data: List[Dict[str, Any]], existing_tags: Iterable[str]) -> List[Dict[str, Any]]:
+    """Validate transformed rows against the validation rules and the
+    asset tags that already exist.
     
-    # Required field: asset_tag or computer_name
-    if not row_data.get("asset_tag") and not row_data.get("computer_name"):
-        errors.append({
-            "row": row_index + 1,
-            "field": "asset_tag",
-            "message": "Asset tag or computer name is required"
-        })
+    Returns structured errors ordered by row (see validate_frame).
+    """
+    frame = pd.DataFrame.from_records(transformed_data) if transformed_data else pd.DataFrame()
+    errors = validate_frame(frame, validation_rules())
     
-    # Check for duplicate asset_tag
-    if row_data.get("asset_tag"):
-        existing = get_asset_by_tag(db, row_data["asset_tag"])
-        if existing:
+    # Rows whose asset_tag is already in the database
+    if "asset_tag" in frame.columns:
+        asset_tags = frame["asset_tag"].to_numpy(dtype=object)
+        for position in np.flatnonzero(pd.Series(asset_tags, dtype=object).isin(set(existing_tags))).tolist():
             errors.append({
-                "row": row_index + 1,
+                "row": position + 1,
                 "field": "asset_tag",
-                "message": f"Asset tag '{row_data['asset_tag']}' already exists"
+                "rule": "exists",
+                "value": asset_tags[position],
+                "message": f"Asset tag '{asset_tags[position]}' already exists"
             })
-    
-    # Validate status values
-    valid_statuses = ["active", "retired", "in-repair", "lost", "unassigned"]
-    if row_data.get("status") and row_data["status"] not in valid_statuses:
-        errors.append({
-            "row": row_index + 1,
-            "field": "status",
-            "message": f"Invalid status '{row_data['status']}'. Must be one of: {', '.join(valid_statuses)}"
-        })
-    
+        errors.sort(key=lambda error: error["row"])
+    return errors
+
+
+def validate_asset_row(row_data: Dict[str, Any], row_index: int, db: Session) -> List[Dict[str, Any]]:
+    """Validate a single asset row and return list of errors."""
+    asset_tags = [row_data["asset_tag"]] if row_data.get("asset_tag") else []
+    existing = lookup_assets_by_tag(db, asset_tags, [Asset.asset_tag])
+    return check_asset_row(row_data, row_index, bool(existing))
+
+
+def check_asset_row(row_data: Dict[str, Any], row_index: int, tag_exists: bool) -> List[Dict[str, Any]]:
+    """Validate a single asset row given whether its asset_tag already exists."""
+    errors = validate_rows([row_data], [row_data["asset_tag"]] if tag_exists else [])
+    for error in errors:
+        error["row"] = row_index + 1
     return errors
 
 
 def validate_import_data(transformed_data: List[Dict[str, Any]], db: Session) -> Dict[str, Any]:
     """Validate all imported rows and return validation results."""
-    all_errors = []
-    valid_rows = []
-    
-    for i, row in enumerate(transformed_data):
-        errors = validate_asset_row(row, i, db)
-        if errors:
-            all_errors.extend(errors)
-        else:
-            valid_rows.append((i, row))
-    
+    asset_tags = {row.get("asset_tag") for row in transformed_data if row.get("asset_tag")}
+    errors = validate_rows(transformed_data, lookup_assets_by_tag(db, asset_tags, [Asset.asset_tag]))
+    return validation_result(transformed_data, errors)
+
+
+def validation_result(transformed_data: List[Dict[str, Any]], errors: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summarize errors for the rows they were found in."""
+    error_rows = {error["row"] for error in errors}
+    valid_rows = [(i, row) for i, row in enumerate(transformed_data) if i + 1 not in error_rows]
     return {
-        "errors": all_errors,
+        "errors": errors,
         "valid_rows": valid_rows,
         "total_rows": len(transformed_data),
         "valid_count": len(valid_rows),
-        "error_count": len(all_errors)
+        "error_count": len(errors)
     }
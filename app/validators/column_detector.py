@@ -1,5 +1,6 @@
 """Auto-detect column mappings."""
-from typing import Dict, List, Optional
+import re
+from typing import Dict, List, Optional, Tuple
 
 
 # Common field name patterns for auto-detection
@@ -16,22 +17,101 @@ FIELD_PATTERNS = {
 }
 
 
-def detect_column_mapping(source_columns: List[str]) -> Dict[str, Optional[str]]:
-    """Auto-detect column mappings from source column names."""
-    mapping = {}
-    source_lower = [col.lower().strip() for col in source_columns]
+# Scores for a header equal to a pattern, containing it as whole words, or
+# containing it inside a longer word (patterns of three letters or more)
+EXACT_HEADER_SCORE = 1.0
+WORD_HEADER_SCORE = 0.6
+SUBSTRING_HEADER_SCORE = 0.3
+
+# Lowest combined score a column needs to be mapped automatically
+MIN_MAPPING_SCORE = 0.6
+
+# Profiled contents supporting each field, scored 0-1 from a column profile
+CONTENT_SCORES = {
+    "asset_tag": lambda profile: profile["tag_rate"] * profile["unique_ratio"],
+    "computer_name": lambda profile: profile["tag_rate"] * profile["unique_ratio"],
+    "serial_number": lambda profile: (
+        profile["serial_rate"] * (1 - profile["tag_rate"]) * profile["unique_ratio"]
+    ),
+    "operating_system": lambda profile: profile["os_rate"],
+    "status": lambda profile: profile["status_rate"],
+}
+
+# Fields allowed to share a source column with another field
+SHARED_FIELDS = {"computer_name"}
+
+
+def header_score(target_field: str, source_column: str) -> float:
+    """Score how well a header matches a field's name patterns."""
+    header = " ".join(str(source_column).lower().replace("_", " ").split())
+    best = 0.0
+    for pattern in FIELD_PATTERNS[target_field]:
+        pattern = pattern.replace("_", " ")
+        if header == pattern:
+            return EXACT_HEADER_SCORE
+        if re.search(rf"\b{re.escape(pattern)}\b", header):
+            best = max(best, WORD_HEADER_SCORE)
+        elif len(pattern) >= 3 and pattern in header:
+            best = max(best, SUBSTRING_HEADER_SCORE)
+    return best
+
+
+def rank_column_candidates(
+    source_columns: List[str],
+    profiles: Optional[Dict[str, Dict[str, float]]] = None
+) -> Dict[str, List[Tuple[str, float]]]:
+    """Rank the source columns for each target field, best first.
+    
+    A column's score is its header score plus, given column profiles from
+    column_profiler, how well its contents fit the field. Columns scoring
+    zero are left out.
+    """
+    candidates = {}
+    for target_field in FIELD_PATTERNS:
+        content_score = CONTENT_SCORES.get(target_field)
+        scored = []
+        for source_column in source_columns:
+            score = header_score(target_field, source_column)
+            profile = (profiles or {}).get(str(source_column))
+            if content_score and profile:
+                score += content_score(profile)
+            if score > 0:
+                scored.append((source_column, round(score, 3)))
+        candidates[target_field] = sorted(scored, key=lambda candidate: -candidate[1])
+    return candidates
+
+
+def detect_column_mapping(
+    source_columns: List[str],
+    profiles: Optional[Dict[str, Dict[str, float]]] = None
+) -> Dict[str, Optional[str]]:
+    """Auto-detect column mappings from source column names and, if given,
+    column profiles.
     
-    for target_field, patterns in FIELD_PATTERNS.items():
-        matched = None
-        for pattern in patterns:
-            for i, source_col in enumerate(source_lower):
-                if pattern in source_col:
-                    matched = source_columns[i]
-                    break
-            if matched:
-                break
-        mapping[target_field] = matched
+    The best-scoring (field, column) pairs are taken first, so a column
+    goes to the field it fits best; only SHARED_FIELDS may reuse a column.
+    """
+    candidates = rank_column_candidates(source_columns, profiles)
+    pairs = sorted(
+        (
+            (score, -position, target_field, source_column)
+            for target_field, ranked in candidates.items()
+            for position, (source_column, score) in enumerate(ranked)
+            if score >= MIN_MAPPING_SCORE
+        ),
+        key=lambda pair: (-pair[0], -pair[1])
+    )
     
+    mapping: Dict[str, Optional[str]] = dict.fromkeys(FIELD_PATTERNS)
+    used = set()
+    for _, _, target_field, source_column in pairs:
+        if mapping[target_field] is not None:
+            continue
+        if target_field not in SHARED_FIELDS:
+            if source_column in used:
+                continue
+            used.add(source_column)
+        mapping[target_field] = source_column
     return mapping
 
 
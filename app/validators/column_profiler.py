@@ -0,0 +1,170 @@
+"""Profile column contents for auto-mapping.
+
+Header text alone is ambiguous ("ID" may be a user or a device, "Name" a
+host or a person), so uploads also profile the sampled rows of every
+column: null rate, cardinality, value length and how often values look
+like asset tags, serial numbers, operating systems, numbers and statuses.
+column_detector combines these profiles with the header patterns.
+
+Profiling is vectorized across the whole sample: text columns are
+stacked into one string Series, each distinct value is matched against
+the patterns once, and the per-column rates are summed with bincount.
+The patterns avoid lookarounds so pandas can run them in pyarrow's RE2
+engine rather than row by row in Python. Lengths and pattern rates are
+taken over at most MATCH_SAMPLE_ROWS rows per column, which bounds the
+matching when every value is distinct; null rates and cardinality use
+every row.
+"""
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from app.validators.data_cleaner import STATUS_MAP
+
+
+# Host-style asset tags: a letter prefix (site, model) then a serial with digits,
+# e.g. WJBKPWLT0RDJ or NYC-LT-0042
+TAG_PATTERN = r"[A-Za-z]{3,}[A-Za-z0-9-]*[0-9][A-Za-z0-9-]*"
+
+# Serial numbers: 5-20 letters and digits with at least one of each, e.g. 2MQ5520RDJ
+SERIAL_PATTERN = r"[A-Za-z0-9-]*(?:[0-9][A-Za-z0-9-]*[A-Za-z]|[A-Za-z][A-Za-z0-9-]*[0-9])[A-Za-z0-9-]*"
+SERIAL_LENGTH = (5, 20)
+
+OS_PATTERN = (
+    r"(?i)\b(?:windows|win ?(?:7|8|10|11)|mac ?os|os ?x|ubuntu|linux|debian|"
+    r"red ?hat|centos|chrome ?os|ios|ipados|android)\b"
+)
+
+NUMBER_PATTERN = r"[+-]?[0-9]+(?:\.[0-9]+)?"
+
+# Rows per column whose text values are measured and matched against the
+# patterns; the rates settle well within this many rows
+MATCH_SAMPLE_ROWS = 2000
+
+PROFILE_FIELDS = (
+    "null_rate",
+    "cardinality",
+    "unique_ratio",
+    "mean_length",
+    "max_length",
+    "numeric_rate",
+    "tag_rate",
+    "serial_rate",
+    "os_rate",
+    "status_rate",
+)
+
+
+def profile_columns(df: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    """Profile each column of a sample DataFrame.
+    
+    Returns, per column name, the null_rate over all rows and the
+    cardinality (distinct non-null values) with its unique_ratio; the
+    remaining PROFILE_FIELDS are means over the non-null values, with
+    lengths and pattern matches taken on their stripped str() over the
+    first MATCH_SAMPLE_ROWS rows of text columns.
+    """
+    columns = [str(column) for column in df.columns]
+    profiles = {column: dict.fromkeys(PROFILE_FIELDS, 0.0) for column in columns}
+    rows = len(df)
+    if rows == 0:
+        for profile in profiles.values():
+            profile["null_rate"] = 1.0
+        return profiles
+    
+    present_counts = df.notna().sum().to_numpy()
+    numeric = [
+        index for index, column in enumerate(df.columns)
+        if pd.api.types.is_numeric_dtype(df[column]) or pd.api.types.is_bool_dtype(df[column])
+    ]
+    if numeric:
+        cardinality = df.iloc[:, numeric].nunique().to_numpy()
+        for position, index in enumerate(numeric):
+            profile = profiles[columns[index]]
+            profile["cardinality"] = float(cardinality[position])
+            profile["numeric_rate"] = 1.0 if present_counts[index] else 0.0
+    
+    text = sorted(set(range(len(columns))) - set(numeric))
+    if text:
+        _profile_text_columns(df, text, [profiles[columns[index]] for index in text])
+    
+    for index, column in enumerate(columns):
+        profile = profiles[column]
+        profile["null_rate"] = float(1.0 - present_counts[index] / rows)
+        if present_counts[index]:
+            profile["unique_ratio"] = float(profile["cardinality"] / present_counts[index])
+    return profiles
+
+
+def _profile_text_columns(
+    df: pd.DataFrame,
+    indexes: List[int],
+    profiles: List[Dict[str, float]]
+) -> None:
+    """Fill in the profiles of non-numeric columns, all in one pass."""
+    texts = [_as_text(df.iloc[:, index]) for index in indexes]
+    cardinality = [text.nunique() for text in texts]
+    
+    sample_rows = min(len(df), MATCH_SAMPLE_ROWS)
+    stacked = pd.concat([text.iloc[:sample_rows] for text in texts], ignore_index=True)
+    codes = np.repeat(np.arange(len(indexes)), sample_rows)
+    present = stacked.notna().to_numpy()
+    codes = codes[present]
+    
+    # Match each distinct value once; wide exports repeat values heavily
+    inverse, distinct = pd.factorize(stacked[present])
+    distinct = pd.Series(distinct, dtype="str").str.strip()
+    lengths = distinct.str.len().to_numpy(dtype=float)
+    
+    # Only values of a plausible length are matched against the tag, serial
+    # and status patterns
+    identifier = (lengths >= SERIAL_LENGTH[0]) & (lengths <= SERIAL_LENGTH[1])
+    short = lengths <= max(len(status) for status in STATUS_MAP)
+    matches = {
+        "mean_length": lengths,
+        "numeric_rate": _match_rate(distinct, None, lambda text: text.str.fullmatch(NUMBER_PATTERN)),
+        "tag_rate": _match_rate(distinct, identifier, lambda text: text.str.fullmatch(TAG_PATTERN)),
+        "serial_rate": _match_rate(distinct, identifier, lambda text: text.str.fullmatch(SERIAL_PATTERN)),
+        "os_rate": _match_rate(distinct, None, lambda text: text.str.contains(OS_PATTERN)),
+        "status_rate": _match_rate(distinct, short, lambda text: text.str.lower().isin(list(STATUS_MAP))),
+    }
+    
+    counts = np.bincount(codes, minlength=len(indexes))
+    divisor = np.maximum(counts, 1)
+    sums = {
+        field: np.bincount(codes, weights=per_value[inverse], minlength=len(indexes)) / divisor
+        for field, per_value in matches.items()
+    }
+    
+    max_length = np.zeros(len(indexes))
+    np.maximum.at(max_length, codes, lengths[inverse])
+    
+    for position, profile in enumerate(profiles):
+        for field, values_by_column in sums.items():
+            profile[field] = float(values_by_column[position])
+        profile["max_length"] = float(max_length[position])
+        profile["cardinality"] = float(cardinality[position])
+
+
+def _match_rate(
+    distinct: pd.Series,
+    candidates: Optional[np.ndarray],
+    match: Callable[[pd.Series], pd.Series]
+) -> np.ndarray:
+    """Apply match to the candidate values (all if None); 1.0 where it matched."""
+    result = np.zeros(len(distinct))
+    if candidates is None:
+        result[:] = match(distinct).to_numpy(dtype=float)
+    elif candidates.any():
+        result[candidates] = match(distinct[candidates]).to_numpy(dtype=float)
+    return result
+
+
+def _as_text(values: pd.Series) -> pd.Series:
+    """Convert a column to text, keeping missing values missing.
+    
+    Before pandas 3, astype("str") turns NaN and None into the strings
+    "nan" and "None", so missing values are masked back explicitly.
+    """
+    if values.dtype == "str":
+        return values
+    return values.astype("str").where(values.notna())
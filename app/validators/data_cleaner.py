@@ -1,9 +1,40 @@
 """Data normalization and cleaning functions."""
 import re
+import numpy as np
 import pandas as pd
 from typing import Optional, Dict
 
 
+# Known department spellings and their canonical form
+DEPARTMENT_MAP = {
+    "IT": "IT",
+    "NEWS": "NEWS",
+    "SALES": "SALES",
+    "ENG": "ENG",
+    "ENGINEERING": "ENG",
+    "WEATHER": "WEATHER",
+    "SPORTS": "SPORTS",
+    "CREATIVE SERVICES": "CREATIVE SERVICES",
+    "CREATIVE": "CREATIVE SERVICES",
+    "ACCOUNTING": "ACCOUNTING",
+    "FINANCE": "FINANCE",
+}
+
+# Source status values and the asset status they map to
+STATUS_MAP = {
+    "active": "active",
+    "inactive": "retired",
+    "retired": "retired",
+    "in-repair": "in-repair",
+    "repair": "in-repair",
+    "lost": "lost",
+    "unassigned": "unassigned",
+}
+
+# str() as a ufunc so whole object arrays convert in one call
+_to_str = np.frompyfunc(str, 1, 1)
+
+
 def normalize_department(dept: Optional[str]) -> Optional[str]:
     """Normalize department name (case-insensitive, standardize to uppercase)."""
     if not dept or pd.isna(dept):
@@ -16,27 +47,12 @@ def normalize_department(dept: Optional[str]) -> Optional[str]:
     # Normalize common variations
     dept_upper = dept_str.upper()
     
-    # Handle case-insensitive matching for known departments
-    department_map = {
-        "IT": "IT",
-        "NEWS": "NEWS",
-        "SALES": "SALES",
-        "ENG": "ENG",
-        "ENGINEERING": "ENG",
-        "WEATHER": "WEATHER",
-        "SPORTS": "SPORTS",
-        "CREATIVE SERVICES": "CREATIVE SERVICES",
-        "CREATIVE": "CREATIVE SERVICES",
-        "ACCOUNTING": "ACCOUNTING",
-        "FINANCE": "FINANCE",
-    }
-    
     # Try exact match first
-    if dept_upper in department_map:
-        return department_map[dept_upper]
+    if dept_upper in DEPARTMENT_MAP:
+        return DEPARTMENT_MAP[dept_upper]
     
     # Try case-insensitive match
-    for key, value in department_map.items():
+    for key, value in DEPARTMENT_MAP.items():
         if dept_upper == key.upper():
             return value
     
@@ -88,14 +104,66 @@ def normalize_status(status: Optional[str]) -> str:
     
     status_str = str(status).strip().lower()
     
-    status_map = {
-        "active": "active",
-        "inactive": "retired",
-        "retired": "retired",
-        "in-repair": "in-repair",
-        "repair": "in-repair",
-        "lost": "lost",
-        "unassigned": "unassigned",
-    }
-    
-    return status_map.get(status_str, "active")
+    return STATUS_MAP.get(status_str, "active")
+
+
+def _clean_text_column(values: pd.Series) -> np.ndarray:
+    """Return stripped str() of each value, None where empty or NA."""
+    raw = values.to_numpy(dtype=object)
+    present = raw.astype(bool) & ~pd.isna(raw)
+    text = np.full(len(raw), None, dtype=object)
+    if present.any():
+        stripped = pd.Series(_to_str(raw[present]), dtype=object).str.strip()
+        text[present] = stripped.to_numpy(dtype=object)
+    # Whitespace-only values strip down to "" and count as empty
+    text[~text.astype(bool)] = None
+    return text
+
+
+def normalize_department_column(values: pd.Series) -> pd.Series:
+    """Column-wise normalize_department."""
+    text = _clean_text_column(values)
+    present = text.astype(bool)
+    result = np.full(len(text), None, dtype=object)
+    if present.any():
+        upper = pd.Series(text[present], dtype=object).str.upper().to_numpy(dtype=object)
+        mapped = pd.Series(upper, dtype=object).map(DEPARTMENT_MAP).to_numpy(dtype=object)
+        unmapped = pd.isna(mapped)
+        mapped[unmapped] = upper[unmapped]
+        result[present] = mapped
+    return pd.Series(result, index=values.index, dtype=object)
+
+
+def parse_notes_user_column(values: pd.Series) -> pd.Series:
+    """Column-wise parse_notes, returning only the extracted user name."""
+    text = _clean_text_column(values)
+    present = text.astype(bool)
+    result = np.full(len(text), None, dtype=object)
+    if present.any():
+        # Text is already stripped, so the part before the first " - " is the
+        # user name whether or not a separator exists
+        head = pd.Series(text[present], dtype=object).str.split(" - ", n=1).str[0].str.strip()
+        result[present] = head.to_numpy(dtype=object)
+    return pd.Series(result, index=values.index, dtype=object)
+
+
+def clean_asset_tag_column(values: pd.Series) -> pd.Series:
+    """Column-wise clean_asset_tag."""
+    text = _clean_text_column(values)
+    present = text.astype(bool)
+    if present.any():
+        text[present] = pd.Series(text[present], dtype=object).str.upper().to_numpy(dtype=object)
+    return pd.Series(text, index=values.index, dtype=object)
+
+
+def normalize_status_column(values: pd.Series) -> pd.Series:
+    """Column-wise normalize_status."""
+    raw = values.to_numpy(dtype=object)
+    present = raw.astype(bool) & ~pd.isna(raw)
+    result = np.full(len(raw), "active", dtype=object)
+    if present.any():
+        lowered = pd.Series(_to_str(raw[present]), dtype=object).str.strip().str.lower()
+        mapped = lowered.map(STATUS_MAP).to_numpy(dtype=object)
+        mapped[pd.isna(mapped)] = "active"
+        result[present] = mapped
+    return pd.Series(result, index=values.index, dtype=object)
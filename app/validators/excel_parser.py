@@ -1,17 +1,268 @@
-"""Excel parsing utilities."""
+"""Excel parsing utilities.
+
+All reads go through read_sheet, which picks a reader backend for the
+file: the Rust-based calamine reader for workbooks when python-calamine
+is installed (much faster than openpyxl), openpyxl otherwise, and
+pandas' C parser for CSV and TSV files. settings.excel_reader can force
+a workbook backend.
+"""
+import codecs
+import importlib.util
+import logging
+import re
+import zipfile
+import xml.etree.ElementTree as ET
 import pandas as pd
-from typing import List, Dict, Any
+from pandas.api.types import infer_dtype
+from typing import List, Dict, Any, Optional, Union
 from pathlib import Path
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# OOXML namespaces used to locate the first worksheet in a workbook
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_DOC_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+# Row end tags and cell value elements in raw sheet XML, with or without a
+# namespace prefix (some export tools write <x:row>)
+_ROW_END = re.compile(rb"</(?:\w+:)?row>")
+_CELL_VALUE = re.compile(rb"<(?:\w+:)?(?:v|is)\b")
+
+
+# Text columns with at most this share of distinct values become categoricals
+CATEGORICAL_MAX_RATIO = 0.5
+
+# Workbook reader backends, fastest first; "auto" uses the first installed
+EXCEL_ENGINES = ("calamine", "openpyxl")
+
+# Delimited text formats read with pandas' C parser, by suffix
+DELIMITERS = {".csv": ",", ".tsv": "\t"}
+
+# Encodings tried for delimited files, in order: UTF-8 (with or without a
+# byte order mark), then the Windows code page Excel exports CSV in
+TEXT_ENCODINGS = ("utf-8-sig", "cp1252")
+
+# Bytes decoded per read while detecting a delimited file's encoding
+ENCODING_CHECK_CHUNK_SIZE = 1024 * 1024
+
+# Name of the single sheet of a delimited file
+DELIMITED_SHEET_NAME = "Sheet1"
+
+# File types accepted for upload and import
+SUPPORTED_SUFFIXES = (".xlsx", ".xls") + tuple(DELIMITERS)
+
+_warned_engines = set()
+
+
+def is_supported_file(filename: str) -> bool:
+    """Whether a filename has a suffix the parser can read."""
+    return Path(filename).suffix.lower() in SUPPORTED_SUFFIXES
+
+
+def engine_available(engine: str) -> bool:
+    """Whether a workbook reader backend is installed."""
+    if engine == "calamine":
+        # pandas only gained the calamine engine in 2.2
+        pandas_version = tuple(int(part) for part in pd.__version__.split(".")[:2])
+        return pandas_version >= (2, 2) and importlib.util.find_spec("python_calamine") is not None
+    return importlib.util.find_spec(engine) is not None
 
 
-def parse_excel_file(file_path: Path) -> pd.DataFrame:
-    """Parse Excel file and return DataFrame."""
-    df = pd.read_excel(file_path, sheet_name=0)
+def excel_engine(file_path: Path) -> Optional[str]:
+    """Return the pd.read_excel engine for a workbook, per settings.excel_reader.
+    
+    "auto" picks the fastest installed backend. A configured backend that
+    is not installed falls back to the default with a warning. None lets
+    pandas choose (xlrd for .xls files).
+    """
+    configured = settings.excel_reader
+    candidates = EXCEL_ENGINES if configured == "auto" else (configured,)
+    for engine in candidates:
+        if engine_available(engine):
+            if engine == "openpyxl" and Path(file_path).suffix.lower() != ".xlsx":
+                return None
+            return engine
+        if configured != "auto" and engine not in _warned_engines:
+            _warned_engines.add(engine)
+            logger.warning(f"excel_reader {engine!r} is not installed; falling back to the default reader")
+    return "openpyxl" if Path(file_path).suffix.lower() == ".xlsx" else None
+
+
+def read_sheet(
+    file_path: Path,
+    sheet_name: Union[str, int] = 0,
+    nrows: Optional[int] = None,
+    engine: Optional[str] = None,
+    columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Read one sheet of a workbook, or a CSV/TSV file, into a DataFrame.
+    
+    engine overrides the backend excel_engine would pick. Delimited files
+    have a single sheet, so sheet_name is ignored for them. With columns,
+    only those columns are read (names missing from the sheet are
+    ignored). Empty rows are kept, as pd.read_excel keeps them.
+    """
+    usecols = None
+    if columns is not None:
+        wanted = set(columns)
+        usecols = lambda name: name in wanted
+    suffix = Path(file_path).suffix.lower()
+    if suffix in DELIMITERS:
+        return pd.read_csv(
+            file_path,
+            sep=DELIMITERS[suffix],
+            nrows=nrows,
+            usecols=usecols,
+            engine="c",
+            skip_blank_lines=False,
+            encoding=detect_text_encoding(file_path)
+        )
+    return pd.read_excel(
+        file_path,
+        sheet_name=sheet_name,
+        nrows=nrows,
+        usecols=usecols,
+        engine=engine or excel_engine(file_path)
+    )
+
+
+def detect_text_encoding(file_path: Path) -> str:
+    """Return the first of TEXT_ENCODINGS that decodes the whole file.
+    
+    Raises:
+        ValueError: if none does, rather than substituting characters
+    """
+    for encoding in TEXT_ENCODINGS:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            with open(file_path, "rb") as source:
+                for chunk in iter(lambda: source.read(ENCODING_CHECK_CHUNK_SIZE), b""):
+                    decoder.decode(chunk)
+                decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+    raise ValueError(
+        f"{Path(file_path).name} is not UTF-8 or Windows-1252 text; save it as UTF-8 CSV and upload it again"
+    )
+
+
+def parse_excel_file(
+    file_path: Path,
+    sheet_name: Union[str, int] = 0,
+    columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Parse one sheet of an Excel file (the first by default), or a CSV/TSV
+    file, and return DataFrame.
+    
+    With columns, only those columns are read, which spares converting
+    and holding the cells of the others (names missing from the sheet are
+    ignored), and their dtypes are compacted with compact_dtypes. Rows
+    empty in every selected column are dropped, even if they hold values
+    in other columns.
+    """
+    df = read_sheet(file_path, sheet_name, columns=columns)
     # Remove completely empty rows
     df = df.dropna(how='all').reset_index(drop=True)
+    if columns is None:
+        return df
+    return compact_dtypes(df)
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Store low-cardinality text columns (department, OS, status...) as
+    categoricals and other text columns as strings, in place."""
+    for column in df.columns:
+        values = df[column]
+        if infer_dtype(values, skipna=True) != "string":
+            continue
+        present = values.count()
+        if present and values.nunique() <= present * CATEGORICAL_MAX_RATIO:
+            df[column] = values.astype("category")
+        elif values.dtype == object:
+            df[column] = values.astype(pd.StringDtype("pyarrow"))
     return df
 
 
+def list_sheet_names(file_path: Path) -> List[str]:
+    """Return the names of a workbook's sheets in workbook order.
+    
+    A CSV or TSV file has a single sheet, named Sheet1.
+    """
+    if Path(file_path).suffix.lower() in DELIMITERS:
+        return [DELIMITED_SHEET_NAME]
+    with pd.ExcelFile(file_path, engine=excel_engine(file_path)) as workbook:
+        return [str(name) for name in workbook.sheet_names]
+
+
+def probe_excel_file(file_path: Path, num_rows: int = 5, profile_rows: int = 0) -> Dict[str, Any]:
+    """Read an .xlsx workbook's header, first rows and row count.
+    
+    Only the rows needed for the sample (or the first profile_rows rows,
+    if more) are parsed; the row count comes from a streaming scan of the
+    sheet XML. Raises ValueError for workbooks that cannot be probed
+    (e.g. legacy .xls files).
+    
+    Returns:
+        {"columns": [...], "sample_data": [...], "row_count": int,
+         "sample_frame": DataFrame of the non-blank rows read}
+    """
+    row_count = count_data_rows(file_path)
+    
+    # Read a few extra rows so blank rows do not starve the sample
+    window = max(num_rows * 4, 20, profile_rows)
+    while True:
+        df = read_sheet(file_path, nrows=window)
+        sample = df.dropna(how='all').reset_index(drop=True)
+        if len(sample) >= num_rows or len(df) < window or window >= row_count:
+            break
+        window *= 4
+    
+    return {
+        "columns": get_column_names(df),
+        "sample_data": get_sample_data(sample, num_rows=num_rows),
+        "row_count": row_count,
+        "sample_frame": sample
+    }
+
+
+def count_data_rows(file_path: Path) -> int:
+    """Count the non-empty rows below the header of an .xlsx workbook's first sheet.
+    
+    Streams the raw sheet XML instead of building cells, counting rows that
+    hold at least one value.
+    """
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            sheet_path = _first_worksheet_path(archive)
+            rows_with_values = 0
+            pending = b""
+            with archive.open(sheet_path) as sheet:
+                for chunk in iter(lambda: sheet.read(1024 * 1024), b""):
+                    rows = _ROW_END.split(pending + chunk)
+                    pending = rows.pop()
+                    rows_with_values += sum(1 for row in rows if _CELL_VALUE.search(row))
+    except (zipfile.BadZipFile, KeyError, StopIteration, ET.ParseError) as e:
+        raise ValueError(f"Cannot probe workbook {file_path.name}: {e}") from e
+    
+    # The first row with values is the header
+    return max(rows_with_values - 1, 0)
+
+
+def _first_worksheet_path(archive: zipfile.ZipFile) -> str:
+    """Resolve the archive path of the first worksheet in tab order."""
+    workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+    relationships = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in relationships}
+    
+    for sheet in workbook.iter(f"{_NS_MAIN}sheet"):
+        target = targets.get(sheet.get(f"{_NS_DOC_REL}id"), "")
+        if "worksheets/" in target:
+            return target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+    raise KeyError("workbook has no worksheets")
+
+
 def get_column_names(df: pd.DataFrame) -> List[str]:
     """Get column names from DataFrame."""
     return df.columns.tolist()
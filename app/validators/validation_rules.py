@@ -0,0 +1,239 @@
+"""Configurable validation rules for transformed import rows.
+
+Rules are data, read from a JSON list (validation_rules.json next to this
+module, or settings.validation_rules_file), so they can be changed
+without code changes. Each entry names a rule type and its options:
+
+    {"rule": "required", "fields": [...]}     one of the fields has a value
+    {"rule": "enum", "field": ..., "values": [...]}
+    {"rule": "max_length"}                    AssetBase's limits, or one
+                                              "field" with a "max_length"
+    {"rule": "pattern", "field": ..., "pattern": ...}   full match
+    {"rule": "unique", "field": ...}          a value repeated within the
+                                              file fails on all but its last
+                                              row, which is imported
+
+Any entry may set "message", formatted with {field} (or capitalized,
+{Field}), {value} and the rule's options ({values}, {max_length}, {pattern}, {count}, {rows}, {kept}).
+{rows} lists at most UNIQUE_ROWS_LISTED row numbers; {kept} is the row imported.
+
+Rules are compiled once into checks that evaluate a whole transformed
+DataFrame as boolean masks, so validating a file costs a few vectorized
+passes per rule; messages are only formatted for the failing rows.
+"""
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from app.schemas.asset import AssetBase
+
+DEFAULT_RULES_FILE = Path(__file__).with_name("validation_rules.json")
+
+DEFAULT_MESSAGES = {
+    "required": "{Field} is required",
+    "enum": "Invalid {field} '{value}'. Must be one of: {values}",
+    "max_length": "{Field} '{value}' is longer than {max_length} characters",
+    "pattern": "{Field} '{value}' does not match the expected format",
+    "unique": "{Field} '{value}' appears {count} times in this file (rows {rows}); row {kept} is imported",
+}
+
+# Rows listed in a unique rule's message; a value repeated more often ends
+# the list with "and N more"
+UNIQUE_ROWS_LISTED = 10
+
+# Errors for one rule: (0-based row position, field, value, message)
+RuleErrors = List[Tuple[int, str, Optional[str], str]]
+
+# A compiled rule: its type and the check evaluating it
+Check = Tuple[str, Callable[["_Columns"], RuleErrors]]
+
+
+def schema_max_lengths() -> Dict[str, int]:
+    """Maximum lengths of the AssetBase string fields."""
+    limits = {}
+    for name, field in AssetBase.model_fields.items():
+        for constraint in field.metadata:
+            max_length = getattr(constraint, "max_length", None)
+            if max_length is not None:
+                limits[name] = max_length
+    return limits
+
+
+def compile_rules(config: List[Dict[str, Any]]) -> List[Check]:
+    """Compile rule entries into checks over a transformed DataFrame.
+    
+    Raises:
+        ValueError: for an unknown rule type or missing options
+    """
+    checks = []
+    for entry in config:
+        compiler = _COMPILERS.get(entry.get("rule"))
+        if compiler is None:
+            raise ValueError(f"Unknown validation rule: {entry.get('rule')!r}")
+        try:
+            message = entry.get("message") or DEFAULT_MESSAGES[entry["rule"]]
+            checks.append((entry["rule"], compiler(entry, message)))
+        except KeyError as e:
+            raise ValueError(f"Validation rule {entry['rule']!r} is missing option {e}") from e
+    return checks
+
+
+@lru_cache(maxsize=4)
+def load_rules(path: Optional[Path] = None) -> List[Check]:
+    """Read and compile the rules file (the bundled defaults if path is None).
+    
+    Compiled rules are cached, so edits to the file apply after a restart.
+    """
+    with open(path or DEFAULT_RULES_FILE) as rules_file:
+        return compile_rules(json.load(rules_file))
+
+
+def validate_frame(frame: pd.DataFrame, checks: List[Check]) -> List[Dict[str, Any]]:
+    """Run checks over a transformed DataFrame.
+    
+    Returns errors ordered by row, then rule, as dicts with the 1-based
+    row, the field, the rule type, the offending value (as text, or None)
+    and the message.
+    """
+    columns = _Columns(frame)
+    errors = []
+    for rule, check in checks:
+        for position, field, value, message in check(columns):
+            errors.append({
+                "row": position + 1,
+                "field": field,
+                "rule": rule,
+                "value": value,
+                "message": message
+            })
+    errors.sort(key=lambda error: error["row"])
+    return errors
+
+
+class _Columns:
+    """Per-field views of a transformed DataFrame, computed once and shared by the checks."""
+    
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self.row_count = len(frame)
+        self._present: Dict[str, np.ndarray] = {}
+        self._text: Dict[str, pd.Series] = {}
+    
+    def present(self, field: str) -> np.ndarray:
+        """Mask of rows where field has a non-empty value."""
+        if field not in self._present:
+            if field in self.frame.columns:
+                values = self.frame[field].to_numpy(dtype=object)
+                mask = ~pd.isna(values)
+                mask[mask] = values[mask].astype(bool)
+            else:
+                mask = np.zeros(self.row_count, dtype=bool)
+            self._present[field] = mask
+        return self._present[field]
+    
+    def text(self, field: str) -> pd.Series:
+        """str() of field's present values, indexed by row position."""
+        if field not in self._text:
+            present = self.present(field)
+            values = self.frame[field].to_numpy(dtype=object)[present] if present.any() else []
+            self._text[field] = pd.Series(values, index=np.flatnonzero(present), dtype=object).astype("str")
+        return self._text[field]
+
+
+def _labels(field: str) -> Dict[str, str]:
+    """Human-readable names of a field for messages, as {field} and {Field}."""
+    label = field.replace("_", " ")
+    return {"field": label, "Field": label.capitalize()}
+
+
+def _failures(text: pd.Series, failed: np.ndarray, field: str, message: str, **options) -> RuleErrors:
+    """Format the errors for the failing entries of a field's text values."""
+    failing = text[failed]
+    return [
+        (position, field, value, message.format(value=value, **_labels(field), **options))
+        for position, value in zip(failing.index.tolist(), failing.tolist())
+    ]
+
+
+def _compile_required(entry: Dict[str, Any], message: str) -> Callable[[_Columns], RuleErrors]:
+    """One of fields must have a value."""
+    fields = entry["fields"]
+    
+    def check(columns: _Columns) -> RuleErrors:
+        missing = np.ones(columns.row_count, dtype=bool)
+        for field in fields:
+            missing &= ~columns.present(field)
+        return [
+            (position, fields[0], None, message.format(value="", **_labels(fields[0])))
+            for position in np.flatnonzero(missing).tolist()
+        ]
+    return check
+
+
+def _compile_enum(entry: Dict[str, Any], message: str) -> Callable[[_Columns], RuleErrors]:
+    """field's value must be one of values."""
+    field, allowed = entry["field"], list(entry["values"])
+    
+    def check(columns: _Columns) -> RuleErrors:
+        text = columns.text(field)
+        return _failures(text, ~text.isin(allowed).to_numpy(), field, message, values=", ".join(allowed))
+    return check
+
+
+def _compile_max_length(entry: Dict[str, Any], message: str) -> Callable[[_Columns], RuleErrors]:
+    """Values must fit their field's maximum length."""
+    limits = {entry["field"]: entry["max_length"]} if "field" in entry else schema_max_lengths()
+    
+    def check(columns: _Columns) -> RuleErrors:
+        errors = []
+        for field, max_length in limits.items():
+            text = columns.text(field)
+            too_long = (text.str.len() > max_length).to_numpy()
+            errors.extend(_failures(text, too_long, field, message, max_length=max_length))
+        return errors
+    return check
+
+
+def _compile_pattern(entry: Dict[str, Any], message: str) -> Callable[[_Columns], RuleErrors]:
+    """field's value must fully match pattern."""
+    field, pattern = entry["field"], entry["pattern"]
+    
+    def check(columns: _Columns) -> RuleErrors:
+        text = columns.text(field)
+        return _failures(text, ~text.str.fullmatch(pattern).to_numpy(dtype=bool), field, message, pattern=pattern)
+    return check
+
+
+def _compile_unique(entry: Dict[str, Any], message: str) -> Callable[[_Columns], RuleErrors]:
+    """field's values must not repeat within the file.
+    
+    The last row with a value wins, as the last sheet does when a batch
+    import repeats a tag, so only the earlier rows fail.
+    """
+    field = entry["field"]
+    
+    def check(columns: _Columns) -> RuleErrors:
+        text = columns.text(field)
+        repeated = text[text.duplicated(keep=False).to_numpy()]
+        errors = []
+        for value, positions in repeated.groupby(repeated, sort=False).groups.items():
+            rows = ", ".join(str(position + 1) for position in positions[:UNIQUE_ROWS_LISTED])
+            if len(positions) > UNIQUE_ROWS_LISTED:
+                rows += f" and {len(positions) - UNIQUE_ROWS_LISTED} more"
+            formatted = message.format(
+                value=value, count=len(positions), rows=rows, kept=positions[-1] + 1, **_labels(field)
+            )
+            errors.extend((position, field, value, formatted) for position in positions[:-1].tolist())
+        return errors
+    return check
+
+
+_COMPILERS: Dict[str, Callable[[Dict[str, Any], str], Callable[[_Columns], RuleErrors]]] = {
+    "required": _compile_required,
+    "enum": _compile_enum,
+    "max_length": _compile_max_length,
+    "pattern": _compile_pattern,
+    "unique": _compile_unique,
+}
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Benchmark asset writes and reads under the previous and current indexes.
+
+Builds the assets table twice in a temporary SQLite database, once with
+the indexes it had before they were reworked (duplicates of each
+single-column index, one on the primary key, no composites) and once
+with the model's, and times bulk inserts, single-row updates and the
+reads the asset list, verification, reports and dashboard run. Reports
+read their first 1,000 rows, which is where a sort of every matching
+row shows.
+
+Usage:
+    python benchmarks/bench_asset_indexes.py [rows ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import random
+from datetime import date, timedelta
+from itertools import islice
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import Base  # noqa: E402
+from app.models.asset import Asset  # noqa: E402
+from app.models.asset_search import create_asset_search_index  # noqa: E402
+from app.services import asset_service  # noqa: E402
+
+# Indexes on assets before the rework, besides the unique ix_assets_asset_tag
+PREVIOUS_INDEXES = {
+    "ix_assets_id": ["id"],
+    "idx_asset_tag": ["asset_tag"],
+    "ix_assets_status": ["status"],
+    "idx_status": ["status"],
+    "ix_assets_department": ["department"],
+    "idx_department": ["department"],
+    "ix_assets_refresh_due_date": ["refresh_due_date"],
+    "idx_refresh_due_date": ["refresh_due_date"],
+    "ix_assets_assigned_user_id": ["assigned_user_id"],
+    "idx_assigned_user_id": ["assigned_user_id"],
+    "idx_computer_name": ["computer_name"],
+    "idx_assigned_user_name": ["assigned_user_name"],
+    "idx_device_type": ["device_type"],
+    "idx_last_verified_at": ["last_verified_at"],
+}
+DEPARTMENTS = ["IT", "NEWS", "SALES", "ENGINEERING", "CREATIVE", "WEATHER", None]
+STATUSES = ["active"] * 17 + ["retired"] * 2 + ["unassigned"]
+NAMES = ["McGonagle, Paul", "Carlton, Anne Marie", "Brown, Chris", "Wentworth, Matt", "", None]
+UPDATES = 20_000
+REPEATS = 5
+
+
+def use_previous_indexes(engine) -> None:
+    """Swap the model's indexes on assets for the previous ones."""
+    with engine.begin() as connection:
+        for index in Asset.__table__.indexes:
+            if not index.unique:
+                connection.execute(text(f"DROP INDEX {index.name}"))
+        for name, columns in PREVIOUS_INDEXES.items():
+            connection.execute(text(f"CREATE INDEX {name} ON assets ({', '.join(columns)})"))
+
+
+def fill(db, rows: int, seed: int = 0) -> float:
+    """Insert synthetic assets in import-sized batches, returning rows per second."""
+    rng = random.Random(seed)
+    today = date.today()
+    start_time = time.perf_counter()
+    for start in range(0, rows, 5_000):
+        db.execute(Asset.__table__.insert(), [
+            {
+                "asset_tag": f"WJBKPWLT{i:06X}",
+                "computer_name": f"WJBKPWLT{i:06X}",
+                "department": rng.choice(DEPARTMENTS),
+                "assigned_user_name": rng.choice(NAMES),
+                "assigned_user_id": f"U{rng.randrange(rows):06d}",
+                "status": rng.choice(STATUSES),
+                "refresh_due_date": today + timedelta(days=rng.randint(-365, 3 * 365)),
+            }
+            for i in range(start, min(start + 5_000, rows))
+        ])
+        db.commit()
+    return rows / (time.perf_counter() - start_time)
+
+
+def update(db, rows: int, seed: int = 1) -> float:
+    """Change status, department and refresh date of random assets one
+    row at a time, returning rows per second."""
+    rng = random.Random(seed)
+    today = date.today()
+    table = Asset.__table__
+    start_time = time.perf_counter()
+    db.execute(
+        table.update().where(table.c.id == text(":asset_id")),
+        [
+            {
+                "asset_id": rng.randint(1, rows),
+                "status": rng.choice(STATUSES),
+                "department": rng.choice(DEPARTMENTS),
+                "refresh_due_date": today + timedelta(days=rng.randint(0, 3 * 365)),
+            }
+            for _ in range(UPDATES)
+        ]
+    )
+    db.commit()
+    return UPDATES / (time.perf_counter() - start_time)
+
+
+def first_rows(query, rows: int = 1_000):
+    """The first rows of a report."""
+    return query.limit(rows).all()
+
+
+def reads(db) -> dict:
+    """The read workload, as {name: function}."""
+    due_date = date.today() + timedelta(days=90)
+    active = db.query(Asset).filter(Asset.status == "active")
+    return {
+        "list: status": lambda: asset_service.get_assets(db, status="active"),
+        "list: department": lambda: asset_service.get_assets(db, department="NEWS"),
+        "list: status+department": lambda: asset_service.get_assets(db, status="active", department="NEWS"),
+        "count: status+department": lambda: (
+            asset_service._asset_counts.clear(),
+            asset_service.count_assets(db, status="active", department="NEWS"),
+        ),
+        "verification campaign": lambda: list(islice(
+            asset_service.iter_assets(db, department="NEWS", status="active"), 1_000
+        )),
+        "report: refresh schedule": lambda: first_rows(active.filter(
+            Asset.refresh_due_date.isnot(None), Asset.refresh_due_date <= due_date
+        ).order_by(Asset.refresh_due_date)),
+        "report: department": lambda: first_rows(active.order_by(Asset.department, Asset.asset_tag)),
+        "report: unassigned": lambda: first_rows(active.filter(
+            (Asset.assigned_user_name.is_(None) | (Asset.assigned_user_name == ""))
+        ).order_by(Asset.department, Asset.asset_tag)),
+        "dashboard": lambda: (
+            asset_service.get_dashboard_stats(db),
+            asset_service.get_department_counts(db),
+        ),
+    }
+
+
+def timed(func) -> float:
+    """Return milliseconds per call."""
+    func()
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        func()
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def measure(path: str, rows: int, previous: bool) -> dict:
+    """Build one variant and return its {measurement: value}."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        create_asset_search_index(connection)
+    if previous:
+        use_previous_indexes(engine)
+    asset_service._asset_counts.clear()
+    db = sessionmaker(bind=engine)()
+    results = {"insert (rows/s)": fill(db, rows), "update (rows/s)": update(db, rows)}
+    for name, func in reads(db).items():
+        results[f"{name} (ms)"] = timed(func)
+    db.close()
+    engine.dispose()
+    return results
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [200_000]
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            before = measure(f"{tmp}/before_{rows}.db", rows, previous=True)
+            after = measure(f"{tmp}/after_{rows}.db", rows, previous=False)
+            print(f"{rows} rows")
+            print(f"{'':28} {'previous':>10} {'current':>10} {'change':>8}")
+            for name in before:
+                print(f"{name:28} {before[name]:>10.1f} {after[name]:>10.1f} {after[name] / before[name]:>7.2f}x")
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark deep asset list pages: OFFSET against keyset cursors.
+
+Fills a temporary SQLite database with synthetic assets and times
+fetching one page at increasing depths, sorted by a unique column
+(asset_tag) and by a nullable, repetitive one (department), both as the
+previous OFFSET/LIMIT query and through get_assets' cursors. The total
+count, which is the same for every page, is left out. Checks both return
+the same page.
+
+Usage:
+    python benchmarks/bench_asset_pages.py [rows ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import random
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import Base  # noqa: E402
+from app.models.asset import Asset  # noqa: E402
+from app.services import asset_service  # noqa: E402
+
+PAGE_SIZE = 50
+DEPTHS = (0.0, 0.1, 0.5, 0.9)
+DEPARTMENTS = ["IT", "NEWS", "SALES", "ENGINEERING", "CREATIVE", "WEATHER", None]
+REPEATS = 10
+
+
+def fill(db, rows: int, seed: int = 0) -> None:
+    """Insert synthetic assets, in batches."""
+    rng = random.Random(seed)
+    for start in range(0, rows, 50_000):
+        db.execute(Asset.__table__.insert(), [
+            {"asset_tag": f"WJBKPWLT{i:06X}", "department": rng.choice(DEPARTMENTS), "status": "active"}
+            for i in range(start, min(start + 50_000, rows))
+        ])
+    db.commit()
+
+
+def offset_page(db, sort_by: str, skip: int):
+    """The previous page query."""
+    column = getattr(Asset, sort_by)
+    return db.query(Asset).order_by(column.asc(), Asset.id.asc()).offset(skip).limit(PAGE_SIZE).all()
+
+
+def cursor_at(db, sort_by: str, skip: int):
+    """The cursor a reader paging through to skip would hold."""
+    if skip == 0:
+        return None
+    asset = offset_page(db, sort_by, skip - 1)[0]
+    return asset_service.encode_cursor(sort_by, "asc", "after", (asset, getattr(asset, sort_by)))
+
+
+def keyset_page(db, sort_by: str, cursor):
+    """One page by cursor, without the count."""
+    key = getattr(Asset, sort_by)
+    position = None
+    if cursor:
+        _, position = asset_service.decode_cursor(cursor, sort_by, "asc", key.type.python_type)
+    nullable = Asset.__table__.c[sort_by].nullable
+    return [asset for asset, _ in asset_service._seek(db.query(Asset), key, nullable, False, position, PAGE_SIZE)]
+
+
+def timed(func):
+    """Return (milliseconds per call, last result)."""
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        result = func()
+    return (time.perf_counter() - start) / REPEATS * 1000, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [500_000]
+    print(f"{'rows':>8} {'sort':>11} {'depth':>6} {'offset (ms)':>12} {'cursor (ms)':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            engine = create_engine(f"sqlite:///{tmp}/bench_{rows}.db")
+            Base.metadata.create_all(engine)
+            db = sessionmaker(bind=engine)()
+            fill(db, rows)
+            
+            for sort_by in ("asset_tag", "department"):
+                for depth in DEPTHS:
+                    skip = int(rows * depth)
+                    cursor = cursor_at(db, sort_by, skip)
+                    offset_time, expected = timed(lambda: offset_page(db, sort_by, skip))
+                    cursor_time, page = timed(lambda: keyset_page(db, sort_by, cursor))
+                    if [a.id for a in page] != [a.id for a in expected]:
+                        raise SystemExit(f"Cursor page differs for {sort_by} at {skip}")
+                    print(f"{rows:>8} {sort_by:>11} {depth:>6.0%} {offset_time:>12.1f} {cursor_time:>12.1f}")
+            db.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
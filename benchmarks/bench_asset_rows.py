@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Benchmark report views loading Asset instances against asset rows.
+
+Fills a temporary SQLite database with synthetic active assets carrying
+notes and specs text, then runs each report's query and renders its
+template twice: loading full Asset instances as the views used to, and
+loading the view's row type (app.models.asset_rows). Reports time per
+render and the peak memory traced while querying and rendering.
+
+Usage:
+    python benchmarks/bench_asset_rows.py [rows ...]
+"""
+import os
+import sys
+import json
+import tempfile
+import time
+import tracemalloc
+import random
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fastapi.templating import Jinja2Templates  # noqa: E402
+from app.database import Base  # noqa: E402
+from app import models  # noqa: E402, F401
+from app.models.asset import Asset  # noqa: E402
+from app.models.asset_rows import AssetRows, AssetReportRow, CampaignAssetRow  # noqa: E402
+
+DEPARTMENTS = ["IT", "NEWS", "SALES", "ENGINEERING", "CREATIVE", "WEATHER", None]
+NAMES = ["McGonagle, Paul", "Carlton, Anne Marie", "Brown, Chris", "Wentworth, Matt", "", None]
+REPEATS = 5
+
+templates = Jinja2Templates(directory=os.path.join(ROOT, "app", "templates"))
+request = Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b"", "state": {}})
+
+
+def fill(db, rows: int, seed: int = 0) -> None:
+    """Insert synthetic active assets, all due for refresh, with notes and specs."""
+    rng = random.Random(seed)
+    today = date.today()
+    db.execute(Asset.__table__.insert(), [
+        {
+            "asset_tag": f"WJBKPWLT{i:06X}",
+            "computer_name": f"WJBKPWLT{i:06X}",
+            "department": rng.choice(DEPARTMENTS),
+            "assigned_user_name": rng.choice(NAMES),
+            "status": "active",
+            "operating_system": "Windows 11",
+            "refresh_due_date": today + timedelta(days=rng.randint(0, 90)),
+            "specs": json.dumps({"cpu": "Intel Core i7-1365U", "ram": "32GB", "storage": "1TB NVMe",
+                                 "ports": ["USB-C"] * 4, "history": "x" * 1_000}),
+            "notes": f"{rng.choice(NAMES)} - 2MQ{i:07d} " + "y" * 400,
+        }
+        for i in range(rows)
+    ])
+    db.commit()
+
+
+def views(db, projected: bool):
+    """Each report and the campaign detail as {name: render function},
+    loading the view's row type if projected, else Asset instances."""
+    def query(row_type):
+        return db.query(AssetRows(row_type) if projected else Asset).filter(Asset.status == "active")
+    
+    def render(template, **context):
+        return templates.get_template(template).render(request=request, **context)
+    
+    def department_inventory():
+        dept_groups = {}
+        for asset in query(AssetReportRow).order_by(Asset.department, Asset.asset_tag):
+            dept_groups.setdefault(asset.department or "Unassigned", []).append(asset)
+        return render("reports/department_inventory.html", dept_groups=dept_groups, selected_dept=None)
+    
+    return {
+        "refresh schedule": lambda: render(
+            "reports/refresh_schedule.html", days=90, today=date.today(),
+            assets=query(AssetReportRow).order_by(Asset.refresh_due_date).all()
+        ),
+        "department inventory": department_inventory,
+        "unassigned": lambda: render("reports/unassigned.html", assets=query(AssetReportRow).filter(
+            (Asset.assigned_user_name.is_(None) | (Asset.assigned_user_name == ""))
+        ).order_by(Asset.department, Asset.asset_tag).all()),
+        "campaign detail": lambda: render(
+            "verification/campaign_detail.html", verified_asset_ids=set(),
+            campaign={"id": 1, "name": "Bench", "department": None, "verified_count": 0, "total_count": 0},
+            assets=query(CampaignAssetRow).order_by(Asset.asset_tag).all()
+        ),
+    }
+
+
+def measure(db, func):
+    """Return (milliseconds per render, peak traced MB) with a fresh session each time."""
+    timings = []
+    for _ in range(REPEATS):
+        db.expunge_all()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    db.expunge_all()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    db.expunge_all()
+    return min(timings) * 1000, peak / 1e6
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000]
+    print(f"{'rows':>7} {'view':>21} {'orm (ms)':>9} {'rows (ms)':>10} {'orm (MB)':>9} {'rows (MB)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            engine = create_engine(f"sqlite:///{tmp}/bench_{rows}.db")
+            Base.metadata.create_all(engine)
+            db = sessionmaker(bind=engine)()
+            fill(db, rows)
+            
+            orm_views, row_views = views(db, projected=False), views(db, projected=True)
+            for name in orm_views:
+                orm_time, orm_peak = measure(db, orm_views[name])
+                row_time, row_peak = measure(db, row_views[name])
+                print(f"{rows:>7} {name:>21} {orm_time:>9.1f} {row_time:>10.1f} {orm_peak:>9.1f} {row_peak:>10.1f}")
+            db.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
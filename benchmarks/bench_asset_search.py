@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Benchmark asset list searches with and without the full-text index.
+
+Fills a temporary SQLite database with synthetic assets and times one
+page of get_assets (the count plus the page, as the asset list runs it
+on every keystroke) for a few searches: through the FTS5 index, and
+with the substring ILIKE filters the index replaced. Reports the match
+counts of both, which can differ: the index matches word prefixes rather
+than substrings, and also covers notes and model.
+
+Usage:
+    python benchmarks/bench_asset_search.py [rows ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import random
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import Base  # noqa: E402
+from app.models.asset import Asset  # noqa: E402
+from app.models.asset_search import create_asset_search_index  # noqa: E402
+from app.services.asset_service import filter_assets, search_matches  # noqa: E402
+
+SEARCHES = ["wjbkpwlt00a", "mcgonagle", "news", "2mq00123", "zzz"]
+DEPARTMENTS = ["IT", "NEWS", "SALES", "ENGINEERING", "CREATIVE", "WEATHER", None]
+NAMES = ["McGonagle, Paul", "Carlton, Anne Marie", "Brown, Chris", "Wentworth, Matt", None]
+REPEATS = 20
+
+
+def fill(db, rows: int, seed: int = 0) -> None:
+    """Insert synthetic assets."""
+    rng = random.Random(seed)
+    db.execute(Asset.__table__.insert(), [
+        {
+            "asset_tag": f"WJBKPWLT{i:06X}",
+            "computer_name": f"WJBKPWLT{i:06X}",
+            "department": rng.choice(DEPARTMENTS),
+            "assigned_user_name": rng.choice(NAMES),
+            "status": "active",
+            "serial_number": f"2MQ{i:07d}",
+            "notes": f"{rng.choice(NAMES)} - 2MQ{i:07d}",
+        }
+        for i in range(rows)
+    ])
+    db.commit()
+
+
+def timed_page(db, search: str, indexed: bool):
+    """Return (milliseconds per page, total matches) for get_assets' count
+    and first page, through the index or with substring filters."""
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        matches = search_matches(db, search) if indexed else None
+        query = filter_assets(db.query(Asset), search=search, matches=matches)
+        total = query.count()
+        query.order_by(matches.c.rank if indexed else Asset.asset_tag).limit(50).all()
+    return (time.perf_counter() - start) / REPEATS * 1000, total
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    print(f"{'rows':>8} {'search':>12} {'ilike (ms)':>11} {'matches':>8} {'fts (ms)':>9} {'matches':>8} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            engine = create_engine(f"sqlite:///{tmp}/bench_{rows}.db")
+            Base.metadata.create_all(engine)
+            with engine.begin() as connection:
+                create_asset_search_index(connection)
+            db = sessionmaker(bind=engine)()
+            fill(db, rows)
+            
+            for search in SEARCHES:
+                ilike_time, ilike_total = timed_page(db, search, indexed=False)
+                fts_time, fts_total = timed_page(db, search, indexed=True)
+                print(
+                    f"{rows:>8} {search:>12} {ilike_time:>11.1f} {ilike_total:>8} "
+                    f"{fts_time:>9.1f} {fts_total:>8} {ilike_time / fts_time:>7.1f}x"
+                )
+            db.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
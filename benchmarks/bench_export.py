@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Benchmark the asset export formats.
+
+Fills a temporary SQLite database with synthetic assets and exports them
+as CSV (all rows loaded as Asset objects, then one DataFrame, as the
+CSV/XLSX export does) and as streamed Parquet and Arrow IPC. Reports the
+time to write each export, its size, peak Python memory while writing and
+the time to read it back into a DataFrame, and checks all of them hold
+the same asset tags.
+
+Usage:
+    python benchmarks/bench_export.py [rows ...]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import Base  # noqa: E402
+from app.models.asset import Asset  # noqa: E402
+from app.services.asset_service import iter_assets  # noqa: E402
+from app.services.export_service import asset_batches, asset_export_schema, write_columnar  # noqa: E402
+
+BATCH_ROWS = 50_000
+DEPARTMENTS = ["IT", "NEWS", "SALES", "ENGINEERING", "CREATIVE", "WEATHER", None]
+OPERATING_SYSTEMS = ["Windows 11", "Windows 10", "macOS 14", None]
+STATUSES = ["active", "active", "active", "retired", "in-repair"]
+
+
+def fill(db, rows: int, seed: int = 0) -> None:
+    """Insert synthetic assets."""
+    rng = random.Random(seed)
+    db.execute(Asset.__table__.insert(), [
+        {
+            "asset_tag": f"WJBKPWLT{i:06X}",
+            "computer_name": f"WJBKPWLT{i:06X}",
+            "department": rng.choice(DEPARTMENTS),
+            "assigned_user_name": f"User {rng.randint(1, 5000)}",
+            "status": rng.choice(STATUSES),
+            "operating_system": rng.choice(OPERATING_SYSTEMS),
+            "serial_number": f"2MQ{i:07d}",
+            "purchase_date": date(2020, 1, 1) + timedelta(days=rng.randint(0, 1500)),
+            "refresh_due_date": date(2024, 1, 1) + timedelta(days=rng.randint(0, 1500)),
+        }
+        for i in range(rows)
+    ])
+    db.commit()
+
+
+def csv_export(db, rows: int):
+    """The CSV export: every asset loaded, then one DataFrame."""
+    assets = list(iter_assets(db))
+    df = pd.DataFrame([
+        {
+            "Asset Tag": asset.asset_tag,
+            "Computer Name": asset.computer_name,
+            "Department": asset.department,
+            "Assigned To": asset.assigned_user_name,
+            "Status": asset.status,
+            "Operating System": asset.operating_system,
+            "Serial Number": asset.serial_number,
+            "Purchase Date": asset.purchase_date,
+            "Refresh Due Date": asset.refresh_due_date,
+        }
+        for asset in assets
+    ])
+    yield df.to_csv(index=False).encode()
+
+
+def measure(body):
+    """Return (seconds, exported bytes, peak traced bytes).
+    
+    Tracing slows the run, so the time comes from a separate untraced run.
+    """
+    start = time.perf_counter()
+    data = b"".join(body())
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    for _ in body():
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, data, peak
+
+
+READERS = {
+    "csv": lambda data: pd.read_csv(io.BytesIO(data)),
+    "parquet": lambda data: pq.read_table(pa.BufferReader(data)).to_pandas(),
+    "arrow": lambda data: pa.ipc.open_file(pa.BufferReader(data)).read_pandas(),
+}
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    print(f"{'rows':>8} {'format':>8} {'write (s)':>10} {'size (MB)':>10} {'peak (MB)':>10} {'read (s)':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            engine = create_engine(f"sqlite:///{tmp}/bench_{rows}.db")
+            Base.metadata.create_all(engine)
+            db = sessionmaker(bind=engine)()
+            fill(db, rows)
+            
+            exports = {
+                "csv": lambda: csv_export(db, rows),
+                "parquet": lambda: write_columnar(asset_batches(db, BATCH_ROWS), asset_export_schema(), "parquet"),
+                "arrow": lambda: write_columnar(asset_batches(db, BATCH_ROWS), asset_export_schema(), "arrow"),
+            }
+            expected = None
+            for label, body in exports.items():
+                elapsed, data, peak = measure(body)
+                start = time.perf_counter()
+                df = READERS[label](data)
+                read_time = time.perf_counter() - start
+                
+                tags = df["Asset Tag"].tolist()
+                if expected is None:
+                    expected = tags
+                elif tags != expected:
+                    raise SystemExit(f"{label} export holds different assets at {rows} rows")
+                print(
+                    f"{rows:>8} {label:>8} {elapsed:>10.2f} {len(data) / 1e6:>10.1f} "
+                    f"{peak / 1e6:>10.1f} {read_time:>9.3f}"
+                )
+            db.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark streaming parse output against building the whole response.
+
+Compares the previous /parse response body (every row transformed, then
+every cell passed through json_serialize, then one JSON document) with
+the chunked JSON rows iter_transformed_json streams. Reports total time,
+time to the first rows and peak Python memory for each, and checks both
+produce the same rows.
+
+Usage:
+    python benchmarks/bench_parse_stream.py [rows ...]
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+import random
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.routes.file_api import json_serialize  # noqa: E402
+from app.services.import_service import transform_dataframe, iter_transformed_json  # noqa: E402
+
+MAPPING = {
+    "asset_tag": "Computer Name",
+    "assigned_user_name": "Username",
+    "department": "Department",
+    "assigned_user_id": "User ID",
+    "operating_system": "Operating System",
+    "notes": "Notes",
+}
+
+DEPARTMENTS = ["IT", "news", "Sales ", "engineering", "Creative", "WEATHER", None]
+OPERATING_SYSTEMS = ["Windows 11", "Windows 10", "macOS 14", None]
+NAMES = ["McGonagle, Paul", "Carlton, Anne Marie", "Brown, Chris", "SPARE"]
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Build a parsed upload shaped like the fleet inventory exports."""
+    rng = random.Random(seed)
+    return pd.DataFrame({
+        "Computer Name": [f"wjbkpwlt{i:06x}" for i in range(rows)],
+        "Username": [rng.choice(NAMES) if rng.random() > 0.9 else None for _ in range(rows)],
+        "Department": [rng.choice(DEPARTMENTS) for _ in range(rows)],
+        "User ID": [rng.randint(1000, 9999) if rng.random() > 0.5 else None for _ in range(rows)],
+        "Operating System": [rng.choice(OPERATING_SYSTEMS) for _ in range(rows)],
+        "Notes": [f"{rng.choice(NAMES)} - 2MQ{i:07d}" for i in range(rows)],
+    })
+
+
+def full_response(df: pd.DataFrame):
+    """The previous response: every row cleaned, then one document."""
+    rows = [{k: json_serialize(v) for k, v in row.items()} for row in transform_dataframe(df, MAPPING)]
+    yield json.dumps({"total_rows": len(rows), "transformed_data": rows})
+
+
+def streamed_response(df: pd.DataFrame):
+    """The streamed rows, one chunk at a time."""
+    for lines in iter_transformed_json(df, MAPPING):
+        yield ",".join(lines)
+
+
+def measure(body):
+    """Return (total seconds, seconds to first chunk, peak traced bytes).
+    
+    Tracing slows the run, so the times come from a separate untraced run.
+    """
+    start = time.perf_counter()
+    first = None
+    for _ in body():
+        if first is None:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    
+    tracemalloc.start()
+    for _ in body():
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return total, first, peak
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    print(f"{'rows':>8} {'body':>9} {'total (s)':>10} {'first (ms)':>11} {'peak (MB)':>10}")
+    for rows in sizes:
+        df = make_frame(rows)
+        expected = json.loads(next(full_response(df)))["transformed_data"]
+        streamed = json.loads("[" + ",".join(streamed_response(df)) + "]")
+        if streamed != expected:
+            raise SystemExit(f"Streamed rows differ at {rows} rows")
+        
+        for label, body in (("full", lambda: full_response(df)), ("streamed", lambda: streamed_response(df))):
+            total, first, peak = measure(body)
+            print(f"{rows:>8} {label:>9} {total:>10.2f} {first * 1000:>11.1f} {peak / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Benchmark profiling the sampled columns of a wide upload.
+
+Builds a synthetic vendor export with 60 columns (the inventory fields
+plus vendor fields, half numeric) and times profile_columns, which runs
+inside the upload request. Also reports a worst case of 60 text columns
+whose values are all distinct, and the mapping detected for the export.
+
+Usage:
+    python benchmarks/bench_profile_columns.py [rows ...]
+"""
+import os
+import sys
+import time
+import random
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.validators.column_detector import detect_column_mapping  # noqa: E402
+from app.validators.column_profiler import profile_columns  # noqa: E402
+
+COLUMNS = 60
+BUDGET_SECONDS = 0.2
+REPEATS = 5
+
+DEPARTMENTS = ["IT", "news", "Sales ", "engineering", "Creative", "WEATHER", None]
+OPERATING_SYSTEMS = ["Windows 11", "Windows 10", "macOS 14", None]
+STATUSES = ["Active", "In Repair", "Retired", "Lost"]
+NAMES = ["McGonagle, Paul", "Carlton, Anne Marie", "Brown, Chris", "SPARE"]
+
+
+def make_export(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Build a wide export whose headers do not name the inventory fields."""
+    rng = random.Random(seed)
+    data = {
+        "Device": [f"WJBKPWLT{i:06X}" for i in range(rows)],
+        "ID": [rng.randint(1000, 9999) for _ in range(rows)],
+        "Name": [rng.choice(NAMES) for _ in range(rows)],
+        "Group": [rng.choice(DEPARTMENTS) for _ in range(rows)],
+        "System": [rng.choice(OPERATING_SYSTEMS) for _ in range(rows)],
+        "SN": [f"2MQ{rng.randint(0, 10**7):07d}" for _ in range(rows)],
+        "Lifecycle": [rng.choice(STATUSES) for _ in range(rows)],
+    }
+    for column in range(COLUMNS - len(data)):
+        if column % 2:
+            data[f"Vendor Field {column}"] = [rng.random() * 1000 for _ in range(rows)]
+        else:
+            data[f"Vendor Field {column}"] = [f"value {rng.randint(0, 10_000)}" for _ in range(rows)]
+    return pd.DataFrame(data)
+
+
+def make_distinct_text(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Build 60 text columns with no repeated values."""
+    rng = random.Random(seed)
+    return pd.DataFrame({
+        f"Text {column}": [f"{rng.choice('ABCDEFGH')}{rng.randint(0, 10**9)} x" for _ in range(rows)]
+        for column in range(COLUMNS)
+    })
+
+
+def best_time(df: pd.DataFrame) -> float:
+    """Fastest of REPEATS profiling runs, in seconds."""
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        profile_columns(df)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000]
+    print(f"{'rows':>8} {'columns':>8} {'layout':>15} {'profile (ms)':>13}")
+    for rows in sizes:
+        for label, df in (("vendor export", make_export(rows)), ("distinct text", make_distinct_text(rows))):
+            elapsed = best_time(df)
+            flag = "" if elapsed < BUDGET_SECONDS else "  over budget"
+            print(f"{rows:>8} {COLUMNS:>8} {label:>15} {elapsed * 1000:>13.1f}{flag}")
+    
+    df = make_export(sizes[0])
+    columns = df.columns.tolist()
+    print("\nDetected mapping (headers only -> with profiles):")
+    header_only = detect_column_mapping(columns)
+    profiled = detect_column_mapping(columns, profile_columns(df))
+    for field in profiled:
+        print(f"  {field:>20}: {header_only[field]!s:>12} -> {profiled[field]}")
+
+
+if __name__ == "__main__":
+    main()
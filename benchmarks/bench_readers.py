@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Benchmark the workbook reader backends against each other and CSV/TSV.
+
+Writes the same synthetic inventory export as .xlsx, .csv and .tsv, reads
+it with every available backend and checks all of them transform to the
+same rows. Backends that are not installed are reported and skipped.
+
+Usage:
+    python benchmarks/bench_readers.py [rows ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import random
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.import_service import transform_dataframe  # noqa: E402
+from app.validators.excel_parser import EXCEL_ENGINES, engine_available, read_sheet  # noqa: E402
+
+MAPPING = {
+    "asset_tag": "Computer Name",
+    "assigned_user_name": "Username",
+    "department": "Department",
+    "assigned_user_id": "User ID",
+    "operating_system": "Operating System",
+    "notes": "Notes",
+}
+
+DEPARTMENTS = ["IT", "news", "Sales ", "engineering", "Creative", "WEATHER", None]
+OPERATING_SYSTEMS = ["Windows 11", "Windows 10", "macOS 14", None]
+NAMES = ["McGonagle, Paul", "Carlton, Anne Marie", "Brown, Chris", "SPARE"]
+EXTRA_COLUMNS = 14
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Build a DataFrame shaped like the fleet inventory exports."""
+    rng = random.Random(seed)
+    data = {
+        "Computer Name": [f"wjbkpwlt{i:06x}" for i in range(rows)],
+        "Username": [rng.choice(NAMES) if rng.random() > 0.9 else None for _ in range(rows)],
+        "Department": [rng.choice(DEPARTMENTS) for _ in range(rows)],
+        "User ID": [rng.randint(1000, 9999) for _ in range(rows)],
+        "Operating System": [rng.choice(OPERATING_SYSTEMS) for _ in range(rows)],
+        "Notes": [f"{rng.choice(NAMES)} - 2MQ{i:07d}" for i in range(rows)],
+    }
+    for column in range(EXTRA_COLUMNS):
+        data[f"Vendor Field {column}"] = [f"value {rng.randint(0, 10_000)}" for _ in range(rows)]
+    return pd.DataFrame(data)
+
+
+def timed(func):
+    """Return (seconds, result) for one call."""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 50_000]
+    missing = [engine for engine in EXCEL_ENGINES if not engine_available(engine)]
+    if missing:
+        print(f"Not installed, skipped: {', '.join(missing)}")
+    
+    print(f"{'rows':>8} {'reader':>10} {'read (s)':>9} {'vs openpyxl':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            df = make_frame(rows)
+            xlsx_path = Path(tmp) / f"inventory_{rows}.xlsx"
+            csv_path = Path(tmp) / f"inventory_{rows}.csv"
+            tsv_path = Path(tmp) / f"inventory_{rows}.tsv"
+            df.to_excel(xlsx_path, index=False)
+            df.to_csv(csv_path, index=False)
+            df.to_csv(tsv_path, index=False, sep="\t")
+            
+            # openpyxl first, as the baseline the others are compared with
+            readers = [
+                (engine, lambda engine=engine: read_sheet(xlsx_path, engine=engine))
+                for engine in sorted(EXCEL_ENGINES, key=lambda engine: engine != "openpyxl")
+                if engine_available(engine)
+            ]
+            readers.append(("csv", lambda: read_sheet(csv_path)))
+            readers.append(("tsv", lambda: read_sheet(tsv_path)))
+            
+            baseline_time = None
+            expected = None
+            for label, read in readers:
+                elapsed, result = timed(read)
+                rows_out = transform_dataframe(result.dropna(how="all"), MAPPING)
+                if label == "openpyxl":
+                    baseline_time, expected = elapsed, rows_out
+                elif expected is not None and rows_out != expected:
+                    raise SystemExit(f"{label} reader transforms differently at {rows} rows")
+                speedup = f"{baseline_time / elapsed:.1f}x" if baseline_time else "-"
+                print(f"{rows:>8} {label:>10} {elapsed:>9.3f} {speedup:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Benchmark row-by-row transform_row against the column-wise transform.
+
+Usage:
+    python benchmarks/bench_transform.py [rows ...]
+"""
+import os
+import sys
+import time
+import random
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.import_service import transform_row, transform_dataframe  # noqa: E402
+
+MAPPING = {
+    "asset_tag": "Computer Name",
+    "assigned_user_name": "Username",
+    "department": "Department",
+    "assigned_user_id": "User ID",
+    "operating_system": "Operating System",
+    "notes": "Notes",
+}
+
+DEPARTMENTS = ["IT", "news", "Sales ", "engineering", "Creative", "WEATHER", None]
+OPERATING_SYSTEMS = ["Windows 11", "Windows 10", "macOS 14", None]
+NAMES = ["McGonagle, Paul", "Carlton, Anne Marie", "Brown, Chris", "SPARE"]
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Build a DataFrame shaped like the fleet inventory exports."""
+    rng = random.Random(seed)
+    tags = [f"wjbkpwlt{i:06x}" if rng.random() > 0.01 else None for i in range(rows)]
+    notes = [
+        f"{rng.choice(NAMES)} - 2MQ{i:07d}" if rng.random() > 0.2 else None
+        for i in range(rows)
+    ]
+    return pd.DataFrame({
+        "Computer Name": tags,
+        "Username": [rng.choice(NAMES) if rng.random() > 0.9 else None for _ in range(rows)],
+        "Department": [rng.choice(DEPARTMENTS) for _ in range(rows)],
+        "User ID": [float(rng.randint(1000, 9999)) if rng.random() > 0.5 else np.nan for _ in range(rows)],
+        "Operating System": [rng.choice(OPERATING_SYSTEMS) for _ in range(rows)],
+        "Notes": notes,
+    })
+
+
+def run_rowwise(df: pd.DataFrame):
+    return [transform_row(row.to_dict(), MAPPING) for _, row in df.iterrows()]
+
+
+def run_columnwise(df: pd.DataFrame):
+    return transform_dataframe(df, MAPPING)
+
+
+def best_of(func, df: pd.DataFrame, repeat: int):
+    """Return (best seconds, result) over repeat runs."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    print(f"{'rows':>8} {'iterrows (s)':>14} {'column-wise (s)':>16} {'speedup':>9}")
+    for rows in sizes:
+        df = make_frame(rows)
+        repeat = 3 if rows <= 10_000 else 1
+        rowwise_time, expected = best_of(run_rowwise, df, repeat)
+        columnwise_time, actual = best_of(run_columnwise, df, repeat)
+        if expected != actual:
+            raise SystemExit(f"Column-wise output differs from transform_row at {rows} rows")
+        print(f"{rows:>8} {rowwise_time:>14.3f} {columnwise_time:>16.3f} {rowwise_time / columnwise_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
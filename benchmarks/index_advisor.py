@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Index advisor: the query plans behind the asset pages and reports.
+
+Fills a temporary SQLite database with synthetic assets, requests every
+page in WORKLOAD through the app (following the asset list's next-page
+cursor once), records each SELECT the asset service, reports and
+verification run, and prints its EXPLAIN QUERY PLAN. Flags full table
+scans and sorts into a temporary b-tree, then lists the indexes no
+recorded query used and the indexes that duplicate another one (the
+same columns and condition, or the integer primary key, which is the
+table's rowid already).
+
+Usage:
+    python benchmarks/index_advisor.py [rows]
+"""
+import os
+import re
+import sys
+import tempfile
+import random
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # Templates and static files are found relative to the repo
+
+# Point the app at a scratch database before importing it
+SCRATCH = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{SCRATCH.name}/advisor.db"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event, text  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.database import engine, SessionLocal  # noqa: E402
+from app.models.asset import Asset  # noqa: E402
+from app.models.verification import VerificationCampaign  # noqa: E402
+from app.services.asset_service import ASSET_SORT_COLUMNS  # noqa: E402
+
+WORKLOAD = [
+    "/",
+    "/assets",
+    "/assets?status=active",
+    "/assets?status=retired",
+    "/assets?department=NEWS",
+    "/assets?status=active&department=NEWS",
+    "/assets?search=mcgonagle",
+    "/assets?search=mcgonagle&status=active",
+    *[f"/assets?sort_by={column}" for column in ASSET_SORT_COLUMNS[1:]],
+    *[f"/assets?sort_by={column}&status=active" for column in ASSET_SORT_COLUMNS[1:]],
+    "/assets/export?format=csv&status=active",
+    "/reports/refresh-schedule",
+    "/reports/department-inventory",
+    "/reports/department-inventory?department=NEWS",
+    "/reports/unassigned",
+    "/verification",
+    "/verification/campaigns/1",
+]
+NEXT_PAGE = re.compile(r'/assets\?cursor=([^&"]+)&[^"]*')
+
+DEPARTMENTS = ["IT", "NEWS", "SALES", "ENGINEERING", "CREATIVE", "WEATHER", None]
+STATUSES = ["active"] * 17 + ["retired"] * 2 + ["unassigned"]
+NAMES = ["McGonagle, Paul", "Carlton, Anne Marie", "Brown, Chris", "Wentworth, Matt", "", None]
+DEVICE_TYPES = ["laptop", "desktop", "monitor", "peripheral", None]
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+USED_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+TEMP_SORT = "USE TEMP B-TREE"
+
+
+def fill(rows: int, seed: int = 0) -> None:
+    """Insert synthetic assets and a verification campaign."""
+    rng = random.Random(seed)
+    today = date.today()
+    with SessionLocal() as db:
+        for start in range(0, rows, 50_000):
+            db.execute(Asset.__table__.insert(), [
+                {
+                    "asset_tag": f"WJBKPWLT{i:06X}",
+                    "computer_name": f"WJBKPWLT{i:06X}",
+                    "serial_number": f"2MQ{i:07d}",
+                    "device_type": rng.choice(DEVICE_TYPES),
+                    "department": rng.choice(DEPARTMENTS),
+                    "assigned_user_name": rng.choice(NAMES),
+                    "status": rng.choice(STATUSES),
+                    "refresh_due_date": today + timedelta(days=rng.randint(-365, 3 * 365)),
+                    "last_verified_at": datetime.now() - timedelta(days=rng.randint(0, 400)) if rng.random() < 0.5 else None,
+                }
+                for i in range(start, min(start + 50_000, rows))
+            ])
+        db.add(VerificationCampaign(name="Advisor", department="NEWS", status="active", total_count=0, verified_count=0))
+        db.commit()
+
+
+def run_workload(client: TestClient) -> dict:
+    """Request every page, returning {SQL: (parameters, pages)} for the SELECTs run."""
+    statements = {}
+    page = None
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if page and statement.lstrip().upper().startswith("SELECT"):
+            pages = statements.setdefault(statement, (parameters, []))[1]
+            if page not in pages:
+                pages.append(page)
+    
+    for url in WORKLOAD:
+        page = url
+        response = client.get(url)
+        if response.status_code >= 400:
+            # The queries ran; report the page without failing the run
+            print(f"{url} answered {response.status_code}\n")
+        following = NEXT_PAGE.search(response.text) if url.startswith("/assets?") else None
+        if following:
+            page = f"{url} (next page)"
+            client.get(following.group(0).replace("&amp;", "&"))
+    page = None
+    event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+
+def explain(connection, statement: str, parameters) -> list:
+    """Return the plan of a statement as (depth, detail) rows."""
+    depths = {0: -1}
+    plan = []
+    for node, parent, _, detail in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+        depths[node] = depths.get(parent, -1) + 1
+        plan.append((depths[node], detail))
+    return plan
+
+
+def index_columns(connection) -> dict:
+    """Map each table's indexes to (columns, condition, unique)."""
+    indexes = {}
+    for name, table, sql in connection.execute(text(
+        "SELECT name, tbl_name, sql FROM sqlite_master WHERE type = 'index'"
+    )):
+        columns = tuple(row[2] for row in connection.exec_driver_sql(f'PRAGMA index_info("{name}")'))
+        condition = sql.split(" WHERE ", 1)[1].strip() if sql and " WHERE " in sql else None
+        unique = sql is None or sql.upper().startswith("CREATE UNIQUE")
+        indexes.setdefault(table, {})[name] = (columns, condition, unique)
+    return indexes
+
+
+def rowid_column(connection, table: str):
+    """Return the table's INTEGER PRIMARY KEY column, the rowid alias, if any."""
+    keys = [row for row in connection.exec_driver_sql(f'PRAGMA table_info("{table}")') if row[5]]
+    if len(keys) == 1 and keys[0][2].upper() == "INTEGER":
+        return keys[0][1]
+    return None
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    fill(rows)
+    statements = run_workload(TestClient(app, raise_server_exceptions=False))
+    
+    used, tables, problems = set(), set(), 0
+    with engine.connect() as connection:
+        indexes = index_columns(connection)
+        for statement, (parameters, pages) in statements.items():
+            plan = explain(connection, statement, parameters)
+            flags = []
+            for _, detail in plan:
+                used.update(USED_INDEX.findall(detail))
+                tables.update(word for word in detail.split() if word in indexes)
+                scan = FULL_SCAN.match(detail)
+                if scan and scan.group(1) in indexes:
+                    flags.append(f"full scan of {scan.group(1)}")
+                if detail.startswith(TEMP_SORT):
+                    flags.append(detail.lower().replace("use ", "sorts in a "))
+            problems += bool(flags)
+            print(f"{'!! ' + '; '.join(flags) if flags else 'ok'}")
+            print(f"   pages: {', '.join(pages)}")
+            print(f"   {' '.join(statement.split())[:300]}")
+            for depth, detail in plan:
+                print(f"   {'  ' * depth}{detail}")
+            print()
+        
+        print(f"{len(statements)} queries, {problems} with full scans or temporary sorts\n")
+        for table in sorted(tables):
+            rowid = rowid_column(connection, table)
+            seen = {}
+            # Unique indexes first, so they are kept over their duplicates
+            for name, (columns, condition, unique) in sorted(indexes[table].items(), key=lambda item: (not item[1][2], item[0])):
+                notes = []
+                if name not in used:
+                    notes.append("unused by the workload" + (" (enforces uniqueness)" if unique else ""))
+                if columns == (rowid,):
+                    notes.append(f"duplicates the primary key {rowid}")
+                elif (columns, condition) in seen:
+                    notes.append(f"duplicates {seen[columns, condition]}")
+                else:
+                    seen[columns, condition] = name
+                on = f"{table}({', '.join(columns)})" + (f" WHERE {condition}" if condition else "")
+                print(f"{'!! ' if notes else '   '}{name:40} {on:60} {'; '.join(notes)}")
+    SCRATCH.cleanup()
+
+
+if __name__ == "__main__":
+    main()
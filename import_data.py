@@ -57,18 +57,27 @@ def import_excel_data():
         "notes": "Notes"
     }
     
-    parse_response = requests.post(
+    # Stream the rows as newline-delimited JSON: a summary line, then one row per line
+    with requests.post(
         f"{BASE_URL}/api/files/{filename}/parse",
-        params={"mapping": json.dumps(mapping)}
-    )
+        params={"mapping": json.dumps(mapping), "format": "ndjson"},
+        stream=True
+    ) as parse_response:
+        if parse_response.status_code != 200:
+            print(f"✗ Parse failed: {parse_response.status_code}")
+            print(parse_response.text[:500])
+            return False
+        
+        lines = parse_response.iter_lines()
+        summary = json.loads(next(lines))
+        transformed_data = [json.loads(line) for line in lines if line]
     
-    if parse_response.status_code != 200:
-        print(f"✗ Parse failed: {parse_response.status_code}")
-        print(parse_response.text[:500])
+    # A failure after streaming began ends the stream with an error line
+    if transformed_data and "error" in transformed_data[-1]:
+        print(f"✗ Parse failed: {transformed_data[-1]['error']}")
         return False
     
-    parse_data = parse_response.json()
-    print(f"✓ Parsed {parse_data['total_rows']} rows")
+    print(f"✓ Parsed {summary['total_rows']} rows")
     
     # Step 3: Import via web interface (we'll use a direct database import)
     print("\n4. Importing data into database...")
@@ -79,7 +88,7 @@ def import_excel_data():
     
     db = SessionLocal()
     try:
-        upload_path = Path(f"uploads/{filename}")
+        upload_path = Path(api_data["file"]["path"])
         if not upload_path.exists():
             print(f"✗ File not found at {upload_path}")
             return False
@@ -89,8 +98,9 @@ def import_excel_data():
             file_path=upload_path,
             filename=filename,
             column_mapping=mapping,
-            transformed_data=parse_data["transformed_data"],
-            uploaded_by="import_script"
+            transformed_data=transformed_data,
+            uploaded_by="import_script",
+            content_hash=api_data["file"]["sha256"]
         )
         
         print(f"✓ Import completed!")